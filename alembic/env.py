@@ -41,6 +41,9 @@ from app.models import (
     EjecucionPresupuestaria,
     HistoricoProyecto,
     HistoricoPoa,
+    LogCargaExcel,
+    ResumenPresupuestoPoa,
+    SnapshotPoa,
 )
 
 # Asignar metadata de los modelos
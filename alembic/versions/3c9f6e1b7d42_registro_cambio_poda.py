@@ -0,0 +1,30 @@
+"""marca de poda del registro de cambios
+
+Revision ID: 3c9f6e1b7d42
+Revises: e7b2c94f1a05
+Create Date: 2026-10-19 18:52:40.117305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9f6e1b7d42'
+down_revision = 'e7b2c94f1a05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('REGISTRO_CAMBIO_PODA',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaccion', sa.BigInteger(), nullable=False),
+    sa.Column('id_cambio', sa.BigInteger(), nullable=False),
+    sa.Column('fecha', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('REGISTRO_CAMBIO_PODA')
@@ -0,0 +1,134 @@
+"""particionado anual de HISTORICO_POA, HISTORICO_PROYECTO y LOG_CARGA_EXCEL
+
+Revision ID: 5e2d9c4b1a73
+Revises: 7c1e5a9d2f40
+Create Date: 2026-10-19 11:40:05.902114
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2d9c4b1a73'
+down_revision = '7c1e5a9d2f40'
+branch_labels = None
+depends_on = None
+
+
+# tabla -> columna de partición
+TABLAS = {
+    'HISTORICO_POA': 'fecha_modificacion',
+    'HISTORICO_PROYECTO': 'fecha_modificacion',
+    'LOG_CARGA_EXCEL': 'fecha_carga',
+}
+
+
+def _columnas(tabla):
+    if tabla == 'HISTORICO_POA':
+        return [
+            sa.Column('id_historico', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('id_poa', postgresql.UUID(as_uuid=True), sa.ForeignKey('POA.id_poa'), nullable=False),
+            sa.Column('id_usuario', postgresql.UUID(as_uuid=True), sa.ForeignKey('USUARIO.id_usuario'), nullable=False),
+            sa.Column('fecha_modificacion', sa.DateTime(), nullable=False),
+            sa.Column('campo_modificado', sa.String(length=100), nullable=False),
+            sa.Column('valor_anterior', sa.Text(), nullable=True),
+            sa.Column('valor_nuevo', sa.Text(), nullable=True),
+            sa.Column('justificacion', sa.String(length=500), nullable=False),
+            sa.Column('id_reforma', postgresql.UUID(as_uuid=True), sa.ForeignKey('REFORMA_POA.id_reforma'), nullable=True),
+            sa.PrimaryKeyConstraint('id_historico', 'fecha_modificacion'),
+        ]
+    if tabla == 'HISTORICO_PROYECTO':
+        return [
+            sa.Column('id_historico', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('id_proyecto', postgresql.UUID(as_uuid=True), sa.ForeignKey('PROYECTO.id_proyecto'), nullable=False),
+            sa.Column('id_usuario', postgresql.UUID(as_uuid=True), sa.ForeignKey('USUARIO.id_usuario'), nullable=False),
+            sa.Column('fecha_modificacion', sa.DateTime(), nullable=False),
+            sa.Column('campo_modificado', sa.String(length=100), nullable=False),
+            sa.Column('valor_anterior', sa.Text(), nullable=True),
+            sa.Column('valor_nuevo', sa.Text(), nullable=True),
+            sa.Column('justificacion', sa.String(length=500), nullable=False),
+            sa.PrimaryKeyConstraint('id_historico', 'fecha_modificacion'),
+        ]
+    return [
+        sa.Column('id_log', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('id_poa', sa.String(length=36), nullable=True),
+        sa.Column('codigo_poa', sa.String(length=100), nullable=True),
+        sa.Column('id_usuario', sa.String(length=36), nullable=True),
+        sa.Column('usuario_nombre', sa.String(length=100), nullable=True),
+        sa.Column('usuario_email', sa.String(length=100), nullable=True),
+        sa.Column('proyecto_nombre', sa.String(length=200), nullable=True),
+        sa.Column('fecha_carga', sa.DateTime(), nullable=False),
+        sa.Column('nombre_archivo', sa.String(length=200), nullable=False),
+        sa.Column('hoja', sa.String(length=100), nullable=False),
+        sa.Column('mensaje', sa.String(length=500), nullable=False),
+        sa.PrimaryKeyConstraint('id_log', 'fecha_carga'),
+    ]
+
+
+def _indices(tabla):
+    if tabla == 'HISTORICO_POA':
+        op.create_index('ix_HISTORICO_POA_id_poa_fecha', tabla, ['id_poa', 'fecha_modificacion'], unique=False)
+    elif tabla == 'HISTORICO_PROYECTO':
+        op.create_index('ix_HISTORICO_PROYECTO_id_proyecto_fecha', tabla, ['id_proyecto', 'fecha_modificacion'], unique=False)
+    else:
+        op.create_index(op.f('ix_LOG_CARGA_EXCEL_fecha_carga'), tabla, ['fecha_carga'], unique=False)
+
+
+def upgrade():
+    conn = op.get_bind()
+    anio_actual = datetime.utcnow().year
+    # LOG_CARGA_EXCEL solo existe si la creó create_all al arrancar la app; ninguna revisión
+    # anterior la crea. Si falta se crea ya particionada y no hay nada que copiar. Se consulta
+    # antes de los renombres porque el inspector guarda en caché la lista de tablas.
+    existentes = {tabla for tabla in TABLAS if sa.inspect(conn).has_table(tabla)}
+
+    for tabla, columna in TABLAS.items():
+        anterior = f'{tabla}_ANTERIOR'
+        if tabla in existentes:
+            op.rename_table(tabla, anterior)
+            op.execute(f'ALTER TABLE "{anterior}" RENAME CONSTRAINT "{tabla}_pkey" TO "{anterior}_pkey"')
+
+        op.create_table(tabla, *_columnas(tabla), postgresql_partition_by=f'RANGE ({columna})')
+        _indices(tabla)
+
+        # una partición por cada año con datos, más el anterior, el actual y el siguiente
+        anios = {anio_actual - 1, anio_actual, anio_actual + 1}
+        if tabla in existentes:
+            anios |= set(conn.execute(sa.text(
+                f'SELECT DISTINCT extract(year FROM "{columna}")::int FROM "{anterior}"'
+            )).scalars().all())
+        for anio in sorted(anios):
+            op.execute(
+                f'CREATE TABLE "{tabla}_{anio}" PARTITION OF "{tabla}" '
+                f"FOR VALUES FROM ('{anio}-01-01') TO ('{anio + 1}-01-01')"
+            )
+        op.execute(f'CREATE TABLE "{tabla}_DEFAULT" PARTITION OF "{tabla}" DEFAULT')
+
+        if tabla in existentes:
+            op.execute(f'INSERT INTO "{tabla}" SELECT * FROM "{anterior}"')
+            op.drop_table(anterior)
+
+
+def downgrade():
+    for tabla in TABLAS:
+        particionada = f'{tabla}_PARTICIONADA'
+        op.rename_table(tabla, particionada)
+        op.execute(f'ALTER TABLE "{particionada}" RENAME CONSTRAINT "{tabla}_pkey" TO "{particionada}_pkey"')
+        if tabla == 'HISTORICO_POA':
+            op.drop_index('ix_HISTORICO_POA_id_poa_fecha', table_name=particionada)
+        elif tabla == 'HISTORICO_PROYECTO':
+            op.drop_index('ix_HISTORICO_PROYECTO_id_proyecto_fecha', table_name=particionada)
+        else:
+            op.drop_index(op.f('ix_LOG_CARGA_EXCEL_fecha_carga'), table_name=particionada)
+
+        columnas = _columnas(tabla)
+        clave = 'id_log' if tabla == 'LOG_CARGA_EXCEL' else 'id_historico'
+        columnas[-1] = sa.PrimaryKeyConstraint(clave)
+        op.create_table(tabla, *columnas)
+
+        op.execute(f'INSERT INTO "{tabla}" SELECT * FROM "{particionada}"')
+        # elimina también todas las particiones
+        op.drop_table(particionada)
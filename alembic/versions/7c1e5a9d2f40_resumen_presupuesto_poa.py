@@ -0,0 +1,60 @@
+"""resumen presupuesto poa e indices de claves foraneas
+
+Revision ID: 7c1e5a9d2f40
+Revises: 429563bb5914
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e5a9d2f40'
+down_revision = '429563bb5914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('RESUMEN_PRESUPUESTO_POA',
+    sa.Column('id_poa', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('id_proyecto', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('anio_ejecucion', sa.String(length=4), nullable=False),
+    sa.Column('presupuesto_asignado', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('total_actividades', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('saldo_actividades', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('total_programado', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('programado_mensual', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('total_certificado', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('total_comprometido', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('total_devengado', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('total_ejecutado', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('fecha_actualizacion', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['id_poa'], ['POA.id_poa'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['id_proyecto'], ['PROYECTO.id_proyecto'], ),
+    sa.PrimaryKeyConstraint('id_poa')
+    )
+    op.create_index(op.f('ix_RESUMEN_PRESUPUESTO_POA_id_proyecto'), 'RESUMEN_PRESUPUESTO_POA', ['id_proyecto'], unique=False)
+    op.create_index(op.f('ix_RESUMEN_PRESUPUESTO_POA_anio_ejecucion'), 'RESUMEN_PRESUPUESTO_POA', ['anio_ejecucion'], unique=False)
+
+    # índices para las claves foráneas que recorre el cálculo del resumen
+    op.create_index(op.f('ix_ACTIVIDAD_id_poa'), 'ACTIVIDAD', ['id_poa'], unique=False)
+    op.create_index(op.f('ix_TAREA_id_actividad'), 'TAREA', ['id_actividad'], unique=False)
+    op.create_index(op.f('ix_CONTROL_PRESUPUESTARIO_id_poa'), 'CONTROL_PRESUPUESTARIO', ['id_poa'], unique=False)
+    op.create_index(op.f('ix_CONTROL_PRESUPUESTARIO_id_tarea'), 'CONTROL_PRESUPUESTARIO', ['id_tarea'], unique=False)
+    op.create_index(op.f('ix_EJECUCION_PRESUPUESTARIA_id_poa'), 'EJECUCION_PRESUPUESTARIA', ['id_poa'], unique=False)
+    op.create_index(op.f('ix_EJECUCION_PRESUPUESTARIA_id_tarea'), 'EJECUCION_PRESUPUESTARIA', ['id_tarea'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_EJECUCION_PRESUPUESTARIA_id_tarea'), table_name='EJECUCION_PRESUPUESTARIA')
+    op.drop_index(op.f('ix_EJECUCION_PRESUPUESTARIA_id_poa'), table_name='EJECUCION_PRESUPUESTARIA')
+    op.drop_index(op.f('ix_CONTROL_PRESUPUESTARIO_id_tarea'), table_name='CONTROL_PRESUPUESTARIO')
+    op.drop_index(op.f('ix_CONTROL_PRESUPUESTARIO_id_poa'), table_name='CONTROL_PRESUPUESTARIO')
+    op.drop_index(op.f('ix_TAREA_id_actividad'), table_name='TAREA')
+    op.drop_index(op.f('ix_ACTIVIDAD_id_poa'), table_name='ACTIVIDAD')
+    op.drop_index(op.f('ix_RESUMEN_PRESUPUESTO_POA_anio_ejecucion'), table_name='RESUMEN_PRESUPUESTO_POA')
+    op.drop_index(op.f('ix_RESUMEN_PRESUPUESTO_POA_id_proyecto'), table_name='RESUMEN_PRESUPUESTO_POA')
+    op.drop_table('RESUMEN_PRESUPUESTO_POA')
@@ -0,0 +1,25 @@
+"""cambios pendientes de tareas en REFORMA_POA
+
+Revision ID: 9a4f0b6c3d18
+Revises: 5e2d9c4b1a73
+Create Date: 2026-10-19 13:05:27.481930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f0b6c3d18'
+down_revision = '5e2d9c4b1a73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('REFORMA_POA', sa.Column('cambios', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('REFORMA_POA', 'cambios')
@@ -0,0 +1,44 @@
+"""snapshots comprimidos de POA
+
+Revision ID: b3e7d21f8c55
+Revises: 9a4f0b6c3d18
+Create Date: 2026-10-19 14:22:10.517342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e7d21f8c55'
+down_revision = '9a4f0b6c3d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('SNAPSHOT_POA',
+    sa.Column('id_snapshot', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('id_poa', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('id_reforma', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('momento', sa.String(length=30), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=False),
+    sa.Column('id_usuario', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('total_actividades', sa.DECIMAL(precision=18, scale=2), nullable=False),
+    sa.Column('cantidad_tareas', sa.Integer(), nullable=False),
+    sa.Column('huella', sa.String(length=64), nullable=False),
+    sa.Column('contenido', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['id_poa'], ['POA.id_poa'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['id_reforma'], ['REFORMA_POA.id_reforma'], ),
+    sa.ForeignKeyConstraint(['id_usuario'], ['USUARIO.id_usuario'], ),
+    sa.PrimaryKeyConstraint('id_snapshot')
+    )
+    op.create_index(op.f('ix_SNAPSHOT_POA_id_poa'), 'SNAPSHOT_POA', ['id_poa'], unique=False)
+    op.create_index(op.f('ix_SNAPSHOT_POA_id_reforma'), 'SNAPSHOT_POA', ['id_reforma'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_SNAPSHOT_POA_id_reforma'), table_name='SNAPSHOT_POA')
+    op.drop_index(op.f('ix_SNAPSHOT_POA_id_poa'), table_name='SNAPSHOT_POA')
+    op.drop_table('SNAPSHOT_POA')
@@ -0,0 +1,28 @@
+"""columna version para concurrencia optimista
+
+Revision ID: d4a8c61e2b97
+Revises: b3e7d21f8c55
+Create Date: 2026-10-19 15:02:44.918263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8c61e2b97'
+down_revision = 'b3e7d21f8c55'
+branch_labels = None
+depends_on = None
+
+TABLAS = ('POA', 'ACTIVIDAD', 'TAREA', 'PROGRAMACION_MENSUAL')
+
+
+def upgrade():
+    for tabla in TABLAS:
+        op.add_column(tabla, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    for tabla in reversed(TABLAS):
+        op.drop_column(tabla, 'version')
@@ -0,0 +1,72 @@
+"""registro de cambios para el feed incremental
+
+Revision ID: e7b2c94f1a05
+Revises: d4a8c61e2b97
+Create Date: 2026-10-19 17:26:13.540817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b2c94f1a05'
+down_revision = 'd4a8c61e2b97'
+branch_labels = None
+depends_on = None
+
+# entidad -> (tabla, clave primaria)
+ENTIDADES = {
+    'poa': ('POA', 'id_poa'),
+    'actividad': ('ACTIVIDAD', 'id_actividad'),
+    'tarea': ('TAREA', 'id_tarea'),
+    'programacion_mensual': ('PROGRAMACION_MENSUAL', 'id_programacion'),
+    'reforma_poa': ('REFORMA_POA', 'id_reforma'),
+}
+
+EVENTOS = (('INSERT', 'NEW TABLE AS nuevas'), ('UPDATE', 'NEW TABLE AS nuevas'), ('DELETE', 'OLD TABLE AS anteriores'))
+
+
+def upgrade():
+    op.create_table('REGISTRO_CAMBIO',
+    sa.Column('id_cambio', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('transaccion', sa.BigInteger(), nullable=False),
+    sa.Column('entidad', sa.String(length=30), nullable=False),
+    sa.Column('id_entidad', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('operacion', sa.String(length=12), nullable=False),
+    sa.Column('fecha', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id_cambio')
+    )
+    op.create_index('ix_REGISTRO_CAMBIO_transaccion_id_cambio', 'REGISTRO_CAMBIO', ['transaccion', 'id_cambio'], unique=False)
+
+    op.execute("""
+CREATE OR REPLACE FUNCTION registrar_cambio() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    EXECUTE format(
+        'INSERT INTO "REGISTRO_CAMBIO" (transaccion, entidad, id_entidad, operacion, fecha)
+         SELECT pg_current_xact_id()::text::bigint, %L, %I, %L, now() FROM %I',
+        TG_ARGV[0], TG_ARGV[1],
+        CASE TG_OP WHEN 'INSERT' THEN 'creado' WHEN 'UPDATE' THEN 'actualizado' ELSE 'eliminado' END,
+        CASE TG_OP WHEN 'DELETE' THEN 'anteriores' ELSE 'nuevas' END
+    );
+    RETURN NULL;
+END
+$$
+""")
+    for entidad, (tabla, clave) in ENTIDADES.items():
+        for operacion, transicion in EVENTOS:
+            op.execute(
+                f'CREATE OR REPLACE TRIGGER "{tabla}_cambios_{operacion.lower()}" '
+                f'AFTER {operacion} ON "{tabla}" REFERENCING {transicion} '
+                f"FOR EACH STATEMENT EXECUTE FUNCTION registrar_cambio('{entidad}', '{clave}')"
+            )
+
+
+def downgrade():
+    for tabla, _ in ENTIDADES.values():
+        for operacion, _ in EVENTOS:
+            op.execute(f'DROP TRIGGER IF EXISTS "{tabla}_cambios_{operacion.lower()}" ON "{tabla}"')
+    op.execute('DROP FUNCTION IF EXISTS registrar_cambio()')
+    op.drop_index('ix_REGISTRO_CAMBIO_transaccion_id_cambio', table_name='REGISTRO_CAMBIO')
+    op.drop_table('REGISTRO_CAMBIO')
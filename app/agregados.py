@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import Integer, case, cast, func, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+
+# Totales del POA agregados en PostgreSQL (GROUP BY ROLLUP/CUBE).
+# Una subconsulta pivota PROGRAMACION_MENSUAL a una fila por tarea con sus 12 meses y la
+# consulta principal suma tareas y meses por las dimensiones pedidas. ROLLUP agrega los
+# subtotales jerárquicos (año > tipo > ítem) y el total general; CUBE todas las
+# combinaciones. En cada fila, "grupo" lista las dimensiones por las que está agrupada:
+# las demás vienen en null porque son un subtotal, no un valor nulo.
+
+TAREA = models.Tarea.__table__
+ACTIVIDAD = models.Actividad.__table__
+POA = models.Poa.__table__
+PROYECTO = models.Proyecto.__table__
+TIPO_PROYECTO = models.TipoProyecto.__table__
+DETALLE_TAREA = models.DetalleTarea.__table__
+ITEM_PRESUPUESTARIO = models.ItemPresupuestario.__table__
+PROGRAMACION_MENSUAL = models.ProgramacionMensual.__table__
+
+# Grupos de tipos de proyecto que usan los reportes
+GRUPOS_TIPO_PROYECTO = {
+    "Investigacion": ["PIIF", "PIS", "PIGR", "PIM"],
+    "Vinculacion": ["PVIF"],
+    "Transferencia": ["PTT"],
+}
+
+DIMENSIONES = {
+    "anio": POA.c.anio_ejecucion,
+    "tipo_proyecto": TIPO_PROYECTO.c.codigo_tipo,
+    "item_presupuestario": ITEM_PRESUPUESTARIO.c.codigo,
+    "proyecto": PROYECTO.c.codigo_proyecto,
+}
+DIMENSIONES_POR_DEFECTO = ["anio", "tipo_proyecto", "item_presupuestario"]
+
+# PROGRAMACION_MENSUAL.mes viene como 'MM-AAAA' (API) o como nombre del mes (carga Excel)
+MESES_ES = [
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+]
+
+
+def numero_mes(columna):
+    return case(
+        (columna.op("~")(r"^\d{2}-"), cast(func.left(columna, 2), Integer)),
+        else_=func.array_position(array(MESES_ES), func.lower(columna)),
+    )
+
+
+def codigos_tipo_proyecto(valores: Sequence[str]) -> List[str]:
+    """Expande los grupos (Investigacion, ...) a sus códigos; los códigos pasan tal cual."""
+    codigos = []
+    for valor in valores:
+        codigos.extend(GRUPOS_TIPO_PROYECTO.get(valor, [valor]))
+    return codigos
+
+
+def consulta_totales(
+    dimensiones: Sequence[str],
+    modo: str = "rollup",
+    anios: Optional[Sequence[str]] = None,
+    tipos_proyecto: Optional[Sequence[str]] = None,
+    items: Optional[Sequence[str]] = None,
+):
+    mes = numero_mes(PROGRAMACION_MENSUAL.c.mes)
+    programacion = (
+        select(
+            PROGRAMACION_MENSUAL.c.id_tarea,
+            *[func.sum(PROGRAMACION_MENSUAL.c.valor).filter(mes == n).label(f"m{n:02d}") for n in range(1, 13)],
+        )
+        .group_by(PROGRAMACION_MENSUAL.c.id_tarea)
+        .subquery("programacion")
+    )
+
+    columnas = [DIMENSIONES[d] for d in dimensiones]
+    agrupacion = func.cube(*columnas) if modo == "cube" else func.rollup(*columnas)
+    consulta = (
+        select(
+            *[columna.label(nombre) for nombre, columna in zip(dimensiones, columnas)],
+            func.grouping(*columnas).label("nivel"),
+            func.count(TAREA.c.id_tarea).label("tareas"),
+            func.coalesce(func.sum(TAREA.c.total), 0).label("total"),
+            *[func.coalesce(func.sum(programacion.c[f"m{n:02d}"]), 0).label(f"m{n:02d}") for n in range(1, 13)],
+        )
+        .select_from(
+            TAREA
+            .join(ACTIVIDAD, ACTIVIDAD.c.id_actividad == TAREA.c.id_actividad)
+            .join(POA, POA.c.id_poa == ACTIVIDAD.c.id_poa)
+            .join(PROYECTO, PROYECTO.c.id_proyecto == POA.c.id_proyecto)
+            .join(TIPO_PROYECTO, TIPO_PROYECTO.c.id_tipo_proyecto == PROYECTO.c.id_tipo_proyecto)
+            .outerjoin(DETALLE_TAREA, DETALLE_TAREA.c.id_detalle_tarea == TAREA.c.id_detalle_tarea)
+            .outerjoin(
+                ITEM_PRESUPUESTARIO,
+                ITEM_PRESUPUESTARIO.c.id_item_presupuestario == DETALLE_TAREA.c.id_item_presupuestario,
+            )
+            .outerjoin(programacion, programacion.c.id_tarea == TAREA.c.id_tarea)
+        )
+        .where(TAREA.c.total > 0)
+        .group_by(agrupacion)
+        .order_by(*[columna.asc().nulls_last() for columna in columnas])
+    )
+    if anios:
+        consulta = consulta.where(POA.c.anio_ejecucion.in_(anios))
+    if tipos_proyecto:
+        consulta = consulta.where(TIPO_PROYECTO.c.codigo_tipo.in_(codigos_tipo_proyecto(tipos_proyecto)))
+    if items:
+        consulta = consulta.where(ITEM_PRESUPUESTARIO.c.codigo.in_(items))
+    return consulta
+
+
+async def totales(db: AsyncSession, dimensiones: Sequence[str], modo: str = "rollup", **filtros) -> Dict:
+    conexion = await db.connection()
+    filas = (await conexion.execute(consulta_totales(dimensiones, modo, **filtros))).mappings().all()
+
+    ultima = len(dimensiones) - 1
+    resultado = []
+    for fila in filas:
+        # GROUPING(a, b, c): el bit de la última dimensión es el menos significativo
+        resultado.append({
+            "grupo": [d for i, d in enumerate(dimensiones) if not fila["nivel"] & (1 << (ultima - i))],
+            **{d: fila[d] for d in dimensiones},
+            "tareas": fila["tareas"],
+            "total": fila["total"],
+            "meses": [fila[f"m{n:02d}"] for n in range(1, 13)],
+        })
+    return {"dimensiones": list(dimensiones), "modo": modo, "filas": resultado}
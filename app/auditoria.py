@@ -0,0 +1,219 @@
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Iterable, List, Optional
+from fastapi import Depends
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.auth import get_current_user
+from app.database import SessionLocal
+
+# Auditoría de cambios (HISTORICO_POA / HISTORICO_PROYECTO).
+# Cada petición acumula sus cambios en un objeto Auditoria y los escribe con un solo
+# INSERT de varias filas por tabla, en la misma transacción de la escritura.
+# Con AUDITORIA_DIFERIDA=1 las filas se entregan, tras el commit, a un escritor en
+# segundo plano con buffer acotado, y la auditoría deja de sumar viajes a la base de
+# datos en la latencia de la petición.
+
+AUDITORIA_DIFERIDA = os.getenv("AUDITORIA_DIFERIDA", "0") == "1"
+AUDITORIA_BUFFER_MAX = int(os.getenv("AUDITORIA_BUFFER_MAX", 5000))
+AUDITORIA_INTERVALO_SEGUNDOS = float(os.getenv("AUDITORIA_INTERVALO_SEGUNDOS", 2))
+
+# Filas por sentencia INSERT (límite de parámetros de PostgreSQL)
+TAMANO_LOTE_SQL = 1000
+
+# Reintentos del vaciado final al apagar antes de dar las filas por perdidas
+INTENTOS_AL_DETENER = 3
+
+_CLAVE_PENDIENTE = "auditoria_pendiente"
+
+
+def valor_auditado(valor) -> str:
+    return str(valor) if valor is not None else ""
+
+
+def diferencias(objeto, datos, campos: Iterable[str]):
+    """Retorna [(campo, valor_anterior, valor_nuevo)] para los campos que cambian."""
+    cambios = []
+    for campo in campos:
+        if not hasattr(datos, campo):
+            continue
+        valor_anterior = getattr(objeto, campo)
+        valor_nuevo = getattr(datos, campo)
+        if valor_anterior != valor_nuevo:
+            cambios.append((campo, valor_anterior, valor_nuevo))
+    return cambios
+
+
+async def _insertar(db: AsyncSession, modelo, filas: List[dict]):
+    for inicio in range(0, len(filas), TAMANO_LOTE_SQL):
+        await db.execute(insert(modelo).values(filas[inicio:inicio + TAMANO_LOTE_SQL]))
+
+
+class Auditoria:
+    """Cambios auditables de una petición."""
+
+    def __init__(self, id_usuario: uuid.UUID):
+        self.id_usuario = id_usuario
+        self.fecha = datetime.utcnow()
+        self.filas_poa: List[dict] = []
+        self.filas_proyecto: List[dict] = []
+
+    def cambio_poa(self, id_poa, campo, valor_anterior, valor_nuevo, justificacion, id_reforma=None):
+        self.filas_poa.append({
+            "id_historico": uuid.uuid4(),
+            "id_poa": id_poa,
+            "id_usuario": self.id_usuario,
+            "fecha_modificacion": self.fecha,
+            "campo_modificado": campo,
+            "valor_anterior": valor_anterior,
+            "valor_nuevo": valor_nuevo,
+            "justificacion": justificacion,
+            "id_reforma": id_reforma,
+        })
+
+    def cambio_proyecto(self, id_proyecto, campo, valor_anterior, valor_nuevo, justificacion):
+        self.filas_proyecto.append({
+            "id_historico": uuid.uuid4(),
+            "id_proyecto": id_proyecto,
+            "id_usuario": self.id_usuario,
+            "fecha_modificacion": self.fecha,
+            "campo_modificado": campo,
+            "valor_anterior": valor_anterior,
+            "valor_nuevo": valor_nuevo,
+            "justificacion": justificacion,
+        })
+
+    async def guardar(self, db: AsyncSession):
+        """
+        Escribe los cambios acumulados. Debe llamarse antes del commit: en modo
+        inmediato inserta dentro de la transacción; en modo diferido deja las filas
+        asociadas a la sesión y solo se encolan si la transacción se confirma.
+        """
+        if not self.filas_poa and not self.filas_proyecto:
+            return
+
+        if escritor.activo:
+            await escritor.esperar_espacio()
+            pendiente = db.info.setdefault(_CLAVE_PENDIENTE, ([], []))
+            pendiente[0].extend(self.filas_poa)
+            pendiente[1].extend(self.filas_proyecto)
+        else:
+            if self.filas_poa:
+                await _insertar(db, models.HistoricoPoa, self.filas_poa)
+            if self.filas_proyecto:
+                await _insertar(db, models.HistoricoProyecto, self.filas_proyecto)
+
+        self.filas_poa = []
+        self.filas_proyecto = []
+
+
+async def get_auditoria(usuario: models.Usuario = Depends(get_current_user)) -> Auditoria:
+    return Auditoria(usuario.id_usuario)
+
+
+class EscritorAuditoria:
+    """Vacía en segundo plano las filas de auditoría de peticiones ya confirmadas."""
+
+    def __init__(self, maximo: int, intervalo: float):
+        self.maximo = maximo
+        self.intervalo = intervalo
+        self.activo = False
+        self._filas_poa: List[dict] = []
+        self._filas_proyecto: List[dict] = []
+        self._despertar = asyncio.Event()
+        self._hay_espacio = asyncio.Event()
+        self._hay_espacio.set()
+        self._tarea: Optional[asyncio.Task] = None
+
+    def _pendientes(self) -> int:
+        return len(self._filas_poa) + len(self._filas_proyecto)
+
+    def encolar(self, filas_poa: List[dict], filas_proyecto: List[dict]):
+        self._filas_poa.extend(filas_poa)
+        self._filas_proyecto.extend(filas_proyecto)
+        if self._pendientes() >= self.maximo:
+            # Buffer lleno: frenar nuevas escrituras hasta vaciarlo
+            self._hay_espacio.clear()
+            self._despertar.set()
+
+    async def esperar_espacio(self):
+        await self._hay_espacio.wait()
+
+    async def vaciar(self):
+        filas_poa, self._filas_poa = self._filas_poa, []
+        filas_proyecto, self._filas_proyecto = self._filas_proyecto, []
+        escrito = not (filas_poa or filas_proyecto)
+        try:
+            if not escrito:
+                async with SessionLocal() as db:
+                    if filas_poa:
+                        await _insertar(db, models.HistoricoPoa, filas_poa)
+                    if filas_proyecto:
+                        await _insertar(db, models.HistoricoProyecto, filas_proyecto)
+                    await db.commit()
+                    escrito = True
+        except Exception as e:
+            print(f"Error al escribir la auditoría diferida: {e}")
+        finally:
+            if not escrito:
+                # Conservar las filas para el siguiente intento (también si se cancela la tarea)
+                self._filas_poa[:0] = filas_poa
+                self._filas_proyecto[:0] = filas_proyecto
+            if self._pendientes() < self.maximo:
+                self._hay_espacio.set()
+
+    async def _ciclo(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._despertar.wait(), timeout=self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._despertar.clear()
+            await self.vaciar()
+
+    def iniciar(self):
+        self.activo = True
+        self._tarea = asyncio.create_task(self._ciclo())
+
+    async def detener(self):
+        if self._tarea:
+            # Esperar a que la tarea termine: un vaciado interrumpido devuelve sus filas al buffer
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+        self.activo = False
+
+        for intento in range(INTENTOS_AL_DETENER):
+            await self.vaciar()
+            if not self._pendientes():
+                return
+            await asyncio.sleep(intento + 1)
+
+        # Último recurso: dejar las filas en el log para poder reinsertarlas a mano
+        print(f"⚠️ No se pudo escribir la auditoría diferida al detener: {self._pendientes()} filas")
+        for tabla, filas in (("HISTORICO_POA", self._filas_poa), ("HISTORICO_PROYECTO", self._filas_proyecto)):
+            for fila in filas:
+                print(f"⚠️ {tabla} {json.dumps(fila, default=str)}")
+
+
+escritor = EscritorAuditoria(AUDITORIA_BUFFER_MAX, AUDITORIA_INTERVALO_SEGUNDOS)
+
+
+@event.listens_for(Session, "after_commit")
+def _encolar_al_confirmar(session):
+    pendiente = session.info.pop(_CLAVE_PENDIENTE, None)
+    if pendiente:
+        escritor.encolar(*pendiente)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_al_revertir(session):
+    session.info.pop(_CLAVE_PENDIENTE, None)
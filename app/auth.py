@@ -4,18 +4,21 @@ from typing import Optional
 from jose import jwt,JWTError
 from passlib.context import CryptContext
 from dotenv import load_dotenv
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 
 from sqlalchemy.future import select
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.models import Usuario
+from app.database import get_db, SessionLocal
+from app.models import Usuario, Permiso, PermisoRol
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+# Ticket corto para abrir /eventos: viaja en la URL y puede quedar en los logs de acceso
+ALCANCE_EVENTOS = "eventos"
+DURACION_TICKET_EVENTOS = timedelta(seconds=60)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
@@ -37,10 +40,15 @@ def crear_token_acceso(data: dict, expires_delta: Optional[timedelta] = None):
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ):
+    return await _usuario_de_token(token, db)
+
+
+async def _usuario_de_token(token: str, db: AsyncSession, alcance: Optional[str] = None):
+    # alcance separa los tickets de /eventos de los tokens de acceso: ninguno sirve por el otro
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
-        if user_id is None:
+        if user_id is None or payload.get("scope") != alcance:
             raise HTTPException(status_code=401, detail="Token inválido")
     except JWTError:
         raise HTTPException(status_code=401, detail="Token inválido")
@@ -53,3 +61,48 @@ async def get_current_user(
         raise HTTPException(status_code=401, detail="Usuario no válido o inactivo")
 
     return user
+
+
+async def tiene_permiso(db: AsyncSession, usuario: Usuario, codigo_permiso: str) -> bool:
+    # Verifica si el rol del usuario tiene asignado el permiso (PERMISO_ROL)
+    result = await db.execute(
+        select(PermisoRol.id_permiso_rol)
+        .join(Permiso, Permiso.id_permiso == PermisoRol.id_permiso)
+        .where(PermisoRol.id_rol == usuario.id_rol, Permiso.codigo_permiso == codigo_permiso)
+    )
+    return result.first() is not None
+
+
+async def get_current_user_sin_sesion(token: str = Depends(oauth2_scheme)):
+    """
+    Como get_current_user, pero valida el token con una sesión propia que se cierra
+    enseguida. Para respuestas en streaming: get_db se cierra recién después de enviar la
+    respuesta y retendría una conexión (idle in transaction) durante toda la descarga.
+    """
+    async with SessionLocal() as db:
+        return await _usuario_de_token(token, db)
+
+
+def crear_ticket_eventos(usuario: Usuario) -> str:
+    return crear_token_acceso(
+        {"sub": str(usuario.id_usuario), "scope": ALCANCE_EVENTOS}, DURACION_TICKET_EVENTOS
+    )
+
+
+async def get_current_user_eventos(
+    token_encabezado: Optional[str] = Depends(OAuth2PasswordBearer(tokenUrl="login", auto_error=False)),
+    ticket: Optional[str] = Query(None),
+):
+    """
+    Usuario de una conexión SSE. EventSource no permite enviar encabezados, así que se
+    acepta ?ticket= con un ticket de POST /eventos/ticket (dura DURACION_TICKET_EVENTOS y
+    solo sirve aquí); el token de acceso no se acepta en la URL porque quedaría en los
+    logs de acceso. Usa una sesión propia que se cierra enseguida: la conexión dura
+    minutos u horas y no debe retener una conexión del pool.
+    """
+    if not (token_encabezado or ticket):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    async with SessionLocal() as db:
+        if token_encabezado:
+            return await _usuario_de_token(token_encabezado, db)
+        return await _usuario_de_token(ticket, db, ALCANCE_EVENTOS)
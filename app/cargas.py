@@ -0,0 +1,248 @@
+import re
+import unicodedata
+import uuid
+from datetime import datetime, timezone, timedelta
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, resumen, eventos
+from app.utils import eliminar_tareas_y_actividades
+
+# Carga de un POA desde el libro Excel (POST /transformar_excel/).
+# transformador_excel convierte la hoja en actividades y tareas; aquí se reemplazan las
+# actividades existentes (si el usuario lo confirmó), se resuelve el detalle de tarea de
+# cada fila por ítem presupuestario y nombre normalizado, y se registra el log de carga.
+# pandas se importa en la primera carga, no al arrancar la app.
+
+
+def quitar_tildes(texto):
+    return ''.join(
+        c for c in unicodedata.normalize('NFD', texto)
+        if unicodedata.category(c) != 'Mn'
+    )
+
+def normalizar_texto(texto):
+    # Quita tildes, pasa a minúsculas, elimina espacios extra y números
+    texto = quitar_tildes(texto).lower()
+    texto = re.sub(r'\d+', '', texto)         # Elimina todos los números
+    texto = re.sub(r'\s+', ' ', texto)        # Reemplaza múltiples espacios por uno solo
+    texto = texto.strip()                     # Quita espacios al inicio y final
+    return texto
+
+
+async def cargar_excel_poa(
+    db: AsyncSession,
+    poa: models.Poa,
+    usuario: models.Usuario,
+    contenido: bytes,
+    nombre_archivo: str,
+    hoja: str,
+    confirmacion: bool,
+) -> dict:
+    """
+    Crea actividades, tareas y programación mensual del POA a partir del libro. Si el POA
+    ya tiene actividades y no hay confirmación no cambia nada y pide confirmar. ValueError
+    si la hoja no tiene el formato esperado; 400 si un ítem o detalle de tarea no existe.
+    """
+    id_poa = poa.id_poa
+
+    # Inicializar variables para logging
+    codigo_poa = poa.codigo_poa
+    proyecto_nombre = ""
+    if poa.id_proyecto:
+        result = await db.execute(select(models.Proyecto).where(models.Proyecto.id_proyecto == poa.id_proyecto))
+        proyecto = result.scalars().first()
+        if proyecto:
+            proyecto_nombre = proyecto.titulo
+
+    # Verificar si ya existen actividades asociadas al POA
+    result = await db.execute(select(models.Actividad).where(models.Actividad.id_poa == id_poa))
+    actividades_existentes = result.scalars().all()
+
+    # Crear zona horaria UTC-5
+    zona_utc_minus_5 = timezone(timedelta(hours=-5))
+
+    # pandas se carga en la primera carga de Excel, no al arrancar
+    from app.scripts.transformador_excel import transformar_excel
+    json_result = transformar_excel(contenido, hoja)
+
+    if actividades_existentes:
+        if not confirmacion:
+            # Si no hay confirmación, enviar mensaje al frontend
+            return {
+                "message": "El POA ya tiene actividades asociadas. ¿Deseas eliminarlas?",
+                "requires_confirmation": True,
+            }
+
+        # Si hay confirmación, eliminar las tareas y actividades asociadas
+        await eliminar_tareas_y_actividades(id_poa,db)
+
+        # Para log de eliminación
+        log_elim = models.LogCargaExcel(
+            id_log=uuid.uuid4(),
+            id_poa=str(id_poa),
+            codigo_poa=codigo_poa,
+            id_usuario=str(usuario.id_usuario),
+            usuario_nombre=usuario.nombre_usuario,
+            usuario_email=usuario.email,
+            proyecto_nombre=proyecto_nombre,
+            fecha_carga=datetime.now(zona_utc_minus_5).replace(tzinfo=None),
+            mensaje=f"Se eliminaron las actividades, sus tareas y programaciones mensuales asociadas debido a que el usuario decidió reemplazar los datos del POA con un nuevo archivo.",
+            nombre_archivo=nombre_archivo,
+            hoja=hoja
+        )
+        db.add(log_elim)
+        await db.commit()
+
+    # Lista para registrar errores
+    errores = []
+    # Crear actividades y tareas en la base de datos
+    for actividad in json_result["actividades"]:
+        # Crear la actividad
+        nueva_actividad = models.Actividad(
+            id_actividad=uuid.uuid4(),
+            id_poa=id_poa,
+            descripcion_actividad=actividad["descripcion_actividad"],
+            total_por_actividad=actividad["total_por_actividad"],
+            saldo_actividad=actividad["total_por_actividad"],  # Inicialmente igual al total
+        )
+        db.add(nueva_actividad)
+        await db.commit()
+        await db.refresh(nueva_actividad)
+
+
+        # Crear las tareas asociadas a la actividad
+        for tarea in actividad["tareas"]:
+            # Extraer el prefijo numérico (si existe) y el resto del nombre
+            match = re.match(r"^(\d+\.\d+)\s+(.*)", tarea["nombre"])
+            if match:
+                nombre_sin_prefijo = match.group(2)  # El nombre sin el prefijo (e.g., "Contratación de servicios profesionales")
+            else:
+                nombre_sin_prefijo = tarea["nombre"]  # Si no hay prefijo, usar el nombre completo
+
+            # Buscar el id_item_presupuestario
+            result = await db.execute(
+                select(models.ItemPresupuestario).where(
+                    (models.ItemPresupuestario.codigo == tarea["item_presupuestario"])
+                )
+            )
+            items_presupuestarios = result.scalars().all()
+
+            if not items_presupuestarios:
+                # Eliminar todo lo subido y lanzar excepción
+                await eliminar_tareas_y_actividades(id_poa, db)
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"No se guardo nada en la base de datos debido a que: \nNo se encontró el item presupuestario con código '{tarea['item_presupuestario']}' y descripción '{nombre_sin_prefijo}'"
+                )
+            nombre_normalizado = normalizar_texto(nombre_sin_prefijo)
+            encontrado = False
+            for item in items_presupuestarios:
+                 # Trae todos los detalles de tarea para ese item
+                result = await db.execute(
+                    select(models.DetalleTarea).where(
+                        models.DetalleTarea.id_item_presupuestario == item.id_item_presupuestario
+                    )
+                )
+                detalles_tarea = result.scalars().all()
+                # Normaliza y compara en Python
+                for detalle in detalles_tarea:
+
+                    nombre_bd = normalizar_texto(detalle.nombre)
+                    if nombre_bd == nombre_normalizado:
+                        id_detalle_tarea = detalle.id_detalle_tarea
+                        encontrado = True
+                        break
+                    else:
+                        continue  # Sigue con el siguiente item si no encontró
+                if encontrado:
+                    break
+            if not encontrado:  # Si no encontró ningún detalle de tarea
+                await eliminar_tareas_y_actividades(id_poa, db)
+                await db.commit()
+
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"No se guardo nada en la base de datos debido a que: \nNo se encontró detalle de tarea para el item presupuestario '{tarea['item_presupuestario']}' y descripción '{nombre_sin_prefijo}'"
+                )
+           # Crear la tarea
+            nueva_tarea = models.Tarea(
+                id_tarea=uuid.uuid4(),
+                id_actividad=nueva_actividad.id_actividad,
+                id_detalle_tarea=id_detalle_tarea,
+                nombre=tarea["nombre"],
+                detalle_descripcion=tarea["detalle_descripcion"],
+                cantidad=tarea["cantidad"],
+                precio_unitario=tarea["precio_unitario"],
+                total=tarea["total"],
+                saldo_disponible=tarea["total"],  # Inicialmente igual al total
+            )
+            db.add(nueva_tarea)
+
+            await db.commit()
+            await db.refresh(nueva_tarea)  
+
+            # Guardar programaciones mensuales si existen y no es solo "suman"
+            prog_ejec = tarea.get("programacion_ejecucion", {})
+            for fecha, valor in prog_ejec.items():
+                # ...dentro del for fecha, valor in prog_ejec.items()...
+                if fecha == "suman":
+                    continue
+                try:
+                    # Extraer el mes y convertirlo a nombre en español
+                    mes_num = int(fecha[5:7])  # "2025-03-01..." -> 3
+                    meses_es = [
+                        "enero", "febrero", "marzo", "abril", "mayo", "junio",
+                        "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
+                    ]
+                    mes_nombre = meses_es[mes_num - 1]
+                    valor_float = float(valor)
+                    nueva_prog = models.ProgramacionMensual(
+                        id_programacion=uuid.uuid4(),
+                        id_tarea=nueva_tarea.id_tarea,
+                        mes=mes_nombre,  # Guardar el nombre del mes
+                        valor=valor_float
+                    )
+                    db.add(nueva_prog)
+                except Exception as e:
+                    continue
+            await db.commit()
+        # Confirmar las tareas después de agregarlas
+        await db.commit()
+
+    # Registrar log de carga
+    log_crea = models.LogCargaExcel(
+        id_log=uuid.uuid4(),
+        id_poa=str(id_poa),
+        codigo_poa=codigo_poa,
+        id_usuario=str(usuario.id_usuario),
+        usuario_nombre=usuario.nombre_usuario,
+        usuario_email=usuario.email,
+        proyecto_nombre=proyecto_nombre,
+        fecha_carga=datetime.now(zona_utc_minus_5).replace(tzinfo=None),
+        # calcula el numero de actividades creadas y se muestra en el mensaje se cargaron ... actividades y sus tareas asociadas desde el archivo {nombre_archivo}."
+        mensaje=f"Se cargaron {len(json_result['actividades'])} actividades y sus tareas asociadas desde el archivo {nombre_archivo}.",
+        nombre_archivo=nombre_archivo,
+        hoja=hoja
+    )
+    db.add(log_crea)
+    await resumen.refrescar_resumen_poa(db, id_poa)
+    await db.commit()
+
+    await eventos.publicar(
+        eventos.CARGA_EXCEL_COMPLETADA,
+        {
+            "id_poa": id_poa, "codigo_poa": codigo_poa, "nombre_archivo": nombre_archivo,
+            "mensaje": log_crea.mensaje, "advertencias": len(errores),
+        },
+        usuario.id_usuario,
+    )
+
+    # Retornar el resultado
+    if errores:
+        return {
+            "message": "Actividades y tareas creadas con advertencias",
+            "errores": errores,
+        }
+    else:
+        return {"message": "Actividades y tareas creadas exitosamente"}
@@ -0,0 +1,158 @@
+import os
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; sin él solo se ofrece gzip
+    brotli = None
+
+# Compresión de respuestas (gzip o brotli según Accept-Encoding).
+# Solo se comprimen los tipos de COMPRESION_TIPOS (JSON, CSV, NDJSON, texto); Excel y PDF
+# ya son formatos comprimidos y text/event-stream debe llegar al cliente sin búfer, así
+# que pasan sin cambios. Una respuesta completa menor que COMPRESION_TAMANO_MINIMO se
+# envía tal cual. Las respuestas en streaming (exportaciones CSV/NDJSON) se comprimen
+# fragmento por fragmento con un flush por fragmento, sin acumular el cuerpo en memoria.
+
+COMPRESION_HABILITADA = os.getenv("COMPRESION_HABILITADA", "true").lower() == "true"
+COMPRESION_TAMANO_MINIMO = int(os.getenv("COMPRESION_TAMANO_MINIMO", 1024))
+COMPRESION_NIVEL_GZIP = int(os.getenv("COMPRESION_NIVEL_GZIP", 6))
+COMPRESION_NIVEL_BROTLI = int(os.getenv("COMPRESION_NIVEL_BROTLI", 4))
+COMPRESION_TIPOS = tuple(
+    t.strip() for t in os.getenv(
+        "COMPRESION_TIPOS", "application/json,application/x-ndjson,text/csv,text/plain,text/html"
+    ).split(",") if t.strip()
+)
+TIPOS_EXCLUIDOS = ("text/event-stream",)
+
+
+def elegir_codificacion(accept_encoding: str) -> Optional[str]:
+    """'br' o 'gzip' según Accept-Encoding (respeta q=0); None si no acepta ninguna."""
+    aceptadas = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        calidad = 1.0
+        if parametros.strip().startswith("q="):
+            try:
+                calidad = float(parametros.strip()[2:])
+            except ValueError:
+                calidad = 0.0
+        aceptadas[nombre.strip()] = calidad
+    if brotli is not None and aceptadas.get("br", 0) > 0:
+        return "br"
+    if aceptadas.get("gzip", aceptadas.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def _comprimible(tipo: str) -> bool:
+    tipo = tipo.split(";")[0].strip().lower()
+    return tipo not in TIPOS_EXCLUIDOS and tipo.startswith(COMPRESION_TIPOS)
+
+
+class _Compresor:
+    def __init__(self, codificacion: str):
+        if codificacion == "br":
+            self._br = brotli.Compressor(quality=COMPRESION_NIVEL_BROTLI)
+        else:
+            self._br = None
+            self._gzip = zlib.compressobj(COMPRESION_NIVEL_GZIP, zlib.DEFLATED, 31)
+
+    def fragmento(self, datos: bytes) -> bytes:
+        """Comprime y vacía el búfer para que el cliente reciba el fragmento ya."""
+        if self._br is not None:
+            return self._br.process(datos) + self._br.flush()
+        return self._gzip.compress(datos) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def fin(self) -> bytes:
+        if self._br is not None:
+            return self._br.finish()
+        return self._gzip.flush(zlib.Z_FINISH)
+
+    def todo(self, datos: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(datos) + self._br.finish()
+        return self._gzip.compress(datos) + self._gzip.flush(zlib.Z_FINISH)
+
+
+class MiddlewareCompresion:
+    """Middleware ASGI puro; se decide al recibir el primer fragmento del cuerpo."""
+
+    def __init__(self, app, tamano_minimo: int = COMPRESION_TAMANO_MINIMO):
+        self.app = app
+        self.tamano_minimo = tamano_minimo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encabezados_peticion = dict(scope.get("headers", []))
+        codificacion = elegir_codificacion(encabezados_peticion.get(b"accept-encoding", b"").decode("latin-1"))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None       # http.response.start retenido hasta ver el cuerpo
+        compresor = None    # activo solo si la respuesta se comprime
+
+        async def enviar(mensaje):
+            nonlocal inicio, compresor
+            if mensaje["type"] == "http.response.start":
+                encabezados = {k.lower(): v for k, v in mensaje.get("headers", [])}
+                tipo = encabezados.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in encabezados or not _comprimible(tipo):
+                    await send(mensaje)
+                else:
+                    inicio = mensaje
+                return
+
+            if mensaje["type"] != "http.response.body" or (inicio is None and compresor is None):
+                await send(mensaje)
+                return
+
+            cuerpo = mensaje.get("body", b"")
+            mas = mensaje.get("more_body", False)
+
+            if compresor is not None:
+                datos = compresor.fragmento(cuerpo) if mas else compresor.fragmento(cuerpo) + compresor.fin()
+                await send({"type": "http.response.body", "body": datos, "more_body": mas})
+                return
+
+            # primer fragmento
+            if not mas and len(cuerpo) < self.tamano_minimo:
+                await send(inicio)
+                inicio = None
+                await send(mensaje)
+                return
+
+            compresor = _Compresor(codificacion)
+            if mas:
+                datos = compresor.fragmento(cuerpo)
+            else:
+                datos = compresor.todo(cuerpo)
+            await send(_inicio_comprimido(inicio, codificacion, None if mas else len(datos)))
+            inicio = None
+            await send({"type": "http.response.body", "body": datos, "more_body": mas})
+
+        await self.app(scope, receive, enviar)
+
+
+def _inicio_comprimido(inicio, codificacion: str, longitud: Optional[int]):
+    encabezados = []
+    vary = b"Accept-Encoding"
+    for nombre, valor in inicio.get("headers", []):
+        nombre_min = nombre.lower()
+        if nombre_min == b"content-length":
+            continue
+        if nombre_min == b"vary":
+            vary = valor + b", " + vary
+            continue
+        if nombre_min == b"etag" and not valor.startswith(b"W/"):
+            # otra representación del mismo recurso: el ETag pasa a ser débil
+            valor = b"W/" + valor
+        encabezados.append((nombre, valor))
+    encabezados.append((b"content-encoding", codificacion.encode()))
+    encabezados.append((b"vary", vary))
+    if longitud is not None:
+        encabezados.append((b"content-length", str(longitud).encode()))
+    return {**inicio, "headers": encabezados}
@@ -0,0 +1,54 @@
+import hashlib
+from typing import Iterable, Optional, Tuple
+from fastapi import Header, HTTPException, Request, Response
+
+# Control de concurrencia optimista.
+# POA, ACTIVIDAD, TAREA y PROGRAMACION_MENSUAL tienen una columna `version` que el ORM
+# usa como version_id_col: cada UPDATE/DELETE lleva "WHERE version = :v" y si otra
+# transacción ya la cambió se produce StaleDataError (respondido como 409). La versión
+# también es el ETag de la entidad: el cliente la envía en If-Match al editar y en
+# If-None-Match al consultar para recibir 304 si nada cambió.
+
+MENSAJE_CONFLICTO = "El registro fue modificado por otro usuario; recárguelo e intente de nuevo"
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def etag_coleccion(pares: Iterable[Tuple[object, int]]) -> str:
+    """ETag de un listado a partir de los pares (id, version) de sus elementos."""
+    huella = hashlib.sha1(
+        "|".join(f"{id_}:{version}" for id_, version in sorted(pares, key=lambda p: str(p[0]))).encode()
+    )
+    return f'"{huella.hexdigest()}"'
+
+
+def _etiquetas(encabezado: str):
+    # acepta etiquetas débiles (W/"3") y varias separadas por comas
+    return [etiqueta.strip().removeprefix("W/").strip('"') for etiqueta in encabezado.split(",")]
+
+
+def version_esperada(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    """Dependencia: versión que el cliente espera modificar, tomada de If-Match."""
+    if not if_match or if_match.strip() == "*":
+        return None
+    try:
+        return int(_etiquetas(if_match)[0])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Encabezado If-Match inválido")
+
+
+def verificar_version(objeto, esperada: Optional[int]):
+    if esperada is not None and objeto.version != esperada:
+        raise HTTPException(status_code=409, detail=MENSAJE_CONFLICTO)
+
+
+def no_modificado(request: Request, etag_actual: str) -> Optional[Response]:
+    """Retorna una respuesta 304 si el ETag enviado en If-None-Match sigue vigente."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*" or etag_actual.strip('"') in _etiquetas(if_none_match)
+    ):
+        return Response(status_code=304, headers={"ETag": etag_actual})
+    return None
@@ -2,15 +2,24 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 import ssl
+from app.instrumentacion import instrumentar_engine, INSTRUMENTACION_HABILITADA
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# DATABASE_SSL=false para Postgres local (benchmarks, desarrollo) sin TLS
+DATABASE_SSL = os.getenv("DATABASE_SSL", "true").lower() == "true"
 ssl_context = ssl.create_default_context()
 
 engine = create_async_engine(
     DATABASE_URL.replace("?sslmode=require", ""),  # limpia la URL
-    echo=True,
-    connect_args={"ssl": ssl_context}
+    echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+    connect_args={"ssl": ssl_context} if DATABASE_SSL else {},
+    # tamaño del pool por proceso (por worker); ajustar junto con la cantidad de workers
+    pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
 )
+if INSTRUMENTACION_HABILITADA:
+    instrumentar_engine(engine)
 SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
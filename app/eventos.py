@@ -0,0 +1,170 @@
+import asyncio
+import itertools
+import json
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Set
+from sqlalchemy import text
+from app.database import engine
+
+# Eventos en vivo para el frontend (GET /eventos, server-sent events).
+# Cada conexión SSE se suscribe con el id del usuario y recibe los eventos dirigidos a él
+# (carga Excel terminada, exportación terminada, reforma aprobada) en lugar de consultar
+# periódicamente /logs-carga-excel/ o /poas/{id_poa}/reformas.
+#
+# EVENTOS_BUS elige cómo viajan los eventos:
+# - local: cola en memoria del proceso; basta con un solo worker.
+# - postgres: publicar hace NOTIFY en CANAL_POSTGRES y cada worker escucha con LISTEN en
+#   una conexión dedicada, así el evento llega aunque el usuario esté conectado a otro
+#   worker. El payload de NOTIFY admite hasta 8000 bytes; los eventos llevan solo ids.
+
+EVENTOS_BUS = os.getenv("EVENTOS_BUS", "local").lower()
+CANAL_POSTGRES = "poa_eventos"
+INTERVALO_LATIDO = int(os.getenv("EVENTOS_LATIDO_SEGUNDOS", 15))
+TAMANO_COLA = 100  # eventos pendientes por conexión; si el cliente no lee se descartan
+
+CARGA_EXCEL_COMPLETADA = "carga_excel_completada"
+EXPORTACION_COMPLETADA = "exportacion_completada"
+REFORMA_APROBADA = "reforma_aprobada"
+
+
+class BusLocal:
+    def __init__(self):
+        self._suscriptores: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._secuencia = itertools.count(1)
+
+    async def iniciar(self):
+        pass
+
+    async def detener(self):
+        pass
+
+    @contextmanager
+    def suscribir(self, id_usuario: str):
+        cola = asyncio.Queue(maxsize=TAMANO_COLA)
+        self._suscriptores[id_usuario].add(cola)
+        try:
+            yield cola
+        finally:
+            self._suscriptores[id_usuario].discard(cola)
+            if not self._suscriptores[id_usuario]:
+                del self._suscriptores[id_usuario]
+
+    def conexiones(self) -> int:
+        return sum(len(colas) for colas in self._suscriptores.values())
+
+    def entregar(self, evento: dict):
+        """Pone el evento en las colas del usuario destino (todas si no tiene destino)."""
+        destino = evento.get("id_usuario")
+        colas = self._suscriptores.get(destino, ()) if destino else [
+            cola for colas in self._suscriptores.values() for cola in colas
+        ]
+        evento = {**evento, "id": next(self._secuencia)}
+        for cola in list(colas):
+            try:
+                cola.put_nowait(evento)
+            except asyncio.QueueFull:
+                pass
+
+    async def publicar(self, tipo: str, datos: dict, id_usuario=None):
+        self.entregar(_evento(tipo, datos, id_usuario))
+
+    def cerrar_flujos(self):
+        """Termina los flujos abiertos (al apagar el worker) para que no retengan el apagado."""
+        for colas in list(self._suscriptores.values()):
+            for cola in list(colas):
+                if cola.full():
+                    cola.get_nowait()
+                cola.put_nowait(None)
+
+
+class BusPostgres(BusLocal):
+    def __init__(self):
+        super().__init__()
+        self._conexion = None
+        self._tarea = None
+
+    async def iniciar(self):
+        self._tarea = asyncio.create_task(self._escuchar())
+
+    async def detener(self):
+        if self._tarea:
+            self._tarea.cancel()
+        if self._conexion is not None:
+            await self._conexion.close()
+
+    async def _escuchar(self):
+        # conexión dedicada fuera de la sesión; si se cae se vuelve a conectar
+        while True:
+            try:
+                self._conexion = await engine.connect()
+                cruda = (await self._conexion.get_raw_connection()).driver_connection
+                perdida = asyncio.Event()
+                cruda.add_termination_listener(lambda _: perdida.set())
+                await cruda.add_listener(CANAL_POSTGRES, self._notificacion)
+                await perdida.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ LISTEN {CANAL_POSTGRES} falló: {e}")
+            try:
+                await self._conexion.close()
+            except Exception:
+                pass
+            await asyncio.sleep(5)
+
+    def _notificacion(self, conexion, pid, canal, payload):
+        self.entregar(json.loads(payload))
+
+    async def publicar(self, tipo: str, datos: dict, id_usuario=None):
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:canal, :payload)"),
+                {"canal": CANAL_POSTGRES, "payload": json.dumps(_evento(tipo, datos, id_usuario), default=str)},
+            )
+
+
+def _evento(tipo: str, datos: dict, id_usuario) -> dict:
+    return {"tipo": tipo, "datos": datos, "id_usuario": str(id_usuario) if id_usuario else None}
+
+
+bus = BusPostgres() if EVENTOS_BUS == "postgres" else BusLocal()
+
+
+async def publicar(tipo: str, datos: dict, id_usuario=None):
+    """Publica un evento; un fallo al notificar no debe romper la operación que lo origina."""
+    try:
+        await bus.publicar(tipo, datos, id_usuario)
+    except Exception as e:
+        print(f"⚠️ No se pudo publicar el evento {tipo}: {e}")
+
+
+def formato_sse(evento: dict) -> str:
+    datos = json.dumps(evento["datos"], default=str, ensure_ascii=False)
+    return f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {datos}\n\n"
+
+
+async def flujo_sse(id_usuario: str) -> AsyncIterator[str]:
+    """Mensajes SSE del usuario; un comentario de latido mantiene viva la conexión en proxies."""
+    with bus.suscribir(id_usuario) as cola:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                evento = await asyncio.wait_for(cola.get(), timeout=INTERVALO_LATIDO)
+            except asyncio.TimeoutError:
+                yield ": latido\n\n"
+                continue
+            if evento is None:
+                # el worker se apaga; el navegador se reconecta a otro según retry
+                return
+            yield formato_sse(evento)
+
+
+async def publicar_al_terminar(
+    contenido: AsyncIterator, tipo: str, datos: dict, id_usuario
+) -> AsyncIterator:
+    """Reenvía una respuesta en streaming y publica el evento cuando se envió completa."""
+    async for fragmento in contenido:
+        yield fragmento
+    await publicar(tipo, datos, id_usuario)
@@ -0,0 +1,148 @@
+import io
+from typing import AsyncIterator, Optional, Sequence
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, String, cast, select
+from sqlalchemy.dialects.postgresql import UUID
+from app import models, agregados
+from app.database import SessionLocal
+
+# Exportación columnar (Parquet o Arrow IPC) de proyectos, POAs, actividades, tareas y
+# programación mensual para el equipo de analítica.
+# Cada tabla se exporta con tipos explícitos (decimal128 con la precisión de la columna,
+# date32, timestamp) y los UUID como texto. Las filas se leen del cursor del servidor en
+# lotes de FILAS_POR_GRUPO; cada lote se escribe como un row group de Parquet o un record
+# batch de Arrow y los bytes se envían de inmediato, sin armar el archivo en memoria.
+# pyarrow se importa solo al exportar para no cargarlo en el arranque de la app.
+
+FILAS_POR_GRUPO = 50_000
+
+TIPOS_MEDIO = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+EXTENSIONES = {"parquet": "parquet", "arrow": "arrows"}
+
+ENTIDADES = {
+    "proyectos": models.Proyecto.__table__,
+    "poas": models.Poa.__table__,
+    "actividades": models.Actividad.__table__,
+    "tareas": models.Tarea.__table__,
+    "programacion_mensual": models.ProgramacionMensual.__table__,
+}
+
+# columnas internas que no interesan para análisis
+COLUMNAS_OMITIDAS = {"version"}
+
+
+def _tipo_arrow(pa, tipo):
+    if isinstance(tipo, UUID):
+        return pa.string()
+    if isinstance(tipo, Numeric):
+        return pa.decimal128(tipo.precision or 18, tipo.scale or 0)
+    if isinstance(tipo, Boolean):
+        return pa.bool_()
+    if isinstance(tipo, Integer):
+        return pa.int64()
+    if isinstance(tipo, DateTime):
+        return pa.timestamp("us")
+    if isinstance(tipo, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _columnas(entidad: str):
+    tabla = ENTIDADES[entidad]
+    columnas = [c for c in tabla.columns if c.name not in COLUMNAS_OMITIDAS]
+    seleccion = [cast(c, String).label(c.name) if isinstance(c.type, UUID) else c for c in columnas]
+    tipos = [c.type for c in columnas]
+    if entidad == "programacion_mensual":
+        # mes normalizado (1-12) sin importar si se guardó como 'MM-AAAA' o como nombre
+        seleccion.append(agregados.numero_mes(tabla.c.mes).label("numero_mes"))
+        tipos.append(Integer())
+    return seleccion, tipos
+
+
+def consulta_exportacion(entidad: str, anios: Optional[Sequence[str]] = None):
+    seleccion, _ = _columnas(entidad)
+    query = select(*seleccion)
+    if not anios:
+        return query
+
+    POA = agregados.POA
+    ACTIVIDAD = agregados.ACTIVIDAD
+    TAREA = agregados.TAREA
+    if entidad == "proyectos":
+        return query.where(
+            agregados.PROYECTO.c.id_proyecto.in_(select(POA.c.id_proyecto).where(POA.c.anio_ejecucion.in_(anios)))
+        )
+    if entidad == "poas":
+        return query.where(POA.c.anio_ejecucion.in_(anios))
+    if entidad == "actividades":
+        return query.join(POA, POA.c.id_poa == ACTIVIDAD.c.id_poa).where(POA.c.anio_ejecucion.in_(anios))
+    if entidad == "tareas":
+        return (
+            query.join(ACTIVIDAD, ACTIVIDAD.c.id_actividad == TAREA.c.id_actividad)
+            .join(POA, POA.c.id_poa == ACTIVIDAD.c.id_poa)
+            .where(POA.c.anio_ejecucion.in_(anios))
+        )
+    return (
+        query.join(TAREA, TAREA.c.id_tarea == agregados.PROGRAMACION_MENSUAL.c.id_tarea)
+        .join(ACTIVIDAD, ACTIVIDAD.c.id_actividad == TAREA.c.id_actividad)
+        .join(POA, POA.c.id_poa == ACTIVIDAD.c.id_poa)
+        .where(POA.c.anio_ejecucion.in_(anios))
+    )
+
+
+class _Salida(io.RawIOBase):
+    """Archivo de solo escritura que acumula bytes hasta que se retiran con vaciar()."""
+
+    def __init__(self):
+        self._datos = bytearray()
+        self._posicion = 0
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self._datos += datos
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def vaciar(self) -> bytes:
+        datos = bytes(self._datos)
+        self._datos.clear()
+        return datos
+
+
+async def exportar(entidad: str, formato: str, anios: Optional[Sequence[str]] = None) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+
+    seleccion, tipos = _columnas(entidad)
+    esquema = pa.schema([pa.field(c.name, _tipo_arrow(pa, t)) for c, t in zip(seleccion, tipos)])
+    query = consulta_exportacion(entidad, anios).execution_options(yield_per=FILAS_POR_GRUPO)
+
+    salida = _Salida()
+    if formato == "parquet":
+        escritor = pq.ParquetWriter(salida, esquema, compression="zstd")
+    else:
+        escritor = pa.ipc.new_stream(salida, esquema)
+
+    # Sesión propia, abierta solo mientras se genera el archivo; el endpoint no usa la
+    # sesión de la petición (get_db), que seguiría abierta hasta terminar la respuesta
+    async with SessionLocal() as db:
+        result = await db.stream(query)
+        async for lote in result.partitions():
+            columnas = list(zip(*lote))
+            lote_arrow = pa.RecordBatch.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)],
+                schema=esquema,
+            )
+            escritor.write_batch(lote_arrow)
+            yield salida.vaciar()
+
+    escritor.close()
+    yield salida.vaciar()
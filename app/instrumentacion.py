@@ -0,0 +1,369 @@
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Instrumentación de rendimiento por petición.
+# Los eventos del engine (before/after_cursor_execute) acumulan en una ContextVar la
+# cantidad de sentencias SQL, el tiempo en base de datos y las filas de cada petición.
+# El middleware publica esos valores en el encabezado Server-Timing y los agrega a las
+# métricas por ruta que expone GET /metrics en formato de texto de Prometheus.
+#
+# Detector de N+1 (desarrollo y pruebas): con DETECTOR_N1=advertir|fallar cada sentencia
+# se normaliza a una huella (sin literales ni parámetros) y, si la misma huella se repite
+# más de DETECTOR_N1_UMBRAL veces en una petición, se imprime una advertencia al terminar
+# o se lanza ConsultasRepetidasError en la repetición que supera el umbral.
+
+INSTRUMENTACION_HABILITADA = os.getenv("INSTRUMENTACION_HABILITADA", "true").lower() == "true"
+
+# límites (segundos) del histograma de latencia y de consultas por petición
+LIMITES_DURACION = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+RUTA_METRICAS = "/metrics"
+# conexiones SSE de larga duración: distorsionarían el histograma de latencia
+RUTAS_SIN_METRICAS = {RUTA_METRICAS, "/eventos"}
+
+DETECTOR_N1 = os.getenv("DETECTOR_N1", "").lower()  # "", "advertir" o "fallar"
+DETECTOR_N1_UMBRAL = int(os.getenv("DETECTOR_N1_UMBRAL", 10))
+
+
+class ConsultasRepetidasError(RuntimeError):
+    """La misma forma de sentencia SQL se repitió más veces que el umbral (posible N+1)."""
+
+
+@dataclass
+class EstadisticasPeticion:
+    inicio: float
+    consultas: int = 0
+    tiempo_db: float = 0.0
+    filas: int = 0
+    huellas: Optional[Counter] = None  # solo con el detector de N+1 o en una captura
+
+
+_peticion_actual: ContextVar[Optional[EstadisticasPeticion]] = ContextVar("peticion_actual", default=None)
+
+
+# capturas activas (pruebas y scripts): reciben todas las sentencias del proceso,
+# sin depender del contexto de la petición ni del hilo en que se ejecuta la app
+_capturas: List[EstadisticasPeticion] = []
+
+
+def estadisticas_actuales() -> Optional[EstadisticasPeticion]:
+    return _peticion_actual.get()
+
+
+# ---------------------------------------------------------------------------
+# Huellas de sentencias SQL
+# ---------------------------------------------------------------------------
+
+_RE_CADENA = re.compile(r"'(?:[^']|'')*'")
+_RE_PARAMETRO = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?|%\(\w+\)s|%s|\?")
+_RE_NUMERO = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+_RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_FILAS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+def huella_sql(sentencia: str) -> str:
+    """
+    Forma normalizada de una sentencia: literales y parámetros se reemplazan por ?,
+    las listas IN (...) y las filas de VALUES se colapsan para que el tamaño del lote
+    no cambie la huella.
+    """
+    texto = _RE_CADENA.sub("?", sentencia)
+    texto = _RE_PARAMETRO.sub("?", texto)
+    texto = _RE_NUMERO.sub("?", texto)
+    texto = _RE_LISTA.sub("(...)", texto)
+    texto = _RE_FILAS.sub("(...)", texto)
+    return _RE_ESPACIOS.sub(" ", texto).strip()
+
+
+def repetidas(estadisticas: EstadisticasPeticion, umbral: int) -> List[Tuple[str, int]]:
+    """Huellas que se ejecutaron más de `umbral` veces, de la más repetida a la menos."""
+    if not estadisticas.huellas:
+        return []
+    return [(huella, n) for huella, n in estadisticas.huellas.most_common() if n > umbral]
+
+
+@contextmanager
+def capturar_consultas():
+    """
+    Cuenta todas las sentencias SQL ejecutadas dentro del bloque, con sus huellas:
+
+        with capturar_consultas() as captura:
+            await seed_all_data()
+        print(captura.consultas, repetidas(captura, 10))
+    """
+    captura = EstadisticasPeticion(inicio=time.perf_counter(), huellas=Counter())
+    _capturas.append(captura)
+    try:
+        yield captura
+    finally:
+        _capturas.remove(captura)
+
+
+# ---------------------------------------------------------------------------
+# Eventos de SQLAlchemy
+# ---------------------------------------------------------------------------
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("instrumentacion_inicio", []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    inicio = conn.info["instrumentacion_inicio"].pop()
+    # rowcount: filas devueltas por un SELECT o afectadas por INSERT/UPDATE/DELETE
+    filas = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+    _registrar(statement, time.perf_counter() - inicio, filas, revisar_n1=True)
+
+
+def _al_fallar(contexto):
+    # Una sentencia que falla no pasa por after_cursor_execute: sacar su inicio de la
+    # conexión (que vuelve al pool) y contarla igual en la petición
+    inicios = contexto.connection.info.get("instrumentacion_inicio") if contexto.connection is not None else None
+    if not inicios or contexto.statement is None:
+        return
+    _registrar(contexto.statement, time.perf_counter() - inicios.pop(), 0, revisar_n1=False)
+
+
+def _registrar(statement: str, duracion: float, filas: int, revisar_n1: bool):
+    estadisticas = _peticion_actual.get()
+    if estadisticas is None and not _capturas:
+        return
+    huella = None
+
+    for destino in ([estadisticas] if estadisticas else []) + _capturas:
+        destino.consultas += 1
+        destino.tiempo_db += duracion
+        destino.filas += filas
+        if destino.huellas is not None:
+            huella = huella or huella_sql(statement)
+            destino.huellas[huella] += 1
+
+    if revisar_n1 and DETECTOR_N1 == "fallar" and estadisticas and estadisticas.huellas is not None:
+        repeticiones = estadisticas.huellas[huella]
+        if repeticiones > DETECTOR_N1_UMBRAL:
+            raise ConsultasRepetidasError(
+                f"Posible N+1: la sentencia se ejecutó {repeticiones} veces en la petición "
+                f"(umbral {DETECTOR_N1_UMBRAL}): {huella[:300]}"
+            )
+
+
+def instrumentar_engine(engine: AsyncEngine):
+    motor = engine.sync_engine
+    if not event.contains(motor, "before_cursor_execute", _antes_de_ejecutar):
+        event.listen(motor, "before_cursor_execute", _antes_de_ejecutar)
+        event.listen(motor, "after_cursor_execute", _despues_de_ejecutar)
+        event.listen(motor, "handle_error", _al_fallar)
+    metricas.vigilar_pool(motor.pool)
+
+
+class _MonitorPool:
+    """Uso del pool de conexiones: conexiones prestadas, máximo observado y capacidad."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.prestamos = 0
+        self.maximo_en_uso = 0
+        event.listen(pool, "checkout", self._al_prestar)
+
+    def _al_prestar(self, conexion_dbapi, registro, proxy):
+        self.prestamos += 1
+        self.maximo_en_uso = max(self.maximo_en_uso, self.pool.checkedout())
+
+    def valores(self):
+        tamano = self.pool.size()
+        desborde_maximo = getattr(self.pool, "_max_overflow", 0)
+        return {
+            "tamano": tamano,
+            # -1 = desborde ilimitado: la capacidad no está acotada
+            "capacidad": tamano + desborde_maximo if desborde_maximo >= 0 else -1,
+            "en_uso": self.pool.checkedout(),
+            "en_uso_maximo": self.maximo_en_uso,
+            "desborde": max(self.pool.overflow(), 0),
+            "prestamos_total": self.prestamos,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Métricas acumuladas por ruta
+# ---------------------------------------------------------------------------
+
+class _Histograma:
+    def __init__(self, limites):
+        self.limites = limites
+        self.cubetas = [0] * len(limites)
+        self.suma = 0.0
+        self.cantidad = 0
+
+    def observar(self, valor):
+        self.suma += valor
+        self.cantidad += 1
+        for i, limite in enumerate(self.limites):
+            if valor <= limite:
+                self.cubetas[i] += 1
+
+
+class _MetricasRuta:
+    def __init__(self):
+        self.peticiones_por_estado = {}
+        self.duracion = _Histograma(LIMITES_DURACION)
+        self.consultas = _Histograma(LIMITES_CONSULTAS)
+        self.tiempo_db = 0.0
+        self.filas = 0
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._rutas = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[_MonitorPool] = None
+
+    def vigilar_pool(self, pool):
+        # solo pools con tamaño (QueuePool/AsyncAdaptedQueuePool); NullPool no aplica
+        if hasattr(pool, "checkedout") and (self._pool is None or self._pool.pool is not pool):
+            self._pool = _MonitorPool(pool)
+
+    def registrar(self, metodo: str, ruta: str, estado: int, duracion: float, estadisticas: EstadisticasPeticion):
+        with self._lock:
+            metricas = self._rutas.get((metodo, ruta))
+            if metricas is None:
+                metricas = self._rutas[(metodo, ruta)] = _MetricasRuta()
+            metricas.peticiones_por_estado[estado] = metricas.peticiones_por_estado.get(estado, 0) + 1
+            metricas.duracion.observar(duracion)
+            metricas.consultas.observar(estadisticas.consultas)
+            metricas.tiempo_db += estadisticas.tiempo_db
+            metricas.filas += estadisticas.filas
+
+    def reiniciar(self):
+        with self._lock:
+            self._rutas.clear()
+
+    def exportar(self) -> str:
+        """Texto en formato de exposición de Prometheus (versión 0.0.4)."""
+        lineas = []
+
+        def encabezado(nombre, tipo, ayuda):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+
+        def histograma(nombre, etiquetas, h: _Histograma):
+            for limite, cantidad in zip(h.limites, h.cubetas):
+                lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {cantidad}')
+            lineas.append(f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {h.cantidad}')
+            lineas.append(f"{nombre}_sum{{{etiquetas}}} {h.suma}")
+            lineas.append(f"{nombre}_count{{{etiquetas}}} {h.cantidad}")
+
+        with self._lock:
+            rutas = sorted(self._rutas.items())
+
+            encabezado("poa_http_peticiones_total", "counter", "Peticiones HTTP atendidas")
+            for (metodo, ruta), m in rutas:
+                for estado, cantidad in sorted(m.peticiones_por_estado.items()):
+                    lineas.append(
+                        f'poa_http_peticiones_total{{metodo="{metodo}",ruta="{ruta}",estado="{estado}"}} {cantidad}'
+                    )
+
+            encabezado("poa_http_duracion_segundos", "histogram", "Duración de las peticiones HTTP")
+            for (metodo, ruta), m in rutas:
+                histograma("poa_http_duracion_segundos", f'metodo="{metodo}",ruta="{ruta}"', m.duracion)
+
+            encabezado("poa_db_consultas_por_peticion", "histogram", "Sentencias SQL ejecutadas por petición")
+            for (metodo, ruta), m in rutas:
+                histograma("poa_db_consultas_por_peticion", f'metodo="{metodo}",ruta="{ruta}"', m.consultas)
+
+            encabezado("poa_db_tiempo_segundos_total", "counter", "Tiempo acumulado en la base de datos")
+            for (metodo, ruta), m in rutas:
+                lineas.append(f'poa_db_tiempo_segundos_total{{metodo="{metodo}",ruta="{ruta}"}} {m.tiempo_db}')
+
+            encabezado("poa_db_filas_total", "counter", "Filas devueltas o afectadas por las sentencias SQL")
+            for (metodo, ruta), m in rutas:
+                lineas.append(f'poa_db_filas_total{{metodo="{metodo}",ruta="{ruta}"}} {m.filas}')
+
+        if self._pool is not None:
+            valores = self._pool.valores()
+            for nombre, tipo, ayuda in (
+                ("tamano", "gauge", "Conexiones permanentes del pool"),
+                ("capacidad", "gauge", "Conexiones máximas (tamaño + desborde; -1 sin límite)"),
+                ("en_uso", "gauge", "Conexiones prestadas en este momento"),
+                ("en_uso_maximo", "gauge", "Máximo de conexiones prestadas a la vez desde el inicio"),
+                ("desborde", "gauge", "Conexiones abiertas por encima del tamaño del pool"),
+                ("prestamos_total", "counter", "Conexiones entregadas por el pool"),
+            ):
+                encabezado(f"poa_db_pool_{nombre}", tipo, ayuda)
+                lineas.append(f"poa_db_pool_{nombre} {valores[nombre]}")
+
+        return "\n".join(lineas) + "\n"
+
+
+metricas = RegistroMetricas()
+
+
+# ---------------------------------------------------------------------------
+# Middleware ASGI
+# ---------------------------------------------------------------------------
+
+def _plantilla_ruta(scope) -> str:
+    # se usa la plantilla (/poas/{id}) y no la URL real para acotar las etiquetas
+    ruta = scope.get("route")
+    return getattr(ruta, "path", None) or "sin_ruta"
+
+
+def server_timing(estadisticas: EstadisticasPeticion, duracion: float) -> str:
+    return (
+        f"app;dur={duracion * 1000:.1f}, "
+        f'db;dur={estadisticas.tiempo_db * 1000:.1f};desc="{estadisticas.consultas} consultas", '
+        f'filas;desc="{estadisticas.filas}"'
+    )
+
+
+class MiddlewareInstrumentacion:
+    """
+    Middleware ASGI puro (no BaseHTTPMiddleware) para que las respuestas en streaming
+    se midan hasta el último fragmento y no solo hasta los encabezados.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in RUTAS_SIN_METRICAS:
+            await self.app(scope, receive, send)
+            return
+
+        estadisticas = EstadisticasPeticion(
+            inicio=time.perf_counter(), huellas=Counter() if DETECTOR_N1 else None
+        )
+        token = _peticion_actual.set(estadisticas)
+        estado = 500
+
+        async def enviar(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+                duracion = time.perf_counter() - estadisticas.inicio
+                encabezados = list(mensaje.get("headers", []))
+                encabezados.append((b"server-timing", server_timing(estadisticas, duracion).encode("latin-1")))
+                mensaje = {**mensaje, "headers": encabezados}
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _peticion_actual.reset(token)
+            ruta = _plantilla_ruta(scope)
+            metricas.registrar(
+                scope["method"], ruta, estado,
+                time.perf_counter() - estadisticas.inicio, estadisticas,
+            )
+            if DETECTOR_N1 == "advertir":
+                for huella, n in repetidas(estadisticas, DETECTOR_N1_UMBRAL):
+                    print(f"⚠️ Posible N+1 en {scope['method']} {ruta}: {n} ejecuciones de: {huella[:300]}")
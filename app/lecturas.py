@@ -0,0 +1,77 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Sequence, Type
+import uuid
+from pydantic import BaseModel
+from sqlalchemy import Row, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, schemas
+
+# Lecturas con SQLAlchemy Core para los listados de mayor volumen.
+# Se seleccionan solo las columnas del esquema de salida y la consulta se ejecuta en la
+# conexión de la sesión: no se construyen objetos ORM, no pasan por el identity map ni
+# quedan en la unidad de trabajo. Cada función retorna filas (Row) con atributos con el
+# nombre de los campos, listas para respuestas.respuesta_filas(). Para editar una
+# entidad se sigue cargando el objeto ORM (version_id_col, auditoría).
+
+POA = models.Poa.__table__
+ACTIVIDAD = models.Actividad.__table__
+TAREA = models.Tarea.__table__
+HISTORICO_POA = models.HistoricoPoa.__table__
+USUARIO = models.Usuario.__table__
+
+
+@lru_cache(maxsize=None)
+def columnas(tabla: Table, esquema: Type[BaseModel]) -> tuple:
+    """Columnas de `tabla` que corresponden a campos de `esquema`."""
+    return tuple(tabla.c[campo] for campo in esquema.model_fields if campo in tabla.c)
+
+
+async def _filas(db: AsyncSession, consulta) -> Sequence[Row]:
+    conexion = await db.connection()
+    return (await conexion.execute(consulta)).all()
+
+
+async def poas(db: AsyncSession, id_proyecto: Optional[uuid.UUID] = None) -> Sequence[Row]:
+    consulta = select(*columnas(POA, schemas.PoaOut))
+    if id_proyecto is not None:
+        consulta = consulta.where(POA.c.id_proyecto == id_proyecto)
+    return await _filas(db, consulta)
+
+
+async def actividades_de_poa(db: AsyncSession, id_poa: uuid.UUID) -> Sequence[Row]:
+    return await _filas(
+        db, select(*columnas(ACTIVIDAD, schemas.ActividadOut)).where(ACTIVIDAD.c.id_poa == id_poa)
+    )
+
+
+async def tareas_de_actividad(db: AsyncSession, id_actividad: uuid.UUID) -> Sequence[Row]:
+    return await _filas(
+        db, select(*columnas(TAREA, schemas.TareaOut)).where(TAREA.c.id_actividad == id_actividad)
+    )
+
+
+async def historial_poa(
+    db: AsyncSession, id_poa: uuid.UUID, desde: Optional[date] = None, hasta: Optional[date] = None
+) -> Sequence[Row]:
+    """Historial de cambios del POA, más reciente primero, con el nombre del usuario."""
+    consulta = (
+        select(
+            HISTORICO_POA.c.campo_modificado,
+            HISTORICO_POA.c.valor_anterior,
+            HISTORICO_POA.c.valor_nuevo,
+            HISTORICO_POA.c.justificacion,
+            HISTORICO_POA.c.fecha_modificacion,
+            USUARIO.c.nombre_usuario.label("usuario"),
+        )
+        .join(USUARIO, USUARIO.c.id_usuario == HISTORICO_POA.c.id_usuario)
+        .where(HISTORICO_POA.c.id_poa == id_poa)
+    )
+    # El rango de fechas limita la consulta a las particiones anuales correspondientes
+    if desde:
+        consulta = consulta.where(HISTORICO_POA.c.fecha_modificacion >= datetime.combine(desde, datetime.min.time()))
+    if hasta:
+        consulta = consulta.where(
+            HISTORICO_POA.c.fecha_modificacion < datetime.combine(hasta + timedelta(days=1), datetime.min.time())
+        )
+    return await _filas(db, consulta.order_by(HISTORICO_POA.c.fecha_modificacion.desc()))
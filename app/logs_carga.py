@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional, Tuple
+from sqlalchemy import select, func
+from app import models
+from app.database import SessionLocal
+
+# Consultas de LOG_CARGA_EXCEL.
+# Se seleccionan solo las columnas que se muestran y el formato (fecha como texto,
+# nulos como cadena vacía) lo resuelve PostgreSQL, así que cada fila llega lista
+# para serializar sin construir objetos ORM. El filtro por fecha usa el índice de
+# fecha_carga y recorre solo las particiones anuales del rango.
+
+# Filas por lote al leer del cursor del servidor durante una exportación
+TAMANO_LOTE_EXPORTACION = 1000
+
+COLUMNAS_LOG = [
+    "fecha_carga", "usuario", "correo_usuario", "proyecto",
+    "codigo_poa", "nombre_archivo", "hoja", "mensaje",
+]
+
+
+def rango_fechas(fecha_inicio: Optional[str], fecha_fin: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Convierte las fechas YYYY-MM-DD del filtro en un rango [desde, hasta).
+    Lanza ValueError si alguna fecha no tiene el formato esperado.
+    """
+    desde = datetime.strptime(fecha_inicio, "%Y-%m-%d") if fecha_inicio else None
+    hasta = datetime.strptime(fecha_fin, "%Y-%m-%d") + timedelta(days=1) if fecha_fin else None
+    return desde, hasta
+
+
+def consulta_logs(desde: Optional[datetime] = None, hasta: Optional[datetime] = None):
+    Log = models.LogCargaExcel
+    query = select(
+        func.to_char(Log.fecha_carga, "YYYY-MM-DD HH24:MI:SS").label("fecha_carga"),
+        func.coalesce(Log.usuario_nombre, "").label("usuario"),
+        func.coalesce(Log.usuario_email, "").label("correo_usuario"),
+        func.coalesce(Log.proyecto_nombre, "").label("proyecto"),
+        func.coalesce(Log.codigo_poa, "").label("codigo_poa"),
+        func.coalesce(Log.nombre_archivo, "").label("nombre_archivo"),
+        func.coalesce(Log.hoja, "").label("hoja"),
+        func.coalesce(Log.mensaje, "").label("mensaje"),
+    )
+    if desde:
+        query = query.where(Log.fecha_carga >= desde)
+    if hasta:
+        query = query.where(Log.fecha_carga < hasta)
+    return query.order_by(Log.fecha_carga.desc())
+
+
+def consulta_total(query):
+    """Cantidad de filas de una consulta de consulta_logs(), sin orden ni paginación."""
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+async def _filas_exportacion(query) -> AsyncIterator[list]:
+    # Sesión propia, abierta solo mientras se envían las filas; el endpoint no usa la
+    # sesión de la petición (get_db), que seguiría abierta hasta terminar la respuesta
+    async with SessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=TAMANO_LOTE_EXPORTACION))
+        async for lote in result.partitions():
+            yield lote
+
+
+async def exportar_csv(query) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUMNAS_LOG)
+    async for lote in _filas_exportacion(query):
+        escritor.writerows(lote)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def exportar_ndjson(query) -> AsyncIterator[str]:
+    async for lote in _filas_exportacion(query):
+        yield "".join(
+            json.dumps(dict(zip(COLUMNAS_LOG, fila)), ensure_ascii=False) + "\n" for fila in lote
+        )
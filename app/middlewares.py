@@ -1,7 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.instrumentacion import MiddlewareInstrumentacion, INSTRUMENTACION_HABILITADA
+from app.compresion import MiddlewareCompresion, COMPRESION_HABILITADA
 
 def add_middlewares(app: FastAPI) -> None:
+    # gzip/brotli para JSON, CSV y NDJSON; el último middleware agregado es el más externo,
+    # así CORS e instrumentación ven la respuesta ya comprimida
+    if COMPRESION_HABILITADA:
+        app.add_middleware(MiddlewareCompresion)
+
     origins = [
         "https://poa-front.vercel.app"
     ]
@@ -12,4 +19,9 @@ def add_middlewares(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "Server-Timing", "X-Total-Count", "Link"],
     )
+
+    # latencia, consultas SQL y tiempo en base de datos por petición
+    if INSTRUMENTACION_HABILITADA:
+        app.add_middleware(MiddlewareInstrumentacion)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Integer, Boolean, Date, DateTime, DECIMAL, ForeignKey, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, Date, DateTime, DECIMAL, ForeignKey, Text, UniqueConstraint, Index, LargeBinary, Identity, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
 from app.database import Base
@@ -122,6 +122,7 @@ class Poa(Base):
     id_tipo_poa = Column(UUID(as_uuid=True), ForeignKey("TIPO_POA.id_tipo_poa"), nullable=False)
     anio_ejecucion = Column(String(4), nullable=False)
     presupuesto_asignado = Column(DECIMAL(18, 2), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # concurrencia optimista (app/concurrencia.py)
 
     proyecto = relationship("Proyecto")
     periodo = relationship("Periodo")
@@ -129,6 +130,8 @@ class Poa(Base):
 
     tipo_poa = relationship("TipoPOA")
 
+    __mapper_args__ = {"version_id_col": version}
+
 class ItemPresupuestario(Base):
     __tablename__ = "ITEM_PRESUPUESTARIO"
 
@@ -174,19 +177,22 @@ class Actividad(Base):
     __tablename__ = "ACTIVIDAD"
 
     id_actividad = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa"), nullable=False)
+    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa"), nullable=False, index=True)
     descripcion_actividad = Column(String(500), nullable=False)
     total_por_actividad = Column(DECIMAL(18, 2), nullable=False)
     saldo_actividad = Column(DECIMAL(18, 2), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # concurrencia optimista (app/concurrencia.py)
 
     poa = relationship("Poa")
     tareas = relationship("Tarea", back_populates="actividad")
 
+    __mapper_args__ = {"version_id_col": version}
+
 class Tarea(Base):
     __tablename__ = "TAREA"
 
     id_tarea = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    id_actividad = Column(UUID(as_uuid=True), ForeignKey("ACTIVIDAD.id_actividad"), nullable=False)
+    id_actividad = Column(UUID(as_uuid=True), ForeignKey("ACTIVIDAD.id_actividad"), nullable=False, index=True)
     id_detalle_tarea = Column(UUID(as_uuid=True), ForeignKey("DETALLE_TAREA.id_detalle_tarea"), nullable=True)
     nombre = Column(String(200))
 
@@ -196,11 +202,14 @@ class Tarea(Base):
     total = Column(DECIMAL(18, 2), nullable=True, default=0)
     saldo_disponible = Column(DECIMAL(18, 2), nullable=True, default=0)
     lineaPaiViiv = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # concurrencia optimista (app/concurrencia.py)
 
     actividad = relationship("Actividad", back_populates="tareas")
     detalle_tarea = relationship("DetalleTarea")
     programacion_mensual = relationship("ProgramacionMensual", back_populates="tarea", cascade="all, delete-orphan")
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class ProgramacionMensual(Base):
     __tablename__ = "PROGRAMACION_MENSUAL"
@@ -209,12 +218,14 @@ class ProgramacionMensual(Base):
     id_tarea = Column(UUID(as_uuid=True), ForeignKey("TAREA.id_tarea"), nullable=False)
     mes = Column(String(15), nullable=False)  # Formato: '01-2026', '02-2026', etc.
     valor = Column(DECIMAL(18, 2), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # concurrencia optimista (app/concurrencia.py)
 
     tarea = relationship("Tarea", back_populates="programacion_mensual")
 
     __table_args__ = (
         UniqueConstraint('id_tarea', 'mes', name='uq_tarea_mes'),
     )
+    __mapper_args__ = {"version_id_col": version}
 
 
 class Permiso(Base):
@@ -251,6 +262,7 @@ class ReformaPoa(Base):
     justificacion = Column(String(500), nullable=False)
     id_usuario_solicita = Column(UUID(as_uuid=True), ForeignKey("USUARIO.id_usuario"), nullable=False)
     id_usuario_aprueba = Column(UUID(as_uuid=True), ForeignKey("USUARIO.id_usuario"))
+    cambios = Column(JSONB, nullable=True)  # cambios de tareas pendientes de aplicar (app/reformas.py)
 
     poa = relationship("Poa")
     usuario_solicita = relationship("Usuario", foreign_keys=[id_usuario_solicita])
@@ -260,8 +272,8 @@ class ControlPresupuestario(Base):
     __tablename__ = "CONTROL_PRESUPUESTARIO"
 
     id_control = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa"), nullable=False)
-    id_tarea = Column(UUID(as_uuid=True), ForeignKey("TAREA.id_tarea"), nullable=False)
+    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa"), nullable=False, index=True)
+    id_tarea = Column(UUID(as_uuid=True), ForeignKey("TAREA.id_tarea"), nullable=False, index=True)
     fecha_registro = Column(DateTime, nullable=False)
     monto_certificado = Column(DECIMAL(18, 2), nullable=False)
     monto_comprometido = Column(DECIMAL(18, 2), nullable=False)
@@ -279,8 +291,8 @@ class EjecucionPresupuestaria(Base):
     __tablename__ = "EJECUCION_PRESUPUESTARIA"
 
     id_ejecucion = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    id_tarea = Column(UUID(as_uuid=True), ForeignKey("TAREA.id_tarea"), nullable=False)
-    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa"), nullable=False)
+    id_tarea = Column(UUID(as_uuid=True), ForeignKey("TAREA.id_tarea"), nullable=False, index=True)
+    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa"), nullable=False, index=True)
     monto_ejecutado = Column(DECIMAL(18, 2), nullable=False)
     fecha_ejecucion = Column(DateTime, nullable=False)
     descripcion_ejecucion = Column(String(500))
@@ -292,13 +304,19 @@ class EjecucionPresupuestaria(Base):
     poa = relationship("Poa")
     control_presupuestario = relationship("ControlPresupuestario")
 
+# Las tablas de auditoría y de logs están particionadas por año (app/particiones.py);
+# la columna de fecha forma parte de la clave primaria, como exige PostgreSQL.
 class HistoricoProyecto(Base):
     __tablename__ = "HISTORICO_PROYECTO"
+    __table_args__ = (
+        Index("ix_HISTORICO_PROYECTO_id_proyecto_fecha", "id_proyecto", "fecha_modificacion"),
+        {"postgresql_partition_by": "RANGE (fecha_modificacion)"},
+    )
 
     id_historico = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     id_proyecto = Column(UUID(as_uuid=True), ForeignKey("PROYECTO.id_proyecto"), nullable=False)
     id_usuario = Column(UUID(as_uuid=True), ForeignKey("USUARIO.id_usuario"), nullable=False)
-    fecha_modificacion = Column(DateTime, nullable=False)
+    fecha_modificacion = Column(DateTime, primary_key=True, nullable=False)
     campo_modificado = Column(String(100), nullable=False)
     valor_anterior = Column(Text)
     valor_nuevo = Column(Text)
@@ -309,11 +327,15 @@ class HistoricoProyecto(Base):
 
 class HistoricoPoa(Base):
     __tablename__ = "HISTORICO_POA"
+    __table_args__ = (
+        Index("ix_HISTORICO_POA_id_poa_fecha", "id_poa", "fecha_modificacion"),
+        {"postgresql_partition_by": "RANGE (fecha_modificacion)"},
+    )
 
     id_historico = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa"), nullable=False)
     id_usuario = Column(UUID(as_uuid=True), ForeignKey("USUARIO.id_usuario"), nullable=False)
-    fecha_modificacion = Column(DateTime, nullable=False)
+    fecha_modificacion = Column(DateTime, primary_key=True, nullable=False)
     campo_modificado = Column(String(100), nullable=False)
     valor_anterior = Column(Text)
     valor_nuevo = Column(Text)
@@ -326,6 +348,7 @@ class HistoricoPoa(Base):
 
 class LogCargaExcel(Base):
     __tablename__ = "LOG_CARGA_EXCEL"
+    __table_args__ = {"postgresql_partition_by": "RANGE (fecha_carga)"}
     id_log = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     id_poa = Column(String(36), nullable=True)              # UUID del POA como string
     codigo_poa = Column(String(100), nullable=True)         # Código POA visible
@@ -333,7 +356,63 @@ class LogCargaExcel(Base):
     usuario_nombre = Column(String(100), nullable=True)     # Nombre del usuario
     usuario_email = Column(String(100), nullable=True)      # Email del usuario
     proyecto_nombre = Column(String(200), nullable=True)    # Nombre del proyecto
-    fecha_carga = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))  # Fecha
+    fecha_carga = Column(DateTime, primary_key=True, nullable=False, index=True, default=lambda: datetime.now(timezone.utc))  # Fecha
     nombre_archivo = Column(String(200), nullable=False)    # Archivo
     hoja = Column(String(100), nullable=False)              # Hoja
-    mensaje = Column(String(500), nullable=False)           # Mensaje
\ No newline at end of file
+    mensaje = Column(String(500), nullable=False)           # Mensaje
+
+class ResumenPresupuestoPoa(Base):
+    # Tabla materializada: se recalcula por POA en cada escritura (app/resumen.py)
+    __tablename__ = "RESUMEN_PRESUPUESTO_POA"
+
+    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa", ondelete="CASCADE"), primary_key=True)
+    id_proyecto = Column(UUID(as_uuid=True), ForeignKey("PROYECTO.id_proyecto"), nullable=False, index=True)
+    anio_ejecucion = Column(String(4), nullable=False, index=True)
+    presupuesto_asignado = Column(DECIMAL(18, 2), nullable=False, default=0)
+    total_actividades = Column(DECIMAL(18, 2), nullable=False, default=0)
+    saldo_actividades = Column(DECIMAL(18, 2), nullable=False, default=0)
+    total_programado = Column(DECIMAL(18, 2), nullable=False, default=0)
+    programado_mensual = Column(JSONB, nullable=False, default=dict)  # {"enero": 100.0, "02-2026": 50.0, ...}
+    total_certificado = Column(DECIMAL(18, 2), nullable=False, default=0)
+    total_comprometido = Column(DECIMAL(18, 2), nullable=False, default=0)
+    total_devengado = Column(DECIMAL(18, 2), nullable=False, default=0)
+    total_ejecutado = Column(DECIMAL(18, 2), nullable=False, default=0)
+    fecha_actualizacion = Column(DateTime, nullable=False)
+
+class SnapshotPoa(Base):
+    # Copia inmutable del árbol actividades/tareas/programación de un POA (app/snapshots.py)
+    __tablename__ = "SNAPSHOT_POA"
+
+    id_snapshot = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_poa = Column(UUID(as_uuid=True), ForeignKey("POA.id_poa", ondelete="CASCADE"), nullable=False, index=True)
+    id_reforma = Column(UUID(as_uuid=True), ForeignKey("REFORMA_POA.id_reforma"), nullable=True, index=True)
+    momento = Column(String(30), nullable=False)  # creacion_reforma, aprobacion_reforma, manual
+    fecha_creacion = Column(DateTime, nullable=False)
+    id_usuario = Column(UUID(as_uuid=True), ForeignKey("USUARIO.id_usuario"), nullable=False)
+    total_actividades = Column(DECIMAL(18, 2), nullable=False)
+    cantidad_tareas = Column(Integer, nullable=False)
+    huella = Column(String(64), nullable=False)  # sha256 del JSON sin comprimir
+    contenido = Column(LargeBinary, nullable=False)  # JSON comprimido con zlib
+
+class RegistroCambio(Base):
+    # Fuente del feed GET /cambios; la llenan triggers de PostgreSQL (app/registro_cambios.py)
+    __tablename__ = "REGISTRO_CAMBIO"
+    __table_args__ = (
+        Index("ix_REGISTRO_CAMBIO_transaccion_id_cambio", "transaccion", "id_cambio"),
+    )
+
+    id_cambio = Column(BigInteger, Identity(always=True), primary_key=True)
+    transaccion = Column(BigInteger, nullable=False)  # pg_current_xact_id() de la escritura
+    entidad = Column(String(30), nullable=False)  # poa, actividad, tarea, programacion_mensual, reforma_poa
+    id_entidad = Column(UUID(as_uuid=True), nullable=False)
+    operacion = Column(String(12), nullable=False)  # creado, actualizado, eliminado
+    fecha = Column(DateTime, nullable=False, server_default=func.now())
+
+class PodaRegistroCambio(Base):
+    # Último cambio eliminado por la poda de REGISTRO_CAMBIO, en el orden del feed; una sola fila
+    __tablename__ = "REGISTRO_CAMBIO_PODA"
+
+    id = Column(Integer, primary_key=True, default=1)
+    transaccion = Column(BigInteger, nullable=False)
+    id_cambio = Column(BigInteger, nullable=False)
+    fecha = Column(DateTime, nullable=False, server_default=func.now())  # última poda
@@ -0,0 +1,164 @@
+import gzip
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Particionado por año de las tablas de solo inserción (auditoría y logs).
+# Cada año vive en su propia partición (<TABLA>_<anio>) y una partición por defecto
+# (<TABLA>_DEFAULT) recibe cualquier fila fuera de los años creados. Las consultas
+# filtradas por fecha solo recorren las particiones del rango, y el archivado de años
+# antiguos es un DETACH + DROP en lugar de un DELETE masivo.
+
+# tabla particionada -> columna de partición
+TABLAS_PARTICIONADAS = {
+    "HISTORICO_POA": "fecha_modificacion",
+    "HISTORICO_PROYECTO": "fecha_modificacion",
+    "LOG_CARGA_EXCEL": "fecha_carga",
+}
+
+# Años de particiones que se crean por adelantado además del actual
+PARTICIONES_ANIOS_ADELANTADOS = int(os.getenv("PARTICIONES_ANIOS_ADELANTADOS", 1))
+# Años completos que se conservan en línea antes de archivar
+RETENCION_AUDITORIA_ANIOS = int(os.getenv("RETENCION_AUDITORIA_ANIOS", 5))
+DIRECTORIO_ARCHIVO_AUDITORIA = os.getenv("DIRECTORIO_ARCHIVO_AUDITORIA", "archivo_auditoria")
+
+
+def nombre_particion(tabla: str, anio: int) -> str:
+    return f"{tabla}_{anio}"
+
+
+def nombre_particion_defecto(tabla: str) -> str:
+    return f"{tabla}_DEFAULT"
+
+
+async def _existe(conn: AsyncConnection, nombre: str) -> bool:
+    result = await conn.execute(text("SELECT to_regclass(:nombre) IS NOT NULL"), {"nombre": f'"{nombre}"'})
+    return result.scalar()
+
+
+async def es_particionada(conn: AsyncConnection, tabla: str) -> bool:
+    result = await conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:tabla))"),
+        {"tabla": f'"{tabla}"'},
+    )
+    return result.scalar()
+
+
+async def crear_particion_anual(conn: AsyncConnection, tabla: str, anio: int) -> bool:
+    """
+    Crea la partición de un año si no existe. Las filas de ese año que hubieran caído
+    en la partición por defecto se trasladan antes de adjuntarla.
+    Retorna True si la partición se creó.
+    """
+    nombre = nombre_particion(tabla, anio)
+    if await _existe(conn, nombre):
+        return False
+
+    columna = TABLAS_PARTICIONADAS[tabla]
+    desde, hasta = datetime(anio, 1, 1), datetime(anio + 1, 1, 1)
+    defecto = nombre_particion_defecto(tabla)
+
+    await conn.execute(text(f'CREATE TABLE "{nombre}" (LIKE "{tabla}" INCLUDING DEFAULTS)'))
+    if await _existe(conn, defecto):
+        await conn.execute(
+            text(
+                f'WITH movidas AS (DELETE FROM "{defecto}" '
+                f'WHERE "{columna}" >= :desde AND "{columna}" < :hasta RETURNING *) '
+                f'INSERT INTO "{nombre}" SELECT * FROM movidas'
+            ),
+            {"desde": desde, "hasta": hasta},
+        )
+    await conn.execute(text(
+        f'ALTER TABLE "{tabla}" ATTACH PARTITION "{nombre}" '
+        f"FOR VALUES FROM ('{desde:%Y-%m-%d}') TO ('{hasta:%Y-%m-%d}')"
+    ))
+    return True
+
+
+async def asegurar_particiones(conn: AsyncConnection, anios: Optional[List[int]] = None) -> List[str]:
+    """
+    Garantiza la partición por defecto, las de los años indicados (por omisión el
+    anterior, el actual y los adelantados) y las de cualquier año presente en la
+    partición por defecto. Omite las tablas que aún no están particionadas.
+    Retorna los nombres de las particiones creadas.
+    """
+    if anios is None:
+        actual = datetime.utcnow().year
+        anios = list(range(actual - 1, actual + PARTICIONES_ANIOS_ADELANTADOS + 1))
+
+    creadas = []
+    for tabla, columna in TABLAS_PARTICIONADAS.items():
+        if not await es_particionada(conn, tabla):
+            continue
+
+        defecto = nombre_particion_defecto(tabla)
+        await conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{defecto}" PARTITION OF "{tabla}" DEFAULT'))
+
+        result = await conn.execute(
+            text(f'SELECT DISTINCT extract(year FROM "{columna}")::int FROM "{defecto}"')
+        )
+        for anio in sorted(set(anios) | set(result.scalars().all())):
+            if await crear_particion_anual(conn, tabla, anio):
+                creadas.append(nombre_particion(tabla, anio))
+    return creadas
+
+
+async def listar_particiones_anuales(conn: AsyncConnection, tabla: str) -> List[Tuple[str, int]]:
+    """Retorna [(particion, anio)] de una tabla particionada, ordenadas por año."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:tabla)"
+        ),
+        {"tabla": f'"{tabla}"'},
+    )
+    patron = re.compile(rf"^{re.escape(tabla)}_(\d{{4}})$")
+    particiones = []
+    for nombre in result.scalars().all():
+        coincidencia = patron.match(nombre)
+        if coincidencia:
+            particiones.append((nombre, int(coincidencia.group(1))))
+    return sorted(particiones, key=lambda p: p[1])
+
+
+async def particiones_vencidas(conn: AsyncConnection, anios_retencion: int) -> List[Tuple[str, str, int]]:
+    """Retorna [(tabla, particion, anio)] anteriores al periodo de retención."""
+    limite = datetime.utcnow().year - anios_retencion
+    vencidas = []
+    for tabla in TABLAS_PARTICIONADAS:
+        if not await es_particionada(conn, tabla):
+            continue
+        for particion, anio in await listar_particiones_anuales(conn, tabla):
+            if anio < limite:
+                vencidas.append((tabla, particion, anio))
+    return vencidas
+
+
+async def exportar_particion(conn: AsyncConnection, particion: str, ruta: Path):
+    """Copia la partición a un CSV comprimido con gzip usando COPY (sin pasar por el ORM)."""
+    conexion = (await conn.get_raw_connection()).driver_connection
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(ruta, "wb") as archivo:
+        async def escribir(datos: bytes):
+            archivo.write(datos)
+
+        await conexion.copy_from_table(particion, output=escribir, format="csv", header=True)
+
+
+async def archivar_particion(
+    conn: AsyncConnection, tabla: str, particion: str, directorio: Path, conservar: bool = False
+) -> Path:
+    """
+    Exporta la partición a <directorio>/<particion>.csv.gz, la separa de la tabla y,
+    salvo que `conservar` sea True, la elimina. Retorna la ruta del archivo.
+    """
+    ruta = directorio / f"{particion}.csv.gz"
+    await exportar_particion(conn, particion, ruta)
+    await conn.execute(text(f'ALTER TABLE "{tabla}" DETACH PARTITION "{particion}"'))
+    if not conservar:
+        await conn.execute(text(f'DROP TABLE "{particion}"'))
+    return ruta
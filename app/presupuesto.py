@@ -0,0 +1,106 @@
+import uuid
+from decimal import Decimal
+from typing import Optional
+from app import models, totales
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Movimientos presupuestarios (certificar, comprometer, devengar, ejecutar).
+# Cada saldo se descuenta con un UPDATE condicional (WHERE saldo >= :monto): la
+# comprobación y el descuento ocurren en la misma sentencia, con bloqueo solo de la
+# fila afectada, así que las operaciones concurrentes ni pierden actualizaciones ni
+# esperan un bloqueo global. El orden de bloqueo es siempre TAREA -> ACTIVIDAD.
+
+
+async def descontar_saldo_tarea(
+    db: AsyncSession, id_tarea: uuid.UUID, monto: Decimal
+) -> Optional[uuid.UUID]:
+    """
+    Descuenta `monto` de Tarea.saldo_disponible y de Actividad.saldo_actividad.
+    Retorna el id_poa de la tarea, o None si la tarea no existe o no tiene saldo suficiente.
+    """
+    result = await db.execute(
+        update(models.Tarea)
+        .where(models.Tarea.id_tarea == id_tarea, models.Tarea.saldo_disponible >= monto)
+        .values(saldo_disponible=models.Tarea.saldo_disponible - monto, version=models.Tarea.version + 1)
+        .returning(models.Tarea.id_actividad)
+        .execution_options(synchronize_session=False)
+    )
+    id_actividad = result.scalar_one_or_none()
+    if id_actividad is None:
+        return None
+
+    return await totales.ajustar_totales_actividad(db, id_actividad, Decimal("0"), -monto)
+
+
+async def ajustar_saldo_tarea(db: AsyncSession, id_tarea: uuid.UUID, delta: Decimal) -> bool:
+    """
+    Suma `delta` (positivo o negativo) a Tarea.saldo_disponible sin dejarlo negativo:
+    un recorte del total no puede quitar lo ya certificado o ejecutado.
+    Retorna False si la tarea no existe o el saldo no alcanza.
+    """
+    result = await db.execute(
+        update(models.Tarea)
+        .where(models.Tarea.id_tarea == id_tarea, models.Tarea.saldo_disponible + delta >= 0)
+        .values(saldo_disponible=models.Tarea.saldo_disponible + delta)
+        .returning(models.Tarea.id_tarea)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def comprometer(db: AsyncSession, id_control: uuid.UUID, monto: Decimal) -> Optional[uuid.UUID]:
+    """Suma al monto comprometido sin superar lo certificado. Retorna el id_poa o None."""
+    control = models.ControlPresupuestario
+    result = await db.execute(
+        update(control)
+        .where(
+            control.id_control == id_control,
+            control.monto_comprometido + monto <= control.monto_certificado,
+        )
+        .values(monto_comprometido=control.monto_comprometido + monto)
+        .returning(control.id_poa)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def devengar(db: AsyncSession, id_control: uuid.UUID, monto: Decimal) -> Optional[uuid.UUID]:
+    """Suma al monto devengado sin superar lo comprometido. Retorna el id_poa o None."""
+    control = models.ControlPresupuestario
+    result = await db.execute(
+        update(control)
+        .where(
+            control.id_control == id_control,
+            control.monto_devengado + monto <= control.monto_comprometido,
+        )
+        .values(monto_devengado=control.monto_devengado + monto)
+        .returning(control.id_poa)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def descontar_saldo_control(
+    db: AsyncSession, id_control: uuid.UUID, id_tarea: uuid.UUID, monto: Decimal
+) -> Optional[uuid.UUID]:
+    """
+    Ejecuta contra una certificación: descuenta del saldo no ejecutado del control sin
+    que lo ejecutado (monto_certificado - saldo_disponible) supere lo devengado, así la
+    cadena certificar -> comprometer -> devengar -> ejecutar no se puede saltar.
+    El saldo de la tarea ya se descontó al certificar. Retorna el id_poa o None.
+    """
+    control = models.ControlPresupuestario
+    result = await db.execute(
+        update(control)
+        .where(
+            control.id_control == id_control,
+            control.id_tarea == id_tarea,
+            control.saldo_disponible >= monto,
+            control.monto_certificado - control.saldo_disponible + monto <= control.monto_devengado,
+        )
+        .values(saldo_disponible=control.saldo_disponible - monto)
+        .returning(control.id_poa)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
@@ -0,0 +1,41 @@
+# Plugin de pytest para acotar las consultas SQL de un endpoint o de una función.
+# Uso: pytest -p app.pytest_consultas
+#      (o pytest_plugins = ["app.pytest_consultas"] en conftest.py)
+#
+#     async def test_actividades(cliente, limite_consultas):
+#         with limite_consultas(maximo=3, repeticiones=2):
+#             await cliente.get(f"/poas/{id_poa}/actividades")
+#
+# La aplicación no importa este módulo, así que pytest no es dependencia de producción.
+from contextlib import contextmanager
+from typing import Optional
+import pytest
+from app.instrumentacion import capturar_consultas, instrumentar_engine, repetidas
+
+
+@pytest.fixture
+def limite_consultas():
+    """
+    Retorna un context manager que falla la prueba si dentro del bloque se ejecutan
+    más de `maximo` sentencias SQL, o si una misma huella se repite más de
+    `repeticiones` veces (posible N+1).
+    """
+    # se importa aquí: app.database exige DATABASE_URL al importarse
+    from app import database
+    instrumentar_engine(database.engine)
+
+    @contextmanager
+    def limite(maximo: Optional[int] = None, repeticiones: Optional[int] = None):
+        with capturar_consultas() as captura:
+            yield captura
+
+        errores = []
+        if maximo is not None and captura.consultas > maximo:
+            errores.append(f"Se ejecutaron {captura.consultas} sentencias SQL (máximo {maximo})")
+        if repeticiones is not None:
+            for huella, n in repetidas(captura, repeticiones):
+                errores.append(f"Posible N+1: {n} ejecuciones (máximo {repeticiones}) de: {huella[:300]}")
+        if errores:
+            pytest.fail("\n".join(errores), pytrace=False)
+
+    return limite
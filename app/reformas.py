@@ -0,0 +1,235 @@
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Tuple
+from sqlalchemy import bindparam, select, insert, update, delete, func, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, schemas, totales
+from app.auditoria import Auditoria
+
+# Cambios de tareas de una reforma (REFORMA_POA.cambios).
+# El conjunto completo se valida con unas pocas consultas IN (una por tipo de
+# entidad) y, al aprobar la reforma, se aplica en la misma transacción con un
+# DELETE, un UPDATE y un INSERT masivos, un único ajuste de totales por actividad
+# y un solo lote de filas de HISTORICO_POA.
+
+ESTADO_APROBADA = "Aprobada"
+
+
+@dataclass
+class PlanReforma:
+    """Resultado de validar los cambios: errores encontrados y datos para aplicarlos."""
+    errores: List[str] = field(default_factory=list)
+    tareas: Dict[uuid.UUID, models.Tarea] = field(default_factory=dict)
+    deltas: Dict[uuid.UUID, Tuple[Decimal, Decimal]] = field(default_factory=dict)
+    variacion_total: Decimal = Decimal("0")
+    total_actual: Decimal = Decimal("0")
+
+    def sumar_delta(self, id_actividad: uuid.UUID, delta_total: Decimal, delta_saldo: Decimal):
+        total, saldo = self.deltas.get(id_actividad, (Decimal("0"), Decimal("0")))
+        self.deltas[id_actividad] = (total + delta_total, saldo + delta_saldo)
+        self.variacion_total += delta_total
+
+
+def _total(cantidad, precio_unitario) -> Decimal:
+    # cantidad y precio_unitario admiten NULL en TAREA
+    return Decimal(cantidad or 0) * Decimal(precio_unitario or 0)
+
+
+async def validar_cambios(
+    db: AsyncSession,
+    reforma: models.ReformaPoa,
+    cambios: schemas.ReformaCambiosCreate,
+    bloquear: bool = False,
+) -> PlanReforma:
+    """
+    Valida todos los cambios contra el estado actual del POA de la reforma.
+    Con `bloquear` las tareas afectadas se leen con FOR UPDATE (usado al aprobar).
+    """
+    plan = PlanReforma()
+    id_poa = reforma.id_poa
+
+    ids_editar = [cambio.id_tarea for cambio in cambios.editar]
+    ids_tarea = ids_editar + list(cambios.eliminar)
+    if len(set(ids_tarea)) != len(ids_tarea):
+        plan.errores.append("Una tarea aparece más de una vez entre las ediciones y eliminaciones")
+
+    # Tareas a editar o eliminar: deben pertenecer al POA de la reforma
+    if ids_tarea:
+        query = (
+            select(models.Tarea)
+            .join(models.Actividad, models.Actividad.id_actividad == models.Tarea.id_actividad)
+            .where(models.Tarea.id_tarea.in_(ids_tarea), models.Actividad.id_poa == id_poa)
+        )
+        if bloquear:
+            query = query.with_for_update(of=models.Tarea)
+        result = await db.execute(query)
+        plan.tareas = {tarea.id_tarea: tarea for tarea in result.scalars().all()}
+        for id_tarea in set(ids_tarea) - plan.tareas.keys():
+            plan.errores.append(f"La tarea {id_tarea} no existe o no pertenece al POA de la reforma")
+
+    # Actividades de las tareas nuevas
+    ids_actividad = {cambio.id_actividad for cambio in cambios.agregar}
+    if ids_actividad:
+        result = await db.execute(
+            select(models.Actividad.id_actividad)
+            .where(models.Actividad.id_actividad.in_(ids_actividad), models.Actividad.id_poa == id_poa)
+        )
+        for id_actividad in ids_actividad - set(result.scalars().all()):
+            plan.errores.append(f"La actividad {id_actividad} no existe o no pertenece al POA de la reforma")
+
+    ids_detalle = {cambio.id_detalle_tarea for cambio in cambios.agregar}
+    if ids_detalle:
+        result = await db.execute(
+            select(models.DetalleTarea.id_detalle_tarea)
+            .where(models.DetalleTarea.id_detalle_tarea.in_(ids_detalle))
+        )
+        for id_detalle in ids_detalle - set(result.scalars().all()):
+            plan.errores.append(f"El detalle de tarea {id_detalle} no existe")
+
+    # Tareas con movimientos presupuestarios no se pueden eliminar
+    if cambios.eliminar:
+        con_movimientos = union(
+            select(models.ControlPresupuestario.id_tarea)
+            .where(models.ControlPresupuestario.id_tarea.in_(cambios.eliminar)),
+            select(models.EjecucionPresupuestaria.id_tarea)
+            .where(models.EjecucionPresupuestaria.id_tarea.in_(cambios.eliminar)),
+        )
+        result = await db.execute(con_movimientos)
+        for id_tarea in result.scalars().all():
+            plan.errores.append(f"La tarea {id_tarea} tiene movimientos presupuestarios y no puede eliminarse")
+
+    for cambio in cambios.editar:
+        tarea = plan.tareas.get(cambio.id_tarea)
+        if not tarea:
+            continue
+        cantidad = cambio.cantidad if cambio.cantidad is not None else tarea.cantidad
+        precio = cambio.precio_unitario if cambio.precio_unitario is not None else tarea.precio_unitario
+        total_anterior = tarea.total or 0
+        nuevo_total = _total(cantidad, precio)
+        # lo ya certificado o ejecutado no puede quedar por encima del nuevo total
+        consumido = total_anterior - (tarea.saldo_disponible or 0)
+        if nuevo_total < consumido:
+            plan.errores.append(
+                f"La tarea {tarea.id_tarea} ya tiene {consumido} comprometido; el nuevo total {nuevo_total} es menor"
+            )
+        delta = nuevo_total - total_anterior
+        plan.sumar_delta(tarea.id_actividad, delta, delta)
+
+    for id_tarea in cambios.eliminar:
+        tarea = plan.tareas.get(id_tarea)
+        if tarea:
+            plan.sumar_delta(tarea.id_actividad, -(tarea.total or 0), -(tarea.saldo_disponible or 0))
+
+    for cambio in cambios.agregar:
+        total = _total(cambio.cantidad, cambio.precio_unitario)
+        plan.sumar_delta(cambio.id_actividad, total, total)
+
+    result = await db.execute(
+        select(func.coalesce(func.sum(models.Actividad.total_por_actividad), 0))
+        .where(models.Actividad.id_poa == id_poa)
+    )
+    plan.total_actual = result.scalar()
+    return plan
+
+
+def resumen_cambios(reforma: models.ReformaPoa, cambios: schemas.ReformaCambiosCreate, plan: PlanReforma) -> dict:
+    return {
+        "id_reforma": reforma.id_reforma,
+        "estado_reforma": reforma.estado_reforma,
+        "tareas_agregadas": len(cambios.agregar),
+        "tareas_editadas": len(cambios.editar),
+        "tareas_eliminadas": len(cambios.eliminar),
+        "variacion_total": plan.variacion_total,
+        "total_resultante": plan.total_actual + plan.variacion_total,
+    }
+
+
+async def aplicar_cambios(
+    db: AsyncSession,
+    reforma: models.ReformaPoa,
+    cambios: schemas.ReformaCambiosCreate,
+    plan: PlanReforma,
+    auditoria: Auditoria,
+):
+    """
+    Aplica un conjunto de cambios ya validado (con las tareas bloqueadas) dentro de la
+    transacción actual. No hace commit ni refresca el resumen del POA.
+    """
+    id_poa, id_reforma = reforma.id_poa, reforma.id_reforma
+    justificacion = cambios.justificacion
+
+    if cambios.eliminar:
+        await db.execute(
+            delete(models.ProgramacionMensual)
+            .where(models.ProgramacionMensual.id_tarea.in_(cambios.eliminar))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(models.Tarea)
+            .where(models.Tarea.id_tarea.in_(cambios.eliminar))
+            .execution_options(synchronize_session=False)
+        )
+        for id_tarea in cambios.eliminar:
+            tarea = plan.tareas[id_tarea]
+            auditoria.cambio_poa(
+                id_poa, "Tarea eliminada", f"Tarea: {tarea.nombre} ({tarea.total})", "Eliminada",
+                justificacion, id_reforma
+            )
+
+    if cambios.editar:
+        filas = []
+        for cambio in cambios.editar:
+            tarea = plan.tareas[cambio.id_tarea]
+            cantidad = cambio.cantidad if cambio.cantidad is not None else tarea.cantidad
+            precio = cambio.precio_unitario if cambio.precio_unitario is not None else tarea.precio_unitario
+            total = _total(cantidad, precio)
+            filas.append({
+                "b_id_tarea": tarea.id_tarea,
+                "cantidad": cantidad,
+                "precio_unitario": precio,
+                "total": total,
+                "saldo_disponible": (tarea.saldo_disponible or 0) + total - (tarea.total or 0),
+                "lineaPaiViiv": cambio.lineaPaiViiv if cambio.lineaPaiViiv is not None else tarea.lineaPaiViiv,
+            })
+            auditoria.cambio_poa(
+                id_poa, "Tarea",
+                f"Cantidad: {tarea.cantidad}, Precio: {tarea.precio_unitario}",
+                f"Cantidad: {cantidad}, Precio: {precio}",
+                justificacion, id_reforma
+            )
+        # UPDATE masivo (executemany) en Core: el UPDATE por clave primaria del ORM, con
+        # version_id_col, se ejecuta fila por fila. Las tareas están bloqueadas (FOR UPDATE)
+        # desde la validación, así que basta incrementar la versión sin comprobarla.
+        tabla = models.Tarea.__table__
+        await db.execute(
+            update(tabla)
+            .where(tabla.c.id_tarea == bindparam("b_id_tarea"))
+            .values(version=tabla.c.version + 1),
+            filas,
+        )
+
+    if cambios.agregar:
+        filas = []
+        for cambio in cambios.agregar:
+            total = _total(cambio.cantidad, cambio.precio_unitario)
+            filas.append({
+                "id_tarea": uuid.uuid4(),
+                "id_actividad": cambio.id_actividad,
+                "id_detalle_tarea": cambio.id_detalle_tarea,
+                "nombre": cambio.nombre,
+                "detalle_descripcion": cambio.detalle_descripcion,
+                "cantidad": cambio.cantidad,
+                "precio_unitario": cambio.precio_unitario,
+                "total": total,
+                "saldo_disponible": total,
+                "lineaPaiViiv": cambio.lineaPaiViiv,
+            })
+            auditoria.cambio_poa(
+                id_poa, "Tarea nueva", None, f"Tarea: {cambio.nombre} - Total: {total}",
+                justificacion, id_reforma
+            )
+        await db.execute(insert(models.Tarea), filas)
+
+    await totales.ajustar_totales_actividades(db, plan.deltas)
+    await auditoria.guardar(db)
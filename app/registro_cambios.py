@@ -0,0 +1,175 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import BigInteger, Text, cast, delete, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app import models
+
+# Feed de cambios incremental (GET /cambios).
+# Triggers por sentencia con tablas de transición registran en REGISTRO_CAMBIO cada fila
+# creada, actualizada o eliminada de las entidades de ENTIDADES, incluidas las
+# actualizaciones masivas con Core (totales, reformas, cargas Excel), con una sola
+# inserción por sentencia.
+#
+# El orden del feed es (transaccion, id_cambio). Una secuencia sola no alcanza: una
+# transacción larga puede confirmar después filas con números menores a los que un
+# consumidor ya leyó. Por eso solo se entregan cambios de transacciones anteriores al
+# xmin del snapshot actual (todas ya terminaron) y ninguna fila nueva puede quedar antes
+# del cursor. Una transacción abierta mucho tiempo demora el feed, no lo desordena.
+#
+# Retención: app/scripts/podar_registro_cambios.py (cron) elimina los cambios de más de
+# RETENCION_CAMBIOS_DIAS días y guarda en REGISTRO_CAMBIO_PODA el mayor cambio eliminado,
+# en el orden del feed. Un cursor menor que esa marca perdió cambios posteriores a él:
+# GET /cambios responde 410 y el consumidor debe recargar todo y volver a empezar desde
+# CURSOR_INICIAL. Un cursor igual o mayor sigue siendo válido aunque la tabla quede vacía.
+
+# entidad del feed -> (tabla, clave primaria)
+ENTIDADES = {
+    "poa": ("POA", "id_poa"),
+    "actividad": ("ACTIVIDAD", "id_actividad"),
+    "tarea": ("TAREA", "id_tarea"),
+    "programacion_mensual": ("PROGRAMACION_MENSUAL", "id_programacion"),
+    "reforma_poa": ("REFORMA_POA", "id_reforma"),
+}
+
+CURSOR_INICIAL = "0.0"
+
+RETENCION_CAMBIOS_DIAS = int(os.getenv("RETENCION_CAMBIOS_DIAS", 30))
+# Filas por DELETE al podar: transacciones cortas que no frenan a los triggers
+TAMANO_LOTE_PODA = 10000
+
+FUNCION_TRIGGER = """
+CREATE OR REPLACE FUNCTION registrar_cambio() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    EXECUTE format(
+        'INSERT INTO "REGISTRO_CAMBIO" (transaccion, entidad, id_entidad, operacion, fecha)
+         SELECT pg_current_xact_id()::text::bigint, %L, %I, %L, now() FROM %I',
+        TG_ARGV[0], TG_ARGV[1],
+        CASE TG_OP WHEN 'INSERT' THEN 'creado' WHEN 'UPDATE' THEN 'actualizado' ELSE 'eliminado' END,
+        CASE TG_OP WHEN 'DELETE' THEN 'anteriores' ELSE 'nuevas' END
+    );
+    RETURN NULL;
+END
+$$
+"""
+
+# (operación, tabla de transición)
+_EVENTOS = (("INSERT", "NEW TABLE AS nuevas"), ("UPDATE", "NEW TABLE AS nuevas"), ("DELETE", "OLD TABLE AS anteriores"))
+
+
+def sentencias_triggers() -> List[str]:
+    sentencias = [FUNCION_TRIGGER]
+    for entidad, (tabla, clave) in ENTIDADES.items():
+        for operacion, transicion in _EVENTOS:
+            sentencias.append(
+                f'CREATE OR REPLACE TRIGGER "{tabla}_cambios_{operacion.lower()}" '
+                f'AFTER {operacion} ON "{tabla}" REFERENCING {transicion} '
+                f"FOR EACH STATEMENT EXECUTE FUNCTION registrar_cambio('{entidad}', '{clave}')"
+            )
+    return sentencias
+
+
+async def asegurar_triggers(conn: AsyncConnection):
+    """Crea o reemplaza la función y los triggers (idempotente, se llama al iniciar)."""
+    for sentencia in sentencias_triggers():
+        await conn.execute(text(sentencia))
+
+
+def parsear_cursor(cursor: str) -> Tuple[int, int]:
+    """'<transaccion>.<id_cambio>' -> (transaccion, id_cambio); ValueError si no es válido."""
+    transaccion, _, id_cambio = cursor.partition(".")
+    return int(transaccion), int(id_cambio or 0)
+
+
+async def cursor_vigente(db: AsyncSession, desde: str) -> bool:
+    """
+    False si la poda eliminó cambios posteriores al cursor: se perderían sin aviso.
+    """
+    cursor = parsear_cursor(desde)
+    if cursor == parsear_cursor(CURSOR_INICIAL):
+        return True
+    Poda = models.PodaRegistroCambio.__table__
+    conexion = await db.connection()
+    marca = (await conexion.execute(select(Poda.c.transaccion, Poda.c.id_cambio))).first()
+    return marca is None or tuple(marca) <= cursor
+
+
+async def podar_lote(conn: AsyncConnection, antes_de: datetime, lote: int = TAMANO_LOTE_PODA) -> int:
+    """
+    Elimina hasta `lote` cambios anteriores a `antes_de`, recorriendo la clave primaria
+    desde el principio (los más antiguos), y sube la marca de poda al mayor eliminado.
+    Retorna la cantidad eliminada.
+    """
+    Cambio = models.RegistroCambio.__table__
+    Poda = models.PodaRegistroCambio.__table__
+    antiguos = (
+        select(Cambio.c.id_cambio)
+        .where(Cambio.c.fecha < antes_de)
+        .order_by(Cambio.c.id_cambio)
+        .limit(lote)
+    )
+    result = await conn.execute(
+        delete(Cambio).where(Cambio.c.id_cambio.in_(antiguos)).returning(Cambio.c.transaccion, Cambio.c.id_cambio)
+    )
+    eliminados = result.all()
+    if eliminados:
+        transaccion, id_cambio = max(eliminados)
+        stmt = pg_insert(Poda).values(id=1, transaccion=transaccion, id_cambio=id_cambio)
+        # la marca solo avanza: los lotes no salen en el orden del feed
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Poda.c.id],
+            set_={"transaccion": transaccion, "id_cambio": id_cambio, "fecha": func.now()},
+            where=tuple_(Poda.c.transaccion, Poda.c.id_cambio) < tuple_(transaccion, id_cambio),
+        )
+        await conn.execute(stmt)
+    return len(eliminados)
+
+
+async def limite_retencion(conn: AsyncConnection, dias: int = RETENCION_CAMBIOS_DIAS) -> datetime:
+    """Fecha de corte según el reloj de PostgreSQL, el mismo que usan los triggers."""
+    return (await conn.execute(select(func.localtimestamp() - timedelta(days=dias)))).scalar_one()
+
+
+async def leer_cambios(
+    db: AsyncSession, desde: str, limite: int, entidades: Optional[Sequence[str]] = None
+) -> dict:
+    Cambio = models.RegistroCambio.__table__
+    transaccion, id_cambio = parsear_cursor(desde)
+    # transacciones menores que el xmin del snapshot ya terminaron (confirmadas o no)
+    xmin = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+    consulta = (
+        select(
+            Cambio.c.transaccion, Cambio.c.id_cambio, Cambio.c.entidad,
+            Cambio.c.id_entidad, Cambio.c.operacion, Cambio.c.fecha,
+        )
+        .where(
+            tuple_(Cambio.c.transaccion, Cambio.c.id_cambio) > tuple_(transaccion, id_cambio),
+            Cambio.c.transaccion < xmin,
+        )
+        .order_by(Cambio.c.transaccion, Cambio.c.id_cambio)
+        .limit(limite + 1)
+    )
+    if entidades:
+        consulta = consulta.where(Cambio.c.entidad.in_(entidades))
+
+    conexion = await db.connection()
+    filas = (await conexion.execute(consulta)).all()
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+    cursor = f"{filas[-1].transaccion}.{filas[-1].id_cambio}" if filas else desde
+    return {
+        "cambios": [
+            {
+                "entidad": f.entidad,
+                "id": f.id_entidad,
+                "operacion": f.operacion,
+                "fecha": f.fecha,
+                "cursor": f"{f.transaccion}.{f.id_cambio}",
+            }
+            for f in filas
+        ],
+        "cursor": cursor,
+        "hay_mas": hay_mas,
+    }
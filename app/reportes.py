@@ -0,0 +1,246 @@
+import io
+from datetime import datetime, timezone, timedelta
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models
+from app.agregados import MESES_ES
+
+# Reporte POA: filas por tarea (POST /reporte-poa/) y sus archivos Excel (xlsxwriter) y
+# PDF (ReportLab) armados con esas mismas filas. xlsxwriter y ReportLab se importan
+# dentro de excel() y pdf(), en la primera descarga, no en el arranque de cada worker.
+
+
+async def filas_reporte_poa(db: AsyncSession, anio: str, codigo_tipo: List[str]) -> list:
+    """Tareas con total > 0 de los POAs del año cuyos proyectos son de los tipos dados."""
+    # Buscar tipos de proyecto
+    result = await db.execute(
+        select(models.TipoProyecto)
+        .where(models.TipoProyecto.codigo_tipo.in_(codigo_tipo))
+    )
+    tipos_proyecto = result.scalars().all()
+    ids_tipo_proyecto = [tp.id_tipo_proyecto for tp in tipos_proyecto]
+
+    # Buscar proyectos de esos tipos
+    result = await db.execute(
+        select(models.Proyecto)
+        .where(models.Proyecto.id_tipo_proyecto.in_(ids_tipo_proyecto))
+    )
+    proyectos = result.scalars().all()
+    ids_proyecto = [p.id_proyecto for p in proyectos]
+
+    # Buscar POAs de esos proyectos y año
+    result = await db.execute(
+        select(models.Poa)
+        .where(
+            models.Poa.id_proyecto.in_(ids_proyecto),
+            models.Poa.anio_ejecucion == anio
+        )
+    )
+    poas = result.scalars().all()
+    ids_poa = [poa.id_poa for poa in poas]
+
+    # Buscar actividades de esos POAs (total_por_actividad > 0)
+    result = await db.execute(
+        select(models.Actividad)
+        .where(
+            models.Actividad.id_poa.in_(ids_poa),
+            models.Actividad.total_por_actividad > 0
+        )
+    )
+    actividades = result.scalars().all()
+    ids_actividad = [act.id_actividad for act in actividades]
+
+    # Buscar tareas de esas actividades (total > 0)
+    result = await db.execute(
+        select(models.Tarea)
+        .where(
+            models.Tarea.id_actividad.in_(ids_actividad),
+            models.Tarea.total > 0
+        )
+    )
+    tareas = result.scalars().all()
+
+    # Preparar la lista plana de tareas
+    tareas_lista = []
+    for tarea in tareas:
+        actividad = next((a for a in actividades if a.id_actividad == tarea.id_actividad), None)
+        poa = next((p for p in poas if actividad and p.id_poa == actividad.id_poa), None)
+        proyecto = next((pr for pr in proyectos if poa and pr.id_proyecto == poa.id_proyecto), None)
+        tipo_proyecto_codigo = next((tp.codigo_tipo for tp in tipos_proyecto if proyecto and tp.id_tipo_proyecto == proyecto.id_tipo_proyecto), "") if proyecto else ""
+        presupuesto_aprobado = proyecto.presupuesto_aprobado if proyecto else 0
+
+        # Item presupuestario
+        result = await db.execute(
+            select(models.DetalleTarea).where(models.DetalleTarea.id_detalle_tarea == tarea.id_detalle_tarea)
+        )
+        detalle = result.scalars().first()
+        item_presupuestario = None
+        if detalle:
+            result = await db.execute(
+                select(models.ItemPresupuestario).where(models.ItemPresupuestario.id_item_presupuestario == detalle.id_item_presupuestario)
+            )
+            item = result.scalars().first()
+            if item:
+                item_presupuestario = item.codigo
+
+        # Programación mensual
+        result_prog = await db.execute(
+            select(models.ProgramacionMensual).where(models.ProgramacionMensual.id_tarea == tarea.id_tarea)
+        )
+        programaciones = result_prog.scalars().all()
+        prog_mensual_dict = {prog.mes: round(float(prog.valor), 2) for prog in programaciones}
+
+        tareas_lista.append({
+            "anio_poa": poa.anio_ejecucion if poa else "",
+            "codigo_proyecto": proyecto.codigo_proyecto if proyecto else "",
+            "tipo_proyecto": tipo_proyecto_codigo,
+            "presupuesto_aprobado": float(presupuesto_aprobado) if presupuesto_aprobado else 0,
+            "nombre": tarea.nombre,
+            "detalle_descripcion": tarea.detalle_descripcion,  # NUEVO CAMPO
+            "item_presupuestario": item_presupuestario,
+            "cantidad": tarea.cantidad,
+            "precio_unitario": float(tarea.precio_unitario),
+            "total": float(tarea.total),
+            "programacion_mensual": prog_mensual_dict
+        })
+
+    return tareas_lista
+
+
+def excel(reporte: list) -> io.BytesIO:
+    import xlsxwriter
+
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    worksheet = workbook.add_worksheet("Reporte POA")
+
+    # Formatos
+    header = workbook.add_format({'bold': True, 'bg_color': '#D9D9D9', 'border': 1, 'align': 'center', 'valign': 'vcenter', 'text_wrap': True})
+    centro = workbook.add_format({'border': 1, 'align': 'center', 'valign': 'vcenter', 'text_wrap': True})
+    moneda = workbook.add_format({'num_format': '"$"#,##0.00', 'border': 1, 'align': 'center', 'valign': 'vcenter', 'text_wrap': True})
+    texto = workbook.add_format({'border': 1, 'align': 'left', 'valign': 'vcenter', 'text_wrap': True})
+
+    # Siempre los 12 meses, en orden
+    meses_final = MESES_ES
+
+    # Cabecera
+    cabecera = [
+        "AÑO POA", "CODIGO PROYECTO", "Tipo de Proyecto", "Presupuesto Aprobado", "Tarea",
+        "Detalle Descripción",  # NUEVA COLUMNA
+        "Item Presupuestario", "Cantidad", "Precio Unitario", "Total Tarea"
+    ] + [m.capitalize() for m in meses_final]
+    worksheet.write_row(0, 0, cabecera, header)
+
+    # Ajustar anchos de columna
+    worksheet.set_column(0, 0, 10)   # Año POA
+    worksheet.set_column(1, 1, 15)   # Código Proyecto
+    worksheet.set_column(2, 2, 15)   # Tipo de Proyecto
+    worksheet.set_column(3, 3, 18)   # Presupuesto Aprobado
+    worksheet.set_column(4, 4, 45)   # Tarea
+    worksheet.set_column(5, 5, 45)   # Detalle Descripción  # NUEVA COLUMNA
+    worksheet.set_column(6, 6, 16)   # Item Presupuestario
+    worksheet.set_column(7, 7, 8)    # Cantidad
+    worksheet.set_column(8, 8, 12)   # Precio Unitario
+    worksheet.set_column(9, 9, 12)   # Total Tarea
+    worksheet.set_column(10, 10 + len(meses_final) - 1, 11)  # Meses
+
+    # Filas de tareas
+    for row, tarea in enumerate(reporte, start=1):
+        worksheet.write(row, 0, tarea["anio_poa"], centro)
+        worksheet.write(row, 1, tarea["codigo_proyecto"], centro)
+        worksheet.write(row, 2, tarea["tipo_proyecto"], centro)
+        worksheet.write_number(row, 3, tarea["presupuesto_aprobado"], moneda)
+        worksheet.write(row, 4, tarea["nombre"], texto)
+        worksheet.write(row, 5, tarea["detalle_descripcion"], texto)  # NUEVA COLUMNA
+        worksheet.write(row, 6, tarea["item_presupuestario"], centro)
+        worksheet.write_number(row, 7, tarea["cantidad"], centro)
+        worksheet.write_number(row, 8, tarea["precio_unitario"], moneda)
+        worksheet.write_number(row, 9, tarea["total"], moneda)
+        for col, mes in enumerate(meses_final, start=10):
+            valor_mes = tarea.get("programacion_mensual", {}).get(mes, 0)
+            worksheet.write_number(row, col, valor_mes, moneda)
+
+    # Agregar fecha de descarga al final
+    zona_utc_minus_5 = timezone(timedelta(hours=-5))
+    fecha_descarga = datetime.now(zona_utc_minus_5).strftime("%d/%m/%Y %H:%M")
+    fila_fecha = len(reporte) + 2
+    worksheet.write(fila_fecha, 0, "Fecha de descarga:", centro)
+    worksheet.write(fila_fecha, 1, fecha_descarga, centro)
+    workbook.close()
+    output.seek(0)
+    return output
+
+
+def pdf(reporte: list) -> io.BytesIO:
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    output = io.BytesIO()
+    custom_size = (1700, 900)  # ancho x alto en puntos
+
+    doc = SimpleDocTemplate(output, pagesize=custom_size)
+    elements = []
+    style_cell = ParagraphStyle('cell', fontSize=9, leading=11, alignment=1)  # Centrado
+    style_left = ParagraphStyle('leftcell', fontSize=9, leading=11, alignment=0)  # Izquierda
+
+    # Siempre los 12 meses, en orden
+    meses_final = MESES_ES
+
+    # Cabecera
+    cabecera = [
+        Paragraph("<b>AÑO POA</b>", style_cell),
+        Paragraph("<b>CODIGO PROYECTO</b>", style_cell),
+        Paragraph("<b>Tipo de Proyecto</b>", style_cell),
+        Paragraph("<b>Presupuesto Aprobado</b>", style_cell),
+        Paragraph("<b>Tarea</b>", style_left),
+        Paragraph("<b>Detalle Descripción</b>", style_left),  # NUEVA COLUMNA
+        Paragraph("<b>Item Presupuestario</b>", style_cell),
+        Paragraph("<b>Cantidad</b>", style_cell),
+        Paragraph("<b>Precio Unitario</b>", style_cell),
+        Paragraph("<b>Total Tarea</b>", style_cell)
+    ] + [Paragraph(f"<b>{m.capitalize()}</b>", style_cell) for m in meses_final]
+    data = [cabecera]
+
+    # Filas de tareas
+    for tarea in reporte:
+        fila = [
+            Paragraph(str(tarea["anio_poa"]), style_cell),
+            Paragraph(str(tarea["codigo_proyecto"]), style_cell),
+            Paragraph(str(tarea["tipo_proyecto"]), style_cell),
+            Paragraph(f"${tarea['presupuesto_aprobado']:.2f}", style_cell),
+            Paragraph(str(tarea["nombre"]), style_left),
+            Paragraph(str(tarea["detalle_descripcion"]), style_left),  # NUEVA COLUMNA
+            Paragraph(str(tarea["item_presupuestario"]), style_cell),
+            Paragraph(str(tarea["cantidad"]), style_cell),
+            Paragraph(f"${tarea['precio_unitario']:.2f}", style_cell),
+            Paragraph(f"${tarea['total']:.2f}", style_cell)
+        ]
+        for mes in meses_final:
+            valor_mes = tarea.get("programacion_mensual", {}).get(mes, 0)
+            fila.append(Paragraph(f"${valor_mes:.2f}", style_cell))
+        data.append(fila)
+
+    # Definir anchos de columna (igual que Excel)
+    col_widths = [60, 90, 90, 90, 250, 250, 80, 60, 80, 80] + [60]*len(meses_final)  # Ajustar ancho para nueva columna
+    table = Table(data, hAlign='LEFT', colWidths=col_widths)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#D9D9D9")),
+        ('GRID', (0,0), (-1,-1), 1, colors.black),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('ALIGN', (4,1), (4,-1), 'LEFT'),  # Columna "Tarea" alineada a la izquierda
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ]))
+    elements.append(table)
+
+    # Fecha de descarga al final
+    zona_utc_minus_5 = timezone(timedelta(hours=-5))
+    fecha_descarga = datetime.now(zona_utc_minus_5).strftime("%d/%m/%Y %H:%M")
+    elements.append(Spacer(1, 18))
+    elements.append(Paragraph(f"<b>Fecha de descarga:</b> {fecha_descarga}", style_left))
+
+    doc.build(elements)
+    output.seek(0)
+    return output
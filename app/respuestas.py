@@ -0,0 +1,96 @@
+from decimal import Decimal
+from operator import attrgetter
+from typing import Mapping, Optional, Sequence, Type
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+# Serialización JSON rápida con orjson para listados y reportes grandes.
+#
+# Los endpoints con response_model ya se serializan con pydantic-core, pero antes cada
+# objeto ORM se valida de nuevo contra el esquema (from_attributes); para miles de filas
+# que vienen de la base de datos esa validación es trabajo repetido. Los endpoints que
+# retornan dicts (reportes) pasan por jsonable_encoder, que recorre todo en Python.
+#
+# - RespuestaORJSON: para dicts/listas; Decimal se escribe como número, igual que
+#   jsonable_encoder, así el JSON no cambia para el frontend.
+# - respuesta_filas(): para filas de confianza (objetos ORM o filas de Core) con un
+#   esquema de salida; toma solo los campos del esquema sin validarlos y produce el mismo
+#   JSON que response_model (Decimal como texto, UUID como texto, fechas ISO 8601).
+#
+# Son opcionales por endpoint: FastAPI solo usa su ruta rápida de pydantic cuando la
+# ruta no declara response_class, por eso no se configura como clase por defecto.
+
+OPCIONES_ORJSON = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+
+def _decimal_como_numero(valor):
+    if isinstance(valor, Decimal):
+        # mismo criterio que fastapi.encoders.decimal_encoder
+        return int(valor) if valor.as_tuple().exponent >= 0 else float(valor)
+    return _otros_tipos(valor)
+
+
+def _decimal_como_texto(valor):
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return _otros_tipos(valor)
+
+
+def _otros_tipos(valor):
+    try:
+        return jsonable_encoder(valor)
+    except ValueError as e:
+        raise TypeError(str(e))
+
+
+class RespuestaORJSON(JSONResponse):
+    """JSONResponse serializada con orjson; retornarla directamente desde el endpoint."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_decimal_como_numero, option=OPCIONES_ORJSON)
+
+
+def filas_a_dicts(esquema: Type[BaseModel], filas: Sequence) -> list:
+    """
+    Dicts con los campos de `esquema` tomados de cada fila (atributos o claves). Los
+    campos que la fila no tiene toman el valor por defecto del esquema, como al validar.
+    """
+    if not filas:
+        return []
+    es_mapping = isinstance(filas[0], Mapping)
+    presentes, faltantes = [], {}
+    for campo, info in esquema.model_fields.items():
+        if (campo in filas[0]) if es_mapping else hasattr(filas[0], campo):
+            presentes.append(campo)
+        else:
+            faltantes[campo] = info.get_default(call_default_factory=True)
+
+    if es_mapping:
+        dicts = [{campo: fila[campo] for campo in presentes} for fila in filas]
+    elif len(presentes) == 1:
+        dicts = [{presentes[0]: getattr(fila, presentes[0])} for fila in filas]
+    else:
+        obtener = attrgetter(*presentes)
+        dicts = [dict(zip(presentes, obtener(fila))) for fila in filas]
+    if faltantes:
+        # mismo orden de claves que el esquema (y que response_model)
+        orden = tuple(esquema.model_fields)
+        dicts = [{campo: d[campo] if campo in d else faltantes[campo] for campo in orden} for d in dicts]
+    return dicts
+
+
+def respuesta_filas(
+    esquema: Type[BaseModel],
+    filas: Sequence,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """
+    Respuesta JSON de una lista de filas leídas de la base de datos, sin volver a
+    validarlas con `esquema`. Al retornar un Response FastAPI no aplica response_model,
+    que queda solo para la documentación; los encabezados (ETag) van en `headers`.
+    """
+    contenido = orjson.dumps(filas_a_dicts(esquema, filas), default=_decimal_como_texto, option=OPCIONES_ORJSON)
+    return Response(content=contenido, status_code=status_code, headers=headers, media_type="application/json")
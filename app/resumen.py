@@ -0,0 +1,157 @@
+import asyncio
+import uuid
+from app import models
+from app.database import SessionLocal
+from sqlalchemy import select, func, literal, cast
+from sqlalchemy.dialects.postgresql import insert as pg_insert, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Resumen presupuestario por POA (tabla RESUMEN_PRESUPUESTO_POA).
+# Cada escritura que cambia montos de un POA recalcula solo la fila de ese POA con
+# un único INSERT ... SELECT ... ON CONFLICT, de modo que los tableros leen una fila
+# indexada en lugar de recorrer actividades, tareas y programación mensual.
+
+
+def _suma(columna, *condiciones, desde=None):
+    consulta = select(func.coalesce(func.sum(columna), 0))
+    if desde is not None:
+        consulta = consulta.select_from(desde)
+    return consulta.where(*condiciones).correlate(models.Poa).scalar_subquery()
+
+
+def _consulta_resumen():
+    Poa, Actividad, Tarea = models.Poa, models.Actividad, models.Tarea
+    ProgramacionMensual = models.ProgramacionMensual
+    tareas_del_poa = Tarea.__table__.join(Actividad.__table__, Tarea.id_actividad == Actividad.id_actividad)
+
+    # Programación agrupada por mes; la correlación con POA atraviesa la tabla derivada
+    por_mes = (
+        select(ProgramacionMensual.mes, func.sum(ProgramacionMensual.valor).label("valor"))
+        .join(Tarea, Tarea.id_tarea == ProgramacionMensual.id_tarea)
+        .join(Actividad, Actividad.id_actividad == Tarea.id_actividad)
+        .where(Actividad.id_poa == Poa.id_poa)
+        .group_by(ProgramacionMensual.mes)
+        .correlate(Poa)
+        .subquery("por_mes")
+    )
+    programado_mensual = (
+        select(func.coalesce(func.jsonb_object_agg(por_mes.c.mes, por_mes.c.valor), cast(literal("{}"), JSONB)))
+        .correlate(Poa)
+        .scalar_subquery()
+    )
+
+    return select(
+        Poa.id_poa,
+        Poa.id_proyecto,
+        Poa.anio_ejecucion,
+        Poa.presupuesto_asignado,
+        _suma(Actividad.total_por_actividad, Actividad.id_poa == Poa.id_poa),
+        _suma(Actividad.saldo_actividad, Actividad.id_poa == Poa.id_poa),
+        _suma(
+            ProgramacionMensual.valor,
+            Actividad.id_poa == Poa.id_poa,
+            desde=tareas_del_poa.join(
+                ProgramacionMensual.__table__, ProgramacionMensual.id_tarea == Tarea.id_tarea
+            ),
+        ),
+        programado_mensual,
+        _suma(models.ControlPresupuestario.monto_certificado, models.ControlPresupuestario.id_poa == Poa.id_poa),
+        _suma(models.ControlPresupuestario.monto_comprometido, models.ControlPresupuestario.id_poa == Poa.id_poa),
+        _suma(models.ControlPresupuestario.monto_devengado, models.ControlPresupuestario.id_poa == Poa.id_poa),
+        _suma(models.EjecucionPresupuestaria.monto_ejecutado, models.EjecucionPresupuestaria.id_poa == Poa.id_poa),
+        func.now(),
+    )
+
+
+_COLUMNAS = [
+    "id_poa", "id_proyecto", "anio_ejecucion", "presupuesto_asignado",
+    "total_actividades", "saldo_actividades", "total_programado", "programado_mensual",
+    "total_certificado", "total_comprometido", "total_devengado", "total_ejecutado",
+    "fecha_actualizacion",
+]
+
+
+async def _refrescar(db: AsyncSession, condicion=None):
+    consulta = _consulta_resumen()
+    if condicion is not None:
+        consulta = consulta.where(condicion)
+
+    stmt = pg_insert(models.ResumenPresupuestoPoa).from_select(_COLUMNAS, consulta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.ResumenPresupuestoPoa.id_poa],
+        set_={col: stmt.excluded[col] for col in _COLUMNAS if col != "id_poa"},
+    )
+    await db.execute(stmt)
+
+
+async def refrescar_resumen_poa(db: AsyncSession, *ids_poa: uuid.UUID):
+    """
+    Recalcula el resumen de los POA indicados dentro de la transacción actual.
+    No hace commit: debe llamarse antes del commit de la escritura que lo provoca.
+    """
+    ids = {id_poa for id_poa in ids_poa if id_poa}
+    if ids:
+        await _refrescar(db, models.Poa.id_poa.in_(ids))
+
+
+async def refrescar_resumen_de_tareas(db: AsyncSession, *ids_tarea: uuid.UUID):
+    """Igual que refrescar_resumen_poa, resolviendo el POA a partir de las tareas."""
+    ids = {id_tarea for id_tarea in ids_tarea if id_tarea}
+    if ids:
+        poas = (
+            select(models.Actividad.id_poa)
+            .join(models.Tarea, models.Tarea.id_actividad == models.Actividad.id_actividad)
+            .where(models.Tarea.id_tarea.in_(ids))
+        )
+        await _refrescar(db, models.Poa.id_poa.in_(poas))
+
+
+async def completar_resumen_proyecto(db: AsyncSession, id_proyecto: uuid.UUID) -> bool:
+    """
+    Calcula el resumen de los POA del proyecto que aún no tienen fila (creados antes de
+    existir la tabla o cargados por fuera de la API). No hace commit.
+    Retorna True si calculó alguno.
+    """
+    faltantes = (
+        await db.execute(
+            select(models.Poa.id_poa)
+            .outerjoin(models.ResumenPresupuestoPoa, models.ResumenPresupuestoPoa.id_poa == models.Poa.id_poa)
+            .where(models.Poa.id_proyecto == id_proyecto, models.ResumenPresupuestoPoa.id_poa.is_(None))
+        )
+    ).scalars().all()
+    await refrescar_resumen_poa(db, *faltantes)
+    return bool(faltantes)
+
+
+async def refrescar_resumen_completo(db: AsyncSession):
+    """Recalcula el resumen de todos los POA (carga inicial o ejecución programada)."""
+    await _refrescar(db)
+
+
+async def refrescar_resumen_en_segundo_plano(*ids_poa: uuid.UUID):
+    """
+    Refresca el resumen en una transacción propia, fuera de la escritura que lo provoca.
+    Pensado para BackgroundTasks en rutas muy concurrentes (movimientos presupuestarios),
+    donde bloquear la fila del resumen dentro de cada transacción las serializaría por POA.
+    """
+    try:
+        async with SessionLocal() as db:
+            await refrescar_resumen_poa(db, *ids_poa)
+            await db.commit()
+    except Exception as e:
+        print(f"Error al refrescar el resumen de POAs {ids_poa}: {e}")
+
+
+async def refrescar_periodicamente(intervalo_segundos: int):
+    """
+    Tarea de fondo que recalcula todos los resúmenes cada `intervalo_segundos`.
+    Corrige cualquier escritura que no haya pasado por la API (cargas manuales, SQL directo).
+    """
+    while True:
+        await asyncio.sleep(intervalo_segundos)
+        try:
+            async with SessionLocal() as db:
+                await refrescar_resumen_completo(db)
+                await db.commit()
+        except Exception as e:
+            print(f"Error al refrescar el resumen de POAs: {e}")
@@ -0,0 +1,37 @@
+import importlib
+import os
+from typing import List, Optional, Sequence
+from fastapi import FastAPI
+
+# Endpoints de la API agrupados por dominio. Cada módulo define un APIRouter con la
+# parte HTTP (parámetros, permisos, códigos de respuesta) y delega la lógica en los
+# módulos de servicio de app/ (lecturas, reformas, presupuesto, cargas, reportes, ...).
+#
+# DOMINIOS (separados por comas; vacío = todos) elige qué dominios sirve el proceso y
+# solo se importan sus módulos. Así reportes y cargas de Excel, que usan más CPU y
+# memoria, pueden correr en workers propios con sus límites de recursos:
+#   DOMINIOS=reportes,cargas  -> /reporte-poa, /exportar, /transformar_excel, /logs-carga-excel
+#   DOMINIOS=usuarios,periodos,proyectos,poas,tareas,presupuesto,reformas,eventos -> el resto
+# y el proxy envía cada prefijo al grupo que lo sirve.
+
+DOMINIOS = (
+    "usuarios", "periodos", "proyectos", "poas", "tareas", "presupuesto",
+    "reformas", "cargas", "reportes", "eventos",
+)
+
+
+def dominios_habilitados() -> List[str]:
+    valor = os.getenv("DOMINIOS", "").strip()
+    if not valor:
+        return list(DOMINIOS)
+    elegidos = [d.strip() for d in valor.split(",") if d.strip()]
+    desconocidos = [d for d in elegidos if d not in DOMINIOS]
+    if desconocidos:
+        raise ValueError(f"DOMINIOS no válidos: {', '.join(desconocidos)}; disponibles: {', '.join(DOMINIOS)}")
+    return [d for d in DOMINIOS if d in elegidos]
+
+
+def registrar_routers(app: FastAPI, dominios: Optional[Sequence[str]] = None):
+    for dominio in dominios or dominios_habilitados():
+        modulo = importlib.import_module(f"app.routers.{dominio}")
+        app.include_router(modulo.router)
@@ -0,0 +1,106 @@
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, logs_carga, cargas
+from app.database import get_db
+from app.respuestas import RespuestaORJSON
+from app.auth import get_current_user, get_current_user_sin_sesion
+
+# Carga de actividades y tareas desde el Excel del POA (app/cargas.py) y consulta o
+# exportación de los logs de carga.
+
+router = APIRouter(tags=["cargas"])
+
+
+@router.post("/transformar_excel/")
+async def transformar_archivo_excel(
+    file: UploadFile = File(...),
+    hoja: str = Form(...),
+    db: AsyncSession = Depends(get_db),
+    id_poa: uuid.UUID = Form(...),  # Recibir el ID del POA
+    confirmacion: bool = Form(False),  # Confirmación del frontend
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Validar que el archivo tenga una extensión válida
+    if not file.filename.endswith((".xls", ".xlsx")):
+        raise HTTPException(status_code=400, detail="Archivo no soportado")
+
+    # Validar que el POA exista
+    result = await db.execute(select(models.Poa).where(models.Poa.id_poa == id_poa))
+    poa = result.scalars().first()
+    if not poa:
+        raise HTTPException(status_code=404, detail="POA no encontrado")
+    
+    contenido = await file.read()
+    try:
+        return await cargas.cargar_excel_poa(db, poa, usuario, contenido, file.filename, hoja, confirmacion)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # Capturar errores de formato y lanzar una excepción HTTP
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        print(f"Error inesperado en /transformar_excel/: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/logs-carga-excel/")
+async def obtener_logs_carga_excel(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    fecha_inicio: str = Query(None),
+    fecha_fin: str = Query(None),
+    limite: int = Query(1000, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    try:
+        try:
+            desde, hasta = logs_carga.rango_fechas(fecha_inicio, fecha_fin)
+        except ValueError:
+            return JSONResponse(content=[], status_code=200)
+
+        query = logs_carga.consulta_logs(desde, hasta)
+        total = (await db.execute(logs_carga.consulta_total(query))).scalar_one()
+        result = await db.execute(query.limit(limite).offset(offset))
+        filas = [dict(fila) for fila in result.mappings().all()]
+
+        # Sin parámetros se devuelve solo la primera página: el total y el enlace a la
+        # siguiente permiten al cliente saber que el resultado está incompleto
+        headers = {"X-Total-Count": str(total)}
+        if offset + len(filas) < total:
+            siguiente = request.url.include_query_params(limite=limite, offset=offset + len(filas))
+            headers["Link"] = f'<{siguiente}>; rel="next"'
+        return RespuestaORJSON(filas, headers=headers)
+    except Exception as e:
+        print("Error en logs-carga-excel:", e)
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+@router.get("/logs-carga-excel/exportar")
+async def exportar_logs_carga_excel(
+    formato: str = Query("csv", pattern="^(csv|ndjson)$"),
+    fecha_inicio: str = Query(None),
+    fecha_fin: str = Query(None),
+    usuario: models.Usuario = Depends(get_current_user_sin_sesion)
+):
+    try:
+        desde, hasta = logs_carga.rango_fechas(fecha_inicio, fecha_fin)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de fecha inválido, use YYYY-MM-DD")
+
+    # Las filas se envían a medida que salen del cursor, sin cargar todo el rango en memoria
+    query = logs_carga.consulta_logs(desde, hasta)
+    if formato == "csv":
+        return StreamingResponse(
+            logs_carga.exportar_csv(query),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": "attachment; filename=logs-carga-excel.csv"}
+        )
+    return StreamingResponse(
+        logs_carga.exportar_ndjson(query),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=logs-carga-excel.ndjson"}
+    )
@@ -0,0 +1,67 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, schemas, auth, registro_cambios, eventos
+from app.database import get_db
+from app.respuestas import RespuestaORJSON
+from app.auth import get_current_user, get_current_user_eventos
+
+# Eventos en vivo (SSE) y feed incremental de cambios.
+
+router = APIRouter(tags=["eventos"])
+
+
+# Ticket para abrir /eventos desde un navegador (EventSource no envía encabezados)
+@router.post("/eventos/ticket", response_model=schemas.TicketEventos)
+async def ticket_eventos(usuario: models.Usuario = Depends(get_current_user)):
+    return {
+        "ticket": auth.crear_ticket_eventos(usuario),
+        "expira_en": int(auth.DURACION_TICKET_EVENTOS.total_seconds()),
+    }
+
+
+# Eventos en vivo del usuario (server-sent events): carga Excel, exportación, reformas
+@router.get("/eventos")
+async def flujo_eventos(usuario: models.Usuario = Depends(get_current_user_eventos)):
+    return StreamingResponse(
+        eventos.flujo_sse(str(usuario.id_usuario)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/cambios")
+async def feed_cambios(
+    desde: str = Query(registro_cambios.CURSOR_INICIAL),
+    limite: int = Query(1000, ge=1, le=10000),
+    entidad: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    """
+    Cambios (creado, actualizado, eliminado) de POAs, actividades, tareas, programación
+    mensual y reformas posteriores al cursor `desde`. Se repite la consulta con el
+    `cursor` de la respuesta mientras `hay_mas` sea verdadero. Los cambios se conservan
+    RETENCION_CAMBIOS_DIAS días; si la poda ya eliminó cambios posteriores al cursor
+    responde 410.
+    """
+    if entidad and any(e not in registro_cambios.ENTIDADES for e in entidad):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Entidad no válida; use: {', '.join(registro_cambios.ENTIDADES)}"
+        )
+    try:
+        registro_cambios.parsear_cursor(desde)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if not await registro_cambios.cursor_vigente(db, desde):
+        raise HTTPException(
+            status_code=410,
+            detail=(
+                f"Se eliminaron cambios posteriores al cursor (se conservan {registro_cambios.RETENCION_CAMBIOS_DIAS} días); "
+                f"recargue los datos y vuelva a empezar desde {registro_cambios.CURSOR_INICIAL}"
+            )
+        )
+
+    return RespuestaORJSON(await registro_cambios.leer_cambios(db, desde, limite, entidad))
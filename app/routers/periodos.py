@@ -0,0 +1,96 @@
+import uuid
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, schemas
+from app.database import get_db
+from app.auth import get_current_user
+
+# Periodos de planificación; crear y editar requieren rol Administrador o Director de Investigacion.
+
+router = APIRouter(tags=["periodos"])
+
+
+@router.post("/periodos/", response_model=schemas.PeriodoOut)
+async def crear_periodo(data: schemas.PeriodoCreate, db: AsyncSession = Depends(get_db),usuario: models.Usuario = Depends(get_current_user)):
+    
+    # Obtener el rol del usuario
+    result = await db.execute(select(models.Rol).where(models.Rol.id_rol == usuario.id_rol))
+    rol = result.scalars().first()
+
+    if not rol or rol.nombre_rol not in ["Administrador", "Director de Investigacion"]:
+        raise HTTPException(status_code=403, detail="No tienes permisos para crear periodos")
+    
+    # Validar que no exista ya el código
+    result = await db.execute(select(models.Periodo).where(models.Periodo.codigo_periodo == data.codigo_periodo))
+    existente = result.scalars().first()
+
+    if existente:
+        raise HTTPException(status_code=400, detail="Ya existe un periodo con ese código")
+
+    nuevo = models.Periodo(
+        id_periodo=uuid.uuid4(),
+        codigo_periodo=data.codigo_periodo,
+        nombre_periodo=data.nombre_periodo,
+        fecha_inicio=data.fecha_inicio,
+        fecha_fin=data.fecha_fin,
+        anio=data.anio,
+        mes=data.mes
+    )
+
+    db.add(nuevo)
+    await db.commit()
+    await db.refresh(nuevo)
+
+    return nuevo
+
+@router.put("/periodos/{id}", response_model=schemas.PeriodoOut)
+async def editar_periodo_completo(
+    id: uuid.UUID,
+    data: schemas.PeriodoCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result_rol = await db.execute(select(models.Rol).where(models.Rol.id_rol == usuario.id_rol))
+    rol = result_rol.scalars().first()
+    if not rol or rol.nombre_rol not in ["Administrador", "Director de Investigacion"]:
+        raise HTTPException(status_code=403, detail="No tienes permisos para editar periodos")
+
+    result = await db.execute(select(models.Periodo).where(models.Periodo.id_periodo == id))
+    periodo = result.scalars().first()
+
+    if not periodo:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+
+    # Reemplazar todos los campos
+    periodo.codigo_periodo = data.codigo_periodo
+    periodo.nombre_periodo = data.nombre_periodo
+    periodo.fecha_inicio = data.fecha_inicio
+    periodo.fecha_fin = data.fecha_fin
+    periodo.anio = data.anio
+    periodo.mes = data.mes
+
+    await db.commit()
+    await db.refresh(periodo)
+    return periodo
+
+@router.get("/periodos/", response_model=List[schemas.PeriodoOut])
+async def listar_periodos(
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(select(models.Periodo))
+    periodos = result.scalars().all()
+    return periodos
+
+
+@router.get("/periodos/{id}", response_model=schemas.PeriodoOut)
+async def obtener_periodo(id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.Periodo).where(models.Periodo.id_periodo == id))
+    periodo = result.scalars().first()
+
+    if not periodo:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+
+    return periodo
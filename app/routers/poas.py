@@ -0,0 +1,332 @@
+from datetime import date
+import uuid
+from typing import List, Optional
+from dateutil.relativedelta import relativedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, schemas, resumen, snapshots, concurrencia, lecturas
+from app.database import get_db
+from app.respuestas import respuesta_filas
+from app.auth import get_current_user
+
+# POAs: creación y edición (presupuesto según tipo y periodo), catálogos, historial,
+# resumen presupuestario y snapshots.
+
+router = APIRouter(tags=["poas"])
+
+
+@router.post("/poas/", response_model=schemas.PoaOut)
+async def crear_poa(
+    data: schemas.PoaCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Validar que el proyecto exista
+    result = await db.execute(select(models.Proyecto).where(models.Proyecto.id_proyecto == data.id_proyecto))
+    proyecto = result.scalars().first()
+    if not proyecto:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+    # Validar que el periodo exista
+    result = await db.execute(select(models.Periodo).where(models.Periodo.id_periodo == data.id_periodo))
+    periodo = result.scalars().first()
+    if not periodo:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+     # Verificar si ya existe un POA con ese periodo
+    result = await db.execute(
+        select(models.Poa).where(models.Poa.id_periodo == data.id_periodo)
+    )
+    poa_existente = result.scalars().first()
+    if poa_existente:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ya existe un POA asignado al periodo '{periodo.nombre_periodo}'"
+        )
+    
+    # Validar que el tipo POA exista
+    result = await db.execute(select(models.TipoPOA).where(models.TipoPOA.id_tipo_poa == data.id_tipo_poa))
+    tipo_poa = result.scalars().first()
+    if not tipo_poa:
+        raise HTTPException(status_code=404, detail="Tipo de POA no encontrado")
+    
+    # Mejorar el cálculo de la duración del periodo para considerar días también
+    diferencia = relativedelta(periodo.fecha_fin, periodo.fecha_inicio)
+    duracion_meses = diferencia.months + diferencia.years * 12
+
+    # Si hay días adicionales, considerar como mes adicional si es más de la mitad del mes
+    if diferencia.days > 15:
+        duracion_meses += 1
+    
+    if duracion_meses > tipo_poa.duracion_meses:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El periodo '{periodo.nombre_periodo}' tiene una duración de {duracion_meses} meses, " +
+                   f"pero el tipo de POA '{tipo_poa.nombre}' permite máximo {tipo_poa.duracion_meses} meses"
+        )
+
+    result = await db.execute(select(models.EstadoPOA).where(models.EstadoPOA.nombre == "Ingresado"))
+    estado = result.scalars().first()
+    if not estado:
+        raise HTTPException(status_code=500, detail="Estado 'Ingresado' no está definido en la base de datos")
+
+    # Crear POA
+    nuevo_poa = models.Poa(
+        id_poa=uuid.uuid4(),
+        id_proyecto=data.id_proyecto,
+        id_periodo=data.id_periodo,
+        codigo_poa=data.codigo_poa,
+        fecha_creacion=data.fecha_creacion,
+        id_estado_poa=estado.id_estado_poa,
+        id_tipo_poa=data.id_tipo_poa,
+        anio_ejecucion=data.anio_ejecucion,
+        presupuesto_asignado=data.presupuesto_asignado
+    )
+    db.add(nuevo_poa)
+    await db.flush()
+    await resumen.refrescar_resumen_poa(db, nuevo_poa.id_poa)
+    await db.commit()
+    await db.refresh(nuevo_poa)
+
+    return nuevo_poa
+
+@router.put("/poas/{id}", response_model=schemas.PoaOut)
+async def editar_poa(
+    id: uuid.UUID,
+    data: schemas.PoaCreate,
+    response: Response,
+    version: Optional[int] = Depends(concurrencia.version_esperada),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Verificar que el POA exista
+    result = await db.execute(select(models.Poa).where(models.Poa.id_poa == id))
+    poa = result.scalars().first()
+    if not poa:
+        raise HTTPException(status_code=404, detail="POA no encontrado")
+    concurrencia.verificar_version(poa, version)
+
+    # Verificar existencia del proyecto
+    result = await db.execute(select(models.Proyecto).where(models.Proyecto.id_proyecto == data.id_proyecto))
+    if not result.scalars().first():
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+
+    # Verificar existencia del periodo
+    result = await db.execute(select(models.Periodo).where(models.Periodo.id_periodo == data.id_periodo))
+    periodo = result.scalars().first()
+    if not periodo:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+     # Verificar si el nuevo periodo ya está ocupado por otro POA
+    if poa.id_periodo != data.id_periodo:
+        result = await db.execute(
+            select(models.Poa)
+            .where(models.Poa.id_periodo == data.id_periodo, models.Poa.id_poa != poa.id_poa)
+        )
+        otro_poa = result.scalars().first()
+        if otro_poa:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Ya existe un POA asignado al periodo '{periodo.nombre_periodo}'"
+            )
+   
+    # Verificar existencia del tipo POA
+    result = await db.execute(select(models.TipoPOA).where(models.TipoPOA.id_tipo_poa == data.id_tipo_poa))
+    tipo_poa = result.scalars().first()
+
+    if not tipo_poa:
+        raise HTTPException(status_code=404, detail="Tipo de POA no encontrado")
+
+    # Mejorar el cálculo de la duración del periodo para considerar días también
+    diferencia = relativedelta(periodo.fecha_fin, periodo.fecha_inicio)
+    duracion_meses = diferencia.months + diferencia.years * 12
+
+    # Si hay días adicionales, considerar como mes adicional si es más de la mitad del mes
+    if diferencia.days > 15:
+        duracion_meses += 1
+    
+    if duracion_meses > tipo_poa.duracion_meses:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El periodo '{periodo.nombre_periodo}' tiene una duración de {duracion_meses} meses, " +
+                   f"pero el tipo de POA '{tipo_poa.nombre}' permite máximo {tipo_poa.duracion_meses} meses"
+        )
+
+    # Estado se mantiene igual que antes
+    result = await db.execute(select(models.EstadoPOA).where(models.EstadoPOA.id_estado_poa == data.id_estado_poa))
+    estado = result.scalars().first()
+    if not estado:
+        raise HTTPException(status_code=400, detail="Estado POA no encontrado")
+
+    # Actualizar el POA
+    poa.id_proyecto = data.id_proyecto
+    poa.id_periodo = data.id_periodo
+    poa.codigo_poa = data.codigo_poa
+    poa.fecha_creacion = data.fecha_creacion
+    poa.id_tipo_poa = data.id_tipo_poa
+    poa.id_estado_poa = data.id_estado_poa  # o mantener el actual si no deseas sobreescribir
+    poa.anio_ejecucion = data.anio_ejecucion
+    poa.presupuesto_asignado = data.presupuesto_asignado
+
+    await db.flush()
+    await resumen.refrescar_resumen_poa(db, poa.id_poa)
+    await db.commit()
+    await db.refresh(poa)
+    response.headers["ETag"] = concurrencia.etag(poa.version)
+    return poa
+
+@router.get("/poas/", response_model=List[schemas.PoaOut])
+async def listar_poas(
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    return respuesta_filas(schemas.PoaOut, await lecturas.poas(db))
+
+@router.get("/poas/{id}", response_model=schemas.PoaOut)
+async def obtener_poa(
+    id: uuid.UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(select(models.Poa).where(models.Poa.id_poa == id))
+    poa = result.scalars().first()
+
+    if not poa:
+        raise HTTPException(status_code=404, detail="POA no encontrado")
+
+    etag = concurrencia.etag(poa.version)
+    no_modificado = concurrencia.no_modificado(request, etag)
+    if no_modificado:
+        return no_modificado
+    response.headers["ETag"] = etag
+    return poa
+
+@router.get("/estados-poa/", response_model=List[schemas.EstadoPoaOut])
+async def listar_estados_poa(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.EstadoPOA))
+    return result.scalars().all()
+
+@router.get("/tipos-poa/", response_model=List[schemas.TipoPoaOut])
+async def listar_tipos_poa(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.TipoPOA))
+
+    return result.scalars().all()
+
+@router.get("/tipos-poa/{id}", response_model=schemas.TipoPoaOut)
+async def obtener_tipo_poa(
+    id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(select(models.TipoPOA).where(models.TipoPOA.id_tipo_poa == id))
+    tipo_poa = result.scalars().first()
+
+    if not tipo_poa:
+        raise HTTPException(status_code=404, detail="Tipo de POA no encontrado")
+
+    return tipo_poa
+
+#detalles tarea por poa
+@router.get("/poas/{id_poa}/detalles_tarea", response_model=List[schemas.DetalleTareaOut])
+async def obtener_detalles_tarea_poa(
+    id_poa: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.DetalleTarea)
+        .join(models.TipoPoaDetalleTarea, models.DetalleTarea.id_detalle_tarea == models.TipoPoaDetalleTarea.id_detalle_tarea)
+        .join(models.Poa, models.TipoPoaDetalleTarea.id_tipo_poa == models.Poa.id_tipo_poa)
+        .where(models.Poa.id_poa == id_poa)
+    )
+    return result.scalars().all()
+
+
+@router.get("/poas/{id_poa}/snapshots", response_model=List[schemas.SnapshotPoaOut])
+async def listar_snapshots_poa(
+    id_poa: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # sin cargar el contenido comprimido
+    columnas = [c for c in models.SnapshotPoa.__table__.c if c.name != "contenido"]
+    result = await db.execute(
+        select(*columnas)
+        .where(models.SnapshotPoa.id_poa == id_poa)
+        .order_by(models.SnapshotPoa.fecha_creacion.desc())
+    )
+    return result.mappings().all()
+
+
+@router.post("/poas/{id_poa}/snapshots", response_model=schemas.SnapshotPoaOut)
+async def crear_snapshot_poa(
+    id_poa: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    poa = await db.get(models.Poa, id_poa)
+    if not poa:
+        raise HTTPException(status_code=404, detail="POA no encontrado")
+
+    snapshot = await snapshots.crear_snapshot(db, id_poa, snapshots.MOMENTO_MANUAL, usuario.id_usuario)
+    await db.commit()
+    return snapshot
+
+
+@router.get("/snapshots/{id_snapshot}")
+async def obtener_snapshot(
+    id_snapshot: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    snapshot = await db.get(models.SnapshotPoa, id_snapshot)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Snapshot no encontrado")
+    return {
+        **schemas.SnapshotPoaOut.model_validate(snapshot).model_dump(),
+        "contenido": snapshots.leer(snapshot),
+    }
+
+
+@router.get("/snapshots/{id_snapshot_antes}/comparar/{id_snapshot_despues}")
+async def comparar_snapshots(
+    id_snapshot_antes: uuid.UUID,
+    id_snapshot_despues: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    antes = await db.get(models.SnapshotPoa, id_snapshot_antes)
+    despues = await db.get(models.SnapshotPoa, id_snapshot_despues)
+    if not antes or not despues:
+        raise HTTPException(status_code=404, detail="Snapshot no encontrado")
+    if antes.id_poa != despues.id_poa:
+        raise HTTPException(status_code=400, detail="Los snapshots pertenecen a POAs distintos")
+
+    diferencias_poa = snapshots.comparar(snapshots.leer(antes), snapshots.leer(despues))
+    return {"id_snapshot_antes": antes.id_snapshot, "id_snapshot_despues": despues.id_snapshot, **diferencias_poa}
+
+@router.get("/poas/{id_poa}/historial", response_model=List[schemas.HistoricoPoaOut])
+async def historial_poa(
+    id_poa: uuid.UUID,
+    desde: Optional[date] = Query(None),
+    hasta: Optional[date] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    return respuesta_filas(schemas.HistoricoPoaOut, await lecturas.historial_poa(db, id_poa, desde, hasta))
+
+@router.get("/poas/{id_poa}/resumen", response_model=schemas.ResumenPoaOut)
+async def obtener_resumen_poa(
+    id_poa: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    resumen_poa = await db.get(models.ResumenPresupuestoPoa, id_poa)
+    if not resumen_poa:
+        # POA sin resumen todavía (p. ej. creado antes de existir la tabla): calcularlo una vez
+        await resumen.refrescar_resumen_poa(db, id_poa)
+        await db.commit()
+        resumen_poa = await db.get(models.ResumenPresupuestoPoa, id_poa)
+        if not resumen_poa:
+            raise HTTPException(status_code=404, detail="POA no encontrado")
+    return resumen_poa
@@ -0,0 +1,178 @@
+from datetime import datetime
+from decimal import Decimal
+import uuid
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, schemas, auth, resumen, presupuesto
+from app.database import get_db
+from app.auth import get_current_user
+
+# Certificación, compromiso, devengado y ejecución presupuestaria de tareas
+# (saldos en app/presupuesto.py).
+
+router = APIRouter(tags=["presupuesto"])
+
+
+async def _verificar_permiso_presupuesto(db: AsyncSession, usuario: models.Usuario):
+    if not await auth.tiene_permiso(db, usuario, "BUDGET_EXEC"):
+        raise HTTPException(status_code=403, detail="No tienes permisos para registrar movimientos presupuestarios")
+
+async def _rechazar_movimiento(db: AsyncSession, modelo, id_entidad, no_encontrado: str, sin_saldo: str):
+    # El UPDATE condicional no afectó filas: distinguir entre inexistente y sin saldo
+    await db.rollback()
+    if not await db.get(modelo, id_entidad):
+        raise HTTPException(status_code=404, detail=no_encontrado)
+    raise HTTPException(status_code=409, detail=sin_saldo)
+
+
+@router.post("/tareas/{id_tarea}/certificaciones", response_model=schemas.ControlPresupuestarioOut, status_code=201)
+async def certificar_tarea(
+    id_tarea: uuid.UUID,
+    data: schemas.CertificacionCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    await _verificar_permiso_presupuesto(db, usuario)
+
+    id_poa = await presupuesto.descontar_saldo_tarea(db, id_tarea, data.monto)
+    if id_poa is None:
+        await _rechazar_movimiento(db, models.Tarea, id_tarea, "Tarea no encontrada", "Saldo insuficiente en la tarea")
+
+    control = models.ControlPresupuestario(
+        id_control=uuid.uuid4(),
+        id_poa=id_poa,
+        id_tarea=id_tarea,
+        fecha_registro=datetime.utcnow(),
+        monto_certificado=data.monto,
+        monto_comprometido=Decimal("0"),
+        monto_devengado=Decimal("0"),
+        saldo_disponible=data.monto,
+        id_reforma=data.id_reforma,
+        justificacion=data.justificacion,
+        referencia_documento=data.referencia_documento
+    )
+    db.add(control)
+    await db.commit()
+
+    background_tasks.add_task(resumen.refrescar_resumen_en_segundo_plano, id_poa)
+    return control
+
+
+@router.post("/certificaciones/{id_control}/compromisos", response_model=schemas.ControlPresupuestarioOut)
+async def comprometer_certificacion(
+    id_control: uuid.UUID,
+    data: schemas.MovimientoPresupuestario,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    await _verificar_permiso_presupuesto(db, usuario)
+
+    id_poa = await presupuesto.comprometer(db, id_control, data.monto)
+    if id_poa is None:
+        await _rechazar_movimiento(
+            db, models.ControlPresupuestario, id_control,
+            "Certificación no encontrada", "El monto comprometido superaría el monto certificado"
+        )
+    await db.commit()
+
+    background_tasks.add_task(resumen.refrescar_resumen_en_segundo_plano, id_poa)
+    return await db.get(models.ControlPresupuestario, id_control, populate_existing=True)
+
+
+@router.post("/certificaciones/{id_control}/devengados", response_model=schemas.ControlPresupuestarioOut)
+async def devengar_certificacion(
+    id_control: uuid.UUID,
+    data: schemas.MovimientoPresupuestario,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    await _verificar_permiso_presupuesto(db, usuario)
+
+    id_poa = await presupuesto.devengar(db, id_control, data.monto)
+    if id_poa is None:
+        await _rechazar_movimiento(
+            db, models.ControlPresupuestario, id_control,
+            "Certificación no encontrada", "El monto devengado superaría el monto comprometido"
+        )
+    await db.commit()
+
+    background_tasks.add_task(resumen.refrescar_resumen_en_segundo_plano, id_poa)
+    return await db.get(models.ControlPresupuestario, id_control, populate_existing=True)
+
+
+@router.post("/tareas/{id_tarea}/ejecuciones", response_model=schemas.EjecucionPresupuestariaOut, status_code=201)
+async def ejecutar_tarea(
+    id_tarea: uuid.UUID,
+    data: schemas.EjecucionCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    await _verificar_permiso_presupuesto(db, usuario)
+
+    if data.id_control_presupuestario:
+        # Ejecución contra una certificación previa
+        id_poa = await presupuesto.descontar_saldo_control(
+            db, data.id_control_presupuestario, id_tarea, data.monto
+        )
+        if id_poa is None:
+            await _rechazar_movimiento(
+                db, models.ControlPresupuestario, data.id_control_presupuestario,
+                "Certificación no encontrada",
+                "La certificación no pertenece a la tarea o el monto ejecutado superaría el monto devengado"
+            )
+    else:
+        # Ejecución directa sobre el saldo de la tarea
+        id_poa = await presupuesto.descontar_saldo_tarea(db, id_tarea, data.monto)
+        if id_poa is None:
+            await _rechazar_movimiento(db, models.Tarea, id_tarea, "Tarea no encontrada", "Saldo insuficiente en la tarea")
+
+    ejecucion = models.EjecucionPresupuestaria(
+        id_ejecucion=uuid.uuid4(),
+        id_tarea=id_tarea,
+        id_poa=id_poa,
+        monto_ejecutado=data.monto,
+        fecha_ejecucion=datetime.utcnow(),
+        descripcion_ejecucion=data.descripcion_ejecucion,
+        referencia_documento=data.referencia_documento,
+        bloqueado=False,
+        id_control_presupuestario=data.id_control_presupuestario
+    )
+    db.add(ejecucion)
+    await db.commit()
+
+    background_tasks.add_task(resumen.refrescar_resumen_en_segundo_plano, id_poa)
+    return ejecucion
+
+
+@router.get("/tareas/{id_tarea}/certificaciones", response_model=List[schemas.ControlPresupuestarioOut])
+async def listar_certificaciones_de_tarea(
+    id_tarea: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.ControlPresupuestario)
+        .where(models.ControlPresupuestario.id_tarea == id_tarea)
+        .order_by(models.ControlPresupuestario.fecha_registro)
+    )
+    return result.scalars().all()
+
+
+@router.get("/tareas/{id_tarea}/ejecuciones", response_model=List[schemas.EjecucionPresupuestariaOut])
+async def listar_ejecuciones_de_tarea(
+    id_tarea: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.EjecucionPresupuestaria)
+        .where(models.EjecucionPresupuestaria.id_tarea == id_tarea)
+        .order_by(models.EjecucionPresupuestaria.fecha_ejecucion)
+    )
+    return result.scalars().all()
@@ -0,0 +1,188 @@
+from decimal import Decimal
+import uuid
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, schemas, lecturas, resumen
+from app.auditoria import Auditoria, get_auditoria, diferencias, valor_auditado
+from app.database import get_db
+from app.respuestas import respuesta_filas
+from app.auth import get_current_user
+
+# Proyectos, sus catálogos (tipos y estados), sus POAs y el resumen presupuestario.
+
+router = APIRouter(tags=["proyectos"])
+
+
+@router.post("/proyectos/", response_model=schemas.ProyectoOut)
+async def crear_proyecto(
+    data: schemas.ProyectoCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Validar existencia de tipo de proyecto
+    result = await db.execute(select(models.TipoProyecto).where(models.TipoProyecto.id_tipo_proyecto == data.id_tipo_proyecto))
+    if not result.scalars().first():
+        raise HTTPException(status_code=404, detail="Tipo de proyecto no encontrado")
+
+    # Validar existencia de estado de proyecto
+    result = await db.execute(select(models.EstadoProyecto).where(models.EstadoProyecto.id_estado_proyecto == data.id_estado_proyecto))
+    if not result.scalars().first():
+        raise HTTPException(status_code=404, detail="Estado de proyecto no encontrado")
+
+    nuevo = models.Proyecto(
+        id_proyecto=uuid.uuid4(),
+        codigo_proyecto=data.codigo_proyecto,
+        titulo=data.titulo,
+        id_tipo_proyecto=data.id_tipo_proyecto,
+        id_estado_proyecto=data.id_estado_proyecto,
+        id_director_proyecto=data.id_director_proyecto,
+        fecha_creacion=data.fecha_creacion,
+        fecha_inicio=data.fecha_inicio,
+        fecha_fin=data.fecha_fin,
+        fecha_prorroga=data.fecha_prorroga,
+        fecha_prorroga_inicio=data.fecha_prorroga_inicio,
+        fecha_prorroga_fin=data.fecha_prorroga_fin,
+        presupuesto_aprobado=data.presupuesto_aprobado
+    )
+
+    db.add(nuevo)
+    await db.commit()
+    await db.refresh(nuevo)
+    return nuevo
+
+@router.put("/proyectos/{id}", response_model=schemas.ProyectoOut)
+async def editar_proyecto(
+    id: uuid.UUID,
+    data: schemas.ProyectoCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user),
+    auditoria: Auditoria = Depends(get_auditoria)
+):
+    try:
+        result = await db.execute(select(models.Proyecto).where(models.Proyecto.id_proyecto == id))
+        proyecto = result.scalars().first()
+ 
+        if not proyecto:
+            raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+ 
+        # Validar tipo y estado
+        tipo = await db.execute(select(models.TipoProyecto).where(models.TipoProyecto.id_tipo_proyecto == data.id_tipo_proyecto))
+        if not tipo.scalars().first():
+            raise HTTPException(status_code=404, detail="Tipo de proyecto no encontrado")
+ 
+        estado = await db.execute(select(models.EstadoProyecto).where(models.EstadoProyecto.id_estado_proyecto == data.id_estado_proyecto))
+        if not estado.scalars().first():
+            raise HTTPException(status_code=404, detail="Estado de proyecto no encontrado")
+ 
+        # Campos a auditar
+        campos_auditar = [
+            "codigo_proyecto", "titulo", "id_tipo_proyecto", "id_estado_proyecto",
+            "fecha_creacion", "fecha_inicio", "fecha_fin", "fecha_prorroga",
+            "fecha_prorroga_inicio", "fecha_prorroga_fin", "presupuesto_aprobado",
+            "id_director_proyecto"
+        ]
+ 
+        for campo, valor_anterior, valor_nuevo in diferencias(proyecto, data, campos_auditar):
+            auditoria.cambio_proyecto(
+                proyecto.id_proyecto, campo,
+                valor_auditado(valor_anterior), valor_auditado(valor_nuevo),
+                "Actualización manual de proyecto"
+            )
+            setattr(proyecto, campo, valor_nuevo)
+ 
+        await auditoria.guardar(db)
+        await db.commit()
+        await db.refresh(proyecto)
+        return proyecto
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Error interno al editar el proyecto")
+
+
+@router.get("/proyectos/", response_model=List[schemas.ProyectoOut])
+async def listar_proyectos(
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.Proyecto)
+    )
+    proyectos = result.scalars().all()
+    return proyectos
+
+@router.get("/proyectos/{id}", response_model=schemas.ProyectoOut)
+async def obtener_proyecto(
+    id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.Proyecto).where(models.Proyecto.id_proyecto == id)
+    )
+    proyecto = result.scalars().first()
+
+    if not proyecto:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+
+    # if proyecto.id_director_proyecto != usuario.id_usuario:
+    #     raise HTTPException(status_code=403, detail="No tienes acceso a este proyecto")
+
+    return proyecto
+
+@router.get("/tipos-proyecto/", response_model=List[schemas.TipoProyectoOut])
+async def listar_tipos_proyecto(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.TipoProyecto))
+    return result.scalars().all()
+
+@router.get("/estados-proyecto/", response_model=List[schemas.EstadoProyectoOut])
+async def listar_estados_proyecto(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.EstadoProyecto))
+    return result.scalars().all()
+
+
+@router.get("/proyectos/{id_proyecto}/poas", response_model=List[schemas.PoaOut])
+async def obtener_poas_por_proyecto(
+    id_proyecto: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Verificar si el proyecto existe
+    result = await db.execute(select(models.Proyecto).where(models.Proyecto.id_proyecto == id_proyecto))
+    proyecto = result.scalars().first()
+    if not proyecto:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+
+    # Obtener los POAs asociados al proyecto
+    return respuesta_filas(schemas.PoaOut, await lecturas.poas(db, id_proyecto))
+
+@router.get("/proyectos/{id_proyecto}/resumen", response_model=schemas.ResumenProyectoOut)
+async def obtener_resumen_proyecto(
+    id_proyecto: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    if not await db.get(models.Proyecto, id_proyecto):
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+
+    # POAs sin resumen todavía (anteriores a la tabla): calcularlos una vez, como en /poas/{id}/resumen
+    if await resumen.completar_resumen_proyecto(db, id_proyecto):
+        await db.commit()
+
+    result = await db.execute(
+        select(models.ResumenPresupuestoPoa)
+        .where(models.ResumenPresupuestoPoa.id_proyecto == id_proyecto)
+        .order_by(models.ResumenPresupuestoPoa.anio_ejecucion)
+    )
+    poas = result.scalars().all()
+
+    return {
+        "id_proyecto": id_proyecto,
+        "presupuesto_asignado": sum((p.presupuesto_asignado for p in poas), Decimal("0")),
+        "total_actividades": sum((p.total_actividades for p in poas), Decimal("0")),
+        "total_programado": sum((p.total_programado for p in poas), Decimal("0")),
+        "total_certificado": sum((p.total_certificado for p in poas), Decimal("0")),
+        "total_ejecutado": sum((p.total_ejecutado for p in poas), Decimal("0")),
+        "poas": poas,
+    }
@@ -0,0 +1,365 @@
+from datetime import datetime
+import uuid
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, schemas, totales, resumen, reformas, snapshots, eventos
+from app.auditoria import Auditoria, get_auditoria
+from app.database import get_db
+from app.auth import get_current_user
+
+# Reformas del POA: solicitud, cambios propuestos, impacto y aprobación
+# (validación y aplicación en app/reformas.py).
+
+router = APIRouter(tags=["reformas"])
+
+
+@router.post("/poas/{id_poa}/reformas", response_model=schemas.ReformaPoaOut)
+async def crear_reforma_poa(
+    id_poa: uuid.UUID,
+    data: schemas.ReformaPoaCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Verificar que el POA exista
+    result = await db.execute(select(models.Poa).where(models.Poa.id_poa == id_poa))
+    poa = result.scalars().first()
+    if not poa:
+        raise HTTPException(status_code=404, detail="POA no encontrado")
+    
+    # Inicializar variables para logging
+    codigo_poa = poa.codigo_poa if poa else ""
+    proyecto_nombre = ""
+    if poa and poa.id_proyecto:
+        result = await db.execute(select(models.Proyecto).where(models.Proyecto.id_proyecto == poa.id_proyecto))
+        proyecto = result.scalars().first()
+        if proyecto:
+            proyecto_nombre = proyecto.titulo
+
+    # Validar que el usuario solicitante exista
+    result = await db.execute(select(models.Usuario).where(models.Usuario.id_usuario == usuario.id_usuario))
+    if not result.scalars().first():
+        raise HTTPException(status_code=403, detail="Usuario solicitante no válido")
+
+    # Validar que el monto solicitado sea positivo
+    if data.monto_solicitado <= 0:
+        raise HTTPException(status_code=400, detail="El monto solicitado debe ser mayor a 0")
+
+    # Validar que haya diferencia de montos
+    if data.monto_solicitado == poa.presupuesto_asignado:
+        raise HTTPException(status_code=400, detail="El monto solicitado debe ser diferente al monto actual del POA")
+
+    reforma = models.ReformaPoa(
+        id_reforma=uuid.uuid4(),
+        id_poa=id_poa,
+        fecha_solicitud=datetime.utcnow(),
+        estado_reforma="Solicitada",
+        monto_anterior=poa.presupuesto_asignado,
+        monto_solicitado=data.monto_solicitado,
+        justificacion=data.justificacion,
+        id_usuario_solicita=usuario.id_usuario
+    )
+
+    db.add(reforma)
+    # estado del POA al momento de solicitar la reforma
+    await snapshots.crear_snapshot(
+        db, id_poa, snapshots.MOMENTO_CREACION_REFORMA, usuario.id_usuario, reforma.id_reforma
+    )
+    await db.commit()
+    await db.refresh(reforma)
+    return reforma
+
+
+@router.put("/reformas/{id_reforma}/tareas/{id_tarea}")
+async def editar_tarea_en_reforma(
+    id_reforma: uuid.UUID,
+    id_tarea: uuid.UUID,
+    data: schemas.TareaEditReforma,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user),
+    auditoria: Auditoria = Depends(get_auditoria)
+):
+    tarea = await db.get(models.Tarea, id_tarea)
+    if not tarea:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+    reforma = await db.get(models.ReformaPoa, id_reforma)
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+
+    actividad = await db.get(models.Actividad, tarea.id_actividad)
+    if not actividad or actividad.id_poa != reforma.id_poa:
+        raise HTTPException(status_code=400, detail="Tarea no pertenece al POA de esta reforma")
+
+    cantidad_anterior = tarea.cantidad
+    precio_anterior = tarea.precio_unitario
+    total_anterior = tarea.total or 0
+
+    if data.cantidad is not None:
+        tarea.cantidad = data.cantidad
+    if data.precio_unitario is not None:
+        tarea.precio_unitario = data.precio_unitario
+    tarea.total = tarea.cantidad * tarea.precio_unitario
+    delta = tarea.total - total_anterior
+    tarea.saldo_disponible = models.Tarea.saldo_disponible + delta
+    if data.lineaPaiViiv is not None:
+        tarea.lineaPaiViiv = data.lineaPaiViiv
+
+    db.add(tarea)
+    await totales.ajustar_totales_actividad(db, actividad.id_actividad, delta)
+    await resumen.refrescar_resumen_poa(db, actividad.id_poa)
+
+    auditoria.cambio_poa(
+        actividad.id_poa, "Tarea",
+        f"Cantidad: {cantidad_anterior}, Precio: {precio_anterior}",
+        f"Cantidad: {tarea.cantidad}, Precio: {tarea.precio_unitario}",
+        data.justificacion, reforma.id_reforma
+    )
+    await auditoria.guardar(db)
+
+    await db.commit()
+    return {"msg": "Tarea actualizada correctamente"}
+
+
+@router.delete("/reformas/{id_reforma}/tareas/{id_tarea}")
+async def eliminar_tarea_en_reforma(
+    id_reforma: uuid.UUID,
+    id_tarea: uuid.UUID,
+    justificacion: str,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user),
+    auditoria: Auditoria = Depends(get_auditoria)
+):
+    tarea = await db.get(models.Tarea, id_tarea)
+    if not tarea:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+    reforma = await db.get(models.ReformaPoa, id_reforma)
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+
+    actividad = await db.get(models.Actividad, tarea.id_actividad)
+    poa = await db.get(models.Poa, actividad.id_poa)
+
+    if not poa or poa.id_poa != reforma.id_poa:
+        raise HTTPException(status_code=400, detail="Tarea no corresponde a reforma")
+
+    await totales.ajustar_totales_actividad(
+        db, actividad.id_actividad, -(tarea.total or 0), -(tarea.saldo_disponible or 0)
+    )
+    await db.delete(tarea)
+    await db.flush()
+    await resumen.refrescar_resumen_poa(db, poa.id_poa)
+
+    auditoria.cambio_poa(
+        poa.id_poa, "Tarea eliminada",
+        f"Tarea: {tarea.nombre} ({tarea.total})", "Eliminada",
+        justificacion, id_reforma
+    )
+    await auditoria.guardar(db)
+
+    await db.commit()
+    return {"msg": "Tarea eliminada correctamente"}
+
+
+@router.post("/reformas/{id_reforma}/actividades/{id_actividad}/tareas")
+async def agregar_tarea_en_reforma(
+    id_reforma: uuid.UUID,
+    id_actividad: uuid.UUID,
+    data: schemas.TareaCreateReforma,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user),
+    auditoria: Auditoria = Depends(get_auditoria)
+):
+    actividad = await db.get(models.Actividad, id_actividad)
+    if not actividad:
+        raise HTTPException(status_code=404, detail="Actividad no encontrada")
+
+    reforma = await db.get(models.ReformaPoa, id_reforma)
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+
+    poa = await db.get(models.Poa, actividad.id_poa)
+    if not poa or poa.id_poa != reforma.id_poa:
+        raise HTTPException(status_code=400, detail="Actividad no corresponde a reforma")
+
+    # Crear nueva tarea
+    total = data.cantidad * data.precio_unitario
+    nueva_tarea = models.Tarea(
+        id_tarea=uuid.uuid4(),
+        id_actividad=id_actividad,
+        id_detalle_tarea=data.id_detalle_tarea,
+        nombre=data.nombre,
+        detalle_descripcion=data.detalle_descripcion,
+        cantidad=data.cantidad,
+        precio_unitario=data.precio_unitario,
+        total=total,
+        saldo_disponible=total,
+        lineaPaiViiv=data.lineaPaiViiv
+    )
+    db.add(nueva_tarea)
+    await totales.ajustar_totales_actividad(db, id_actividad, total)
+    await resumen.refrescar_resumen_poa(db, poa.id_poa)
+
+    auditoria.cambio_poa(
+        poa.id_poa, "Tarea nueva",
+        None, f"Tarea: {data.nombre} - Total: {total}",
+        data.justificacion, id_reforma
+    )
+    await auditoria.guardar(db)
+
+    await db.commit()
+    return {"msg": "Tarea agregada correctamente"}
+
+
+@router.get("/poas/{id_poa}/reformas", response_model=List[schemas.ReformaOut])
+async def listar_reformas_por_poa(
+    id_poa: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.ReformaPoa).where(models.ReformaPoa.id_poa == id_poa)
+    )
+    return result.scalars().all()
+
+
+@router.get("/reformas/{id_reforma}", response_model=schemas.ReformaOut)
+async def obtener_reforma(
+    id_reforma: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    reforma = await db.get(models.ReformaPoa, id_reforma)
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+    return reforma
+
+@router.put("/reformas/{id_reforma}/cambios", response_model=schemas.ReformaCambiosOut)
+async def registrar_cambios_reforma(
+    id_reforma: uuid.UUID,
+    data: schemas.ReformaCambiosCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    """
+    Registra (o reemplaza) el conjunto de altas, ediciones y bajas de tareas de la reforma.
+    Se valida completo ahora y se aplica en una sola transacción al aprobar la reforma.
+    """
+    reforma = await db.get(models.ReformaPoa, id_reforma)
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+    if reforma.estado_reforma == reformas.ESTADO_APROBADA:
+        raise HTTPException(status_code=409, detail="La reforma ya fue aprobada")
+
+    plan = await reformas.validar_cambios(db, reforma, data)
+    if plan.errores:
+        raise HTTPException(status_code=400, detail=plan.errores)
+
+    reforma.cambios = data.model_dump(mode="json")
+    resumen_cambios = reformas.resumen_cambios(reforma, data, plan)
+    await db.commit()
+    return resumen_cambios
+
+
+@router.get("/reformas/{id_reforma}/cambios", response_model=schemas.ReformaCambiosCreate)
+async def obtener_cambios_reforma(
+    id_reforma: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    reforma = await db.get(models.ReformaPoa, id_reforma)
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+    if not reforma.cambios:
+        raise HTTPException(status_code=404, detail="La reforma no tiene cambios registrados")
+    return reforma.cambios
+
+
+@router.post("/reformas/{id_reforma}/aprobar")
+async def aprobar_reforma(
+    id_reforma: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user),
+    auditoria: Auditoria = Depends(get_auditoria)
+):
+    # # Validar rol (ejemplo: solo "Director de Investigación")
+    # rol = await db.get(models.Rol, usuario.id_rol)
+    # if rol.nombre_rol not in ["Director de Investigacion", "Administrador"]:
+    #     raise HTTPException(status_code=403, detail="No autorizado para aprobar reformas")
+
+    # Bloquear la reforma: dos aprobaciones simultáneas no pueden aplicar los cambios dos veces
+    result = await db.execute(
+        select(models.ReformaPoa).where(models.ReformaPoa.id_reforma == id_reforma).with_for_update()
+    )
+    reforma = result.scalars().first()
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+    if reforma.estado_reforma == reformas.ESTADO_APROBADA:
+        raise HTTPException(status_code=409, detail="La reforma ya fue aprobada")
+
+    if reforma.cambios:
+        # Se revalida con las tareas bloqueadas: el POA pudo cambiar desde el registro
+        cambios = schemas.ReformaCambiosCreate.model_validate(reforma.cambios)
+        plan = await reformas.validar_cambios(db, reforma, cambios, bloquear=True)
+        if plan.errores:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=plan.errores)
+        await reformas.aplicar_cambios(db, reforma, cambios, plan, auditoria)
+        await resumen.refrescar_resumen_poa(db, reforma.id_poa)
+
+    await snapshots.crear_snapshot(
+        db, reforma.id_poa, snapshots.MOMENTO_APROBACION_REFORMA, usuario.id_usuario, reforma.id_reforma
+    )
+
+    reforma.estado_reforma = reformas.ESTADO_APROBADA
+    reforma.fecha_aprobacion = datetime.now()
+    reforma.id_usuario_aprueba = usuario.id_usuario
+
+    db.add(reforma)
+    await db.commit()
+
+    await eventos.publicar(
+        eventos.REFORMA_APROBADA,
+        {"id_reforma": reforma.id_reforma, "id_poa": reforma.id_poa, "estado_reforma": reforma.estado_reforma},
+        reforma.id_usuario_solicita,
+    )
+    return {"msg": "Reforma aprobada exitosamente"}
+
+@router.get("/reformas/{id_reforma}/impacto")
+async def impacto_reforma(
+    id_reforma: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    """
+    Compara el POA al crear la reforma con el POA al aprobarla. Si aún no está
+    aprobada, compara contra el estado actual con los cambios pendientes simulados.
+    """
+    reforma = await db.get(models.ReformaPoa, id_reforma)
+    if not reforma:
+        raise HTTPException(status_code=404, detail="Reforma no encontrada")
+
+    result = await db.execute(
+        select(models.SnapshotPoa).where(models.SnapshotPoa.id_reforma == id_reforma)
+    )
+    por_momento = {snapshot.momento: snapshot for snapshot in result.scalars().all()}
+    creacion = por_momento.get(snapshots.MOMENTO_CREACION_REFORMA)
+    aprobacion = por_momento.get(snapshots.MOMENTO_APROBACION_REFORMA)
+
+    antes = snapshots.leer(creacion) if creacion else await snapshots.capturar_arbol(db, reforma.id_poa)
+    if aprobacion:
+        despues = snapshots.leer(aprobacion)
+    else:
+        despues = await snapshots.capturar_arbol(db, reforma.id_poa)
+        if reforma.cambios:
+            cambios = schemas.ReformaCambiosCreate.model_validate(reforma.cambios)
+            despues = snapshots.simular_cambios(despues, cambios)
+
+    return {
+        "id_reforma": reforma.id_reforma,
+        "estado_reforma": reforma.estado_reforma,
+        "simulado": aprobacion is None,
+        **snapshots.comparar(antes, despues),
+    }
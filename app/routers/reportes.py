@@ -0,0 +1,107 @@
+import importlib.util
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Form, Body, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, agregados, exportacion, eventos, reportes
+from app.database import get_db
+from app.respuestas import RespuestaORJSON
+from app.auth import get_current_user, get_current_user_sin_sesion
+
+# Reporte POA (JSON, Excel, PDF), totales agregados y exportación columnar para analítica.
+
+router = APIRouter(tags=["reportes"])
+
+
+@router.post("/reporte-poa/")
+async def reporte_poa(
+    anio: str = Form(...),
+    tipo_proyecto: str = Form(...),
+    db: AsyncSession = Depends(get_db)
+):
+    # Determinar códigos de tipo de proyecto
+    codigo_tipo = agregados.GRUPOS_TIPO_PROYECTO.get(tipo_proyecto)
+    if codigo_tipo is None:
+        raise HTTPException(status_code=400, detail="Tipo de proyecto no válido")
+
+    return RespuestaORJSON(await reportes.filas_reporte_poa(db, anio, codigo_tipo))
+
+
+@router.get("/reporte-poa/totales")
+async def reporte_poa_totales(
+    anio: Optional[List[str]] = Query(None),
+    tipo_proyecto: Optional[List[str]] = Query(None),
+    item_presupuestario: Optional[List[str]] = Query(None),
+    agrupar: List[str] = Query(agregados.DIMENSIONES_POR_DEFECTO),
+    modo: str = Query("rollup", pattern="^(rollup|cube)$"),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    """
+    Totales y programación mensual (12 meses) agrupados por año, tipo de proyecto,
+    ítem presupuestario y/o proyecto, con subtotales (rollup) o todas las combinaciones
+    (cube). tipo_proyecto acepta códigos (PIIF, PVIF, ...) o los grupos del reporte POA.
+    """
+    invalidas = [d for d in agrupar if d not in agregados.DIMENSIONES]
+    if invalidas or not agrupar or len(set(agrupar)) != len(agrupar):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Dimensiones no válidas; use sin repetir: {', '.join(agregados.DIMENSIONES)}"
+        )
+    resultado = await agregados.totales(
+        db, agrupar, modo, anios=anio, tipos_proyecto=tipo_proyecto, items=item_presupuestario
+    )
+    return RespuestaORJSON(resultado)
+
+
+@router.post("/reporte-poa/excel/")
+async def descargar_excel(
+    reporte: list = Body(...)
+):
+    return StreamingResponse(
+        reportes.excel(reporte),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": "attachment; filename=reporte-poa.xlsx"}
+    )
+
+@router.post("/reporte-poa/pdf/")
+async def descargar_pdf(
+    reporte: list = Body(...)
+):
+    return StreamingResponse(
+        reportes.pdf(reporte),
+        media_type="application/pdf",
+        headers={"Content-Disposition": "attachment; filename=reporte-poa.pdf"}
+    )
+
+
+@router.get("/exportar/{entidad}")
+async def exportar_datos_analitica(
+    entidad: str,
+    formato: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    anio: Optional[List[str]] = Query(None),
+    usuario: models.Usuario = Depends(get_current_user_sin_sesion)
+):
+    """
+    Exporta proyectos, poas, actividades, tareas o programacion_mensual en Parquet o
+    Arrow IPC (stream) con tipos decimales y de fecha; anio filtra por año del POA.
+    """
+    if entidad not in exportacion.ENTIDADES:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Entidad no válida; use: {', '.join(exportacion.ENTIDADES)}"
+        )
+    if importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(status_code=501, detail="Exportación no disponible: falta instalar pyarrow")
+
+    nombre = f"{entidad}.{exportacion.EXTENSIONES[formato]}"
+    contenido = eventos.publicar_al_terminar(
+        exportacion.exportar(entidad, formato, anio),
+        eventos.EXPORTACION_COMPLETADA, {"entidad": entidad, "formato": formato, "archivo": nombre},
+        usuario.id_usuario,
+    )
+    return StreamingResponse(
+        contenido,
+        media_type=exportacion.TIPOS_MEDIO[formato],
+        headers={"Content-Disposition": f"attachment; filename={nombre}"}
+    )
@@ -0,0 +1,531 @@
+from decimal import Decimal
+import uuid
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
+from app import models, schemas, totales, resumen, concurrencia, lecturas, presupuesto
+from app.auditoria import Auditoria, get_auditoria, diferencias, valor_auditado
+from app.database import get_db
+from app.respuestas import respuesta_filas
+from app.auth import get_current_user
+
+# Actividades, tareas (individuales y en lote), programación mensual e ítems
+# presupuestarios. Los totales de actividad se ajustan con app/totales.py.
+
+router = APIRouter(tags=["tareas"])
+
+
+#actividades
+@router.post("/poas/{id_poa}/actividades")
+async def crear_actividades_para_poa(
+    id_poa: uuid.UUID,
+    data: schemas.ActividadesBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Verificar existencia del POA
+    result = await db.execute(select(models.Poa).where(models.Poa.id_poa == id_poa))
+    poa = result.scalars().first()
+    if not poa:
+        raise HTTPException(status_code=404, detail="POA no encontrado")
+
+    actividades = [
+        models.Actividad(
+            id_actividad=uuid.uuid4(),
+            id_poa=id_poa,
+            descripcion_actividad=act.descripcion_actividad,
+            total_por_actividad=act.total_por_actividad,
+            saldo_actividad=act.saldo_actividad,
+        )
+        for act in data.actividades
+    ]
+
+    db.add_all(actividades)
+    await db.flush()
+    await resumen.refrescar_resumen_poa(db, id_poa)
+    await db.commit()
+
+    ids_creados = [str(act.id_actividad) for act in actividades]
+
+    return JSONResponse(
+        status_code=201,
+        content={
+            "msg": f"{len(actividades)} actividades creadas correctamente",
+            "ids_actividades": ids_creados,
+        }
+    )
+
+
+#tareas
+@router.post("/actividades/{id_actividad}/tareas", response_model=schemas.TareaOut)
+async def crear_tarea(
+    id_actividad: uuid.UUID,
+    data: schemas.TareaCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Verificar existencia de la actividad
+    result = await db.execute(select(models.Actividad.id_actividad).where(models.Actividad.id_actividad == id_actividad))
+    if not result.scalars().first():
+        raise HTTPException(status_code=404, detail="Actividad no encontrada")
+
+    # Verificar existencia del detalle de tarea
+    result = await db.execute(select(models.DetalleTarea).where(models.DetalleTarea.id_detalle_tarea == data.id_detalle_tarea))
+    detalle = result.scalars().first()
+    if not detalle:
+        raise HTTPException(status_code=404, detail="Detalle de tarea no encontrado")
+
+    cantidad = data.cantidad or Decimal("0")
+    precio_unitario = data.precio_unitario or Decimal("0")
+    total = precio_unitario * cantidad
+
+    nueva_tarea = models.Tarea(
+        id_tarea=uuid.uuid4(),
+        id_actividad=id_actividad,
+        id_detalle_tarea=data.id_detalle_tarea,
+        nombre=data.nombre,
+        detalle_descripcion=data.detalle_descripcion,
+        cantidad=cantidad,
+        precio_unitario=precio_unitario,
+        total=total,
+        saldo_disponible=total,
+        lineaPaiViiv=data.lineaPaiViiv
+    )
+
+    db.add(nueva_tarea)
+    # Actualizar montos en la actividad (UPDATE atómico en la base de datos)
+    id_poa = await totales.ajustar_totales_actividad(db, id_actividad, total)
+    await resumen.refrescar_resumen_poa(db, id_poa)
+    await db.commit()
+    await db.refresh(nueva_tarea)
+
+    return nueva_tarea
+
+
+# Máximo de filas por sentencia INSERT ... ON CONFLICT (límite de parámetros de PostgreSQL)
+TAMANO_LOTE_SQL = 1000
+
+@router.post("/tareas/lote", response_model=List[schemas.ResultadoLote])
+async def crear_tareas_lote(
+    data: schemas.TareasLoteCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    """
+    Crea varias tareas en una sola petición. Las actividades y detalles de tarea
+    se validan con una consulta IN cada uno y el resultado se informa por fila.
+    """
+    ids_actividad = {t.id_actividad for t in data.tareas}
+    ids_detalle = {t.id_detalle_tarea for t in data.tareas if t.id_detalle_tarea}
+
+    result = await db.execute(
+        select(models.Actividad.id_actividad).where(models.Actividad.id_actividad.in_(ids_actividad))
+    )
+    actividades = set(result.scalars().all())
+
+    detalles = set()
+    if ids_detalle:
+        result = await db.execute(
+            select(models.DetalleTarea.id_detalle_tarea)
+            .where(models.DetalleTarea.id_detalle_tarea.in_(ids_detalle))
+        )
+        detalles = set(result.scalars().all())
+
+    resultados = []
+    nuevas_tareas = []
+    deltas = {}
+    for indice, tarea in enumerate(data.tareas):
+        if tarea.id_actividad not in actividades:
+            resultados.append(schemas.ResultadoLote(indice=indice, ok=False, error="Actividad no encontrada"))
+            continue
+        if tarea.id_detalle_tarea not in detalles:
+            resultados.append(schemas.ResultadoLote(indice=indice, ok=False, error="Detalle de tarea no encontrado"))
+            continue
+
+        cantidad = tarea.cantidad or Decimal("0")
+        precio_unitario = tarea.precio_unitario or Decimal("0")
+        total = precio_unitario * cantidad
+
+        id_tarea = uuid.uuid4()
+        nuevas_tareas.append({
+            "id_tarea": id_tarea,
+            "id_actividad": tarea.id_actividad,
+            "id_detalle_tarea": tarea.id_detalle_tarea,
+            "nombre": tarea.nombre,
+            "detalle_descripcion": tarea.detalle_descripcion,
+            "cantidad": cantidad,
+            "precio_unitario": precio_unitario,
+            "total": total,
+            "saldo_disponible": total,
+            "lineaPaiViiv": tarea.lineaPaiViiv,
+        })
+
+        # Acumular montos por actividad para actualizarlos en una sola sentencia
+        deltas[tarea.id_actividad] = deltas.get(tarea.id_actividad, Decimal("0")) + total
+
+        resultados.append(schemas.ResultadoLote(indice=indice, ok=True, id=id_tarea, accion="creada"))
+
+    if nuevas_tareas:
+        # Un solo INSERT de varias filas en lugar de un INSERT por tarea
+        await db.execute(insert(models.Tarea), nuevas_tareas)
+        ids_poa = await totales.ajustar_totales_actividades(
+            db, {id_act: (delta, delta) for id_act, delta in deltas.items()}
+        )
+        await resumen.refrescar_resumen_poa(db, *ids_poa)
+        await db.commit()
+
+    return resultados
+
+
+@router.delete("/tareas/{id_tarea}")
+async def eliminar_tarea(id_tarea: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.Tarea).where(models.Tarea.id_tarea == id_tarea))
+    tarea = result.scalars().first()
+    if not tarea:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+    
+    id_poa = await totales.ajustar_totales_actividad(
+        db, tarea.id_actividad, -(tarea.total or 0), -(tarea.saldo_disponible or 0)
+    )
+    await db.delete(tarea)
+    await db.flush()
+    await resumen.refrescar_resumen_poa(db, id_poa)
+    await db.commit()
+    return {"msg": "Tarea eliminada correctamente"}
+
+
+@router.put("/tareas/{id_tarea}")
+async def editar_tarea(
+    id_tarea: uuid.UUID,
+    data: schemas.TareaUpdate,
+    response: Response,
+    version: Optional[int] = Depends(concurrencia.version_esperada),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user),
+    auditoria: Auditoria = Depends(get_auditoria)
+):
+    try:
+        # Obtener la tarea
+        result = await db.execute(
+            select(models.Tarea).where(models.Tarea.id_tarea == id_tarea)
+        )
+        tarea = result.scalars().first()
+ 
+        if not tarea:
+            raise HTTPException(status_code=404, detail="Tarea no encontrada")
+        concurrencia.verificar_version(tarea, version)
+ 
+        # Obtener la actividad relacionada
+        result_actividad = await db.execute(
+            select(models.Actividad).where(models.Actividad.id_actividad == tarea.id_actividad)
+        )
+        actividad = result_actividad.scalars().first()
+        if not actividad:
+            raise HTTPException(status_code=404, detail="Actividad no encontrada")
+ 
+        id_poa = actividad.id_poa
+ 
+        # Campos a auditar
+        campos_auditar = ["cantidad", "precio_unitario", "lineaPaiViiv"]
+ 
+        for campo, valor_anterior, valor_nuevo in diferencias(tarea, data, campos_auditar):
+            auditoria.cambio_poa(
+                id_poa, campo,
+                valor_auditado(valor_anterior), valor_auditado(valor_nuevo),
+                "Actualización manual de tarea"
+            )
+            setattr(tarea, campo, valor_nuevo)
+ 
+        # Recalcular el total de la tarea y propagar la diferencia a la actividad
+        nuevo_total = tarea.cantidad * tarea.precio_unitario
+        delta = nuevo_total - (tarea.total or 0)
+        if delta:
+            tarea.total = nuevo_total
+            if not await presupuesto.ajustar_saldo_tarea(db, tarea.id_tarea, delta):
+                raise HTTPException(
+                    status_code=409,
+                    detail="El nuevo total de la tarea es menor que lo ya certificado o ejecutado"
+                )
+            await totales.ajustar_totales_actividad(db, actividad.id_actividad, delta)
+            await resumen.refrescar_resumen_poa(db, id_poa)
+
+        await auditoria.guardar(db)
+        await db.commit()
+        await db.refresh(tarea)
+ 
+        response.headers["ETag"] = concurrencia.etag(tarea.version)
+        return {"msg": "Tarea actualizada", "tarea": tarea}
+ 
+    except HTTPException:
+        await db.rollback()
+        raise
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=concurrencia.MENSAJE_CONFLICTO)
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Error interno al editar la tarea")
+
+
+#actividades por poa
+@router.get("/poas/{id_poa}/actividades", response_model=List[schemas.ActividadOut])
+async def obtener_actividades_de_poa(
+    id_poa: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    actividades = await lecturas.actividades_de_poa(db, id_poa)
+
+    etag = concurrencia.etag_coleccion((a.id_actividad, a.version) for a in actividades)
+    no_modificado = concurrencia.no_modificado(request, etag)
+    if no_modificado:
+        return no_modificado
+    return respuesta_filas(schemas.ActividadOut, actividades, headers={"ETag": etag})
+
+
+@router.delete("/actividades/{id_actividad}")
+async def eliminar_actividad(id_actividad: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.Actividad).where(models.Actividad.id_actividad == id_actividad))
+    actividad = result.scalars().first()
+    if not actividad:
+        raise HTTPException(status_code=404, detail="Actividad no encontrada")
+    
+    await db.delete(actividad)
+    await db.flush()
+    await resumen.refrescar_resumen_poa(db, actividad.id_poa)
+    await db.commit()
+    return {"msg": "Actividad eliminada correctamente"}
+
+
+#tareas por actividad
+@router.get("/actividades/{id_actividad}/tareas", response_model=List[schemas.TareaOut])
+async def obtener_tareas_de_actividad(
+    id_actividad: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    tareas = await lecturas.tareas_de_actividad(db, id_actividad)
+
+    etag = concurrencia.etag_coleccion((t.id_tarea, t.version) for t in tareas)
+    no_modificado = concurrencia.no_modificado(request, etag)
+    if no_modificado:
+        return no_modificado
+    return respuesta_filas(schemas.TareaOut, tareas, headers={"ETag": etag})
+
+
+#editar actividad
+@router.put("/actividades/{id_actividad}", response_model=schemas.ActividadOut)
+async def editar_actividad(
+    id_actividad: uuid.UUID,
+    data: schemas.ActividadUpdate,
+    response: Response,
+    version: Optional[int] = Depends(concurrencia.version_esperada),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.Actividad).where(models.Actividad.id_actividad == id_actividad)
+    )
+    actividad = result.scalars().first()
+    if not actividad:
+        raise HTTPException(status_code=404, detail="Actividad no encontrada")
+    concurrencia.verificar_version(actividad, version)
+
+    actividad.descripcion_actividad = data.descripcion_actividad
+    await db.commit()
+    await db.refresh(actividad)
+
+    response.headers["ETag"] = concurrencia.etag(actividad.version)
+    return actividad
+
+@router.post("/actividades/reconciliar-totales", response_model=schemas.ReconciliacionTotalesOut)
+async def reconciliar_totales_actividades(
+    id_poa: uuid.UUID = Query(None),
+    reparar: bool = Query(True),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(select(models.Rol).where(models.Rol.id_rol == usuario.id_rol))
+    rol = result.scalars().first()
+    if not rol or rol.nombre_rol not in ["Administrador", "Director de Investigacion"]:
+        raise HTTPException(status_code=403, detail="No tienes permisos para reconciliar totales")
+
+    diferencias = await totales.reconciliar_totales_actividad(db, id_poa=id_poa, reparar=reparar)
+    if reparar and diferencias:
+        await resumen.refrescar_resumen_poa(db, *{dif["id_poa"] for dif in diferencias})
+    await db.commit()
+    return {"reparado": reparar, "diferencias": diferencias}
+    
+@router.get("/item-presupuestario/{id_item}", response_model=schemas.ItemPresupuestarioOut)
+async def get_item_presupuestario(
+    id_item: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    print(f"ID Item: {id_item}")
+    result = await db.execute(select(models.ItemPresupuestario).where(models.ItemPresupuestario.id_item_presupuestario == id_item))
+    item = result.scalars().first()
+    if not item:
+        raise HTTPException(status_code=404, detail="Item presupuestario no encontrado")
+    return item
+
+@router.get("/tareas/{id_tarea}/item-presupuestario", response_model=schemas.ItemPresupuestarioOut)
+async def obtener_item_presupuestario_de_tarea(
+    id_tarea: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    # Buscar la tarea y su detalle
+    result = await db.execute(
+        select(models.Tarea)
+        .where(models.Tarea.id_tarea == id_tarea)
+        .options(selectinload(models.Tarea.detalle_tarea).selectinload(models.DetalleTarea.item_presupuestario))
+    )
+    tarea = result.scalars().first()
+
+    if not tarea:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+    if not tarea.detalle_tarea or not tarea.detalle_tarea.item_presupuestario:
+        raise HTTPException(status_code=404, detail="Item presupuestario no asociado a esta tarea")
+
+    return tarea.detalle_tarea.item_presupuestario
+    
+# programacion mensual
+@router.post("/programacion-mensual", response_model=schemas.ProgramacionMensualOut)
+async def crear_programacion_mensual(
+    data: schemas.ProgramacionMensualCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    nueva = models.ProgramacionMensual(**data.dict())
+    db.add(nueva)
+    try:
+        await db.flush()
+        await resumen.refrescar_resumen_de_tareas(db, data.id_tarea)
+        await db.commit()
+        await db.refresh(nueva)
+        return nueva
+    except Exception:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Ya existe programación para ese mes y tarea.")
+
+@router.post("/programacion-mensual/lote", response_model=List[schemas.ResultadoLote])
+async def crear_programacion_mensual_lote(
+    data: schemas.ProgramacionMensualLoteCreate,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    """
+    Inserta o actualiza filas (id_tarea, mes, valor) en bloque usando la
+    restricción uq_tarea_mes con ON CONFLICT. Devuelve el resultado de cada fila.
+    """
+    ids_tarea = {p.id_tarea for p in data.programaciones}
+    result = await db.execute(
+        select(models.Tarea.id_tarea, models.Actividad.id_poa)
+        .join(models.Actividad, models.Actividad.id_actividad == models.Tarea.id_actividad)
+        .where(models.Tarea.id_tarea.in_(ids_tarea))
+    )
+    poa_por_tarea = {fila.id_tarea: fila.id_poa for fila in result.all()}
+    tareas_existentes = set(poa_por_tarea)
+
+    resultados: list = [None] * len(data.programaciones)
+    filas = []
+    indice_por_clave = {}
+    for indice, prog in enumerate(data.programaciones):
+        clave = (prog.id_tarea, prog.mes)
+        if prog.id_tarea not in tareas_existentes:
+            resultados[indice] = schemas.ResultadoLote(indice=indice, ok=False, error="Tarea no encontrada")
+        elif clave in indice_por_clave:
+            # ON CONFLICT no permite tocar la misma fila dos veces en una sentencia
+            resultados[indice] = schemas.ResultadoLote(
+                indice=indice, ok=False,
+                error=f"Fila duplicada en el lote: misma tarea y mes que la fila {indice_por_clave[clave]}"
+            )
+        else:
+            indice_por_clave[clave] = indice
+            filas.append({
+                "id_programacion": uuid.uuid4(),
+                "id_tarea": prog.id_tarea,
+                "mes": prog.mes,
+                "valor": prog.valor,
+            })
+
+    for inicio in range(0, len(filas), TAMANO_LOTE_SQL):
+        stmt = pg_insert(models.ProgramacionMensual).values(filas[inicio:inicio + TAMANO_LOTE_SQL])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_tarea_mes",
+            set_={"valor": stmt.excluded.valor, "version": models.ProgramacionMensual.version + 1},
+        ).returning(
+            models.ProgramacionMensual.id_programacion,
+            models.ProgramacionMensual.id_tarea,
+            models.ProgramacionMensual.mes,
+            # xmax = 0 solo en filas recién insertadas (no en las actualizadas)
+            literal_column("(xmax = 0)").label("insertada"),
+        )
+        result = await db.execute(stmt)
+        for fila in result.all():
+            indice = indice_por_clave[(fila.id_tarea, fila.mes)]
+            resultados[indice] = schemas.ResultadoLote(
+                indice=indice, ok=True, id=fila.id_programacion,
+                accion="insertada" if fila.insertada else "actualizada"
+            )
+
+    await resumen.refrescar_resumen_poa(db, *{poa_por_tarea[fila["id_tarea"]] for fila in filas})
+    await db.commit()
+    return resultados
+
+@router.put("/programacion-mensual/{id_programacion}", response_model=schemas.ProgramacionMensualOut)
+async def actualizar_programacion_mensual(
+    id_programacion: uuid.UUID,
+    data: schemas.ProgramacionMensualUpdate,
+    response: Response,
+    version: Optional[int] = Depends(concurrencia.version_esperada),
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    result = await db.execute(
+        select(models.ProgramacionMensual).where(models.ProgramacionMensual.id_programacion == id_programacion)
+    )
+    programacion = result.scalars().first()
+    if not programacion:
+        raise HTTPException(status_code=404, detail="Programación no encontrada")
+    concurrencia.verificar_version(programacion, version)
+
+    programacion.valor = data.valor
+    await db.flush()
+    await resumen.refrescar_resumen_de_tareas(db, programacion.id_tarea)
+    await db.commit()
+    await db.refresh(programacion)
+    response.headers["ETag"] = concurrencia.etag(programacion.version)
+    return programacion
+
+@router.get("/tareas/{id_tarea}/programacion-mensual", response_model=List[schemas.ProgramacionMensualOut])
+async def obtener_programacion_por_tarea(
+    id_tarea: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    usuario: models.Usuario = Depends(get_current_user)
+):
+    # Verificar que la tarea exista
+    result = await db.execute(select(models.Tarea).where(models.Tarea.id_tarea == id_tarea))
+    tarea = result.scalars().first()
+    if not tarea:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+    result = await db.execute(
+        select(models.ProgramacionMensual).where(models.ProgramacionMensual.id_tarea == id_tarea)
+    )
+    programaciones = result.scalars().all()
+
+    etag = concurrencia.etag_coleccion((p.id_programacion, p.version) for p in programaciones)
+    no_modificado = concurrencia.no_modificado(request, etag)
+    if no_modificado:
+        return no_modificado
+    return respuesta_filas(schemas.ProgramacionMensualOut, programaciones, headers={"ETag": etag})
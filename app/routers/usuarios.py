@@ -0,0 +1,72 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import models, schemas, auth
+from app.database import get_db
+from app.auth import get_current_user
+
+# Inicio de sesión, perfil, registro de usuarios y catálogo de roles.
+
+router = APIRouter(tags=["usuarios"])
+
+
+@router.post("/login", response_model=schemas.Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
+):
+    result = await db.execute(
+        select(models.Usuario).filter(models.Usuario.email == form_data.username)
+    )
+    usuario = result.scalars().first()
+    if not usuario or not auth.verificar_password(
+        form_data.password, usuario.password_hash
+    ):
+        raise HTTPException(status_code=401, detail="Credenciales inválidas")
+
+    if not usuario.activo:
+        raise HTTPException(status_code=403, detail="Usuario inactivo")
+
+    access_token = auth.crear_token_acceso(
+        data={"sub": str(usuario.id_usuario), "id_rol": str(usuario.id_rol)}
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+#Usar para validar el usuario
+@router.get("/perfil")
+async def perfil_usuario(usuario: models.Usuario = Depends(get_current_user)):
+    return {
+        "id": usuario.id_usuario,
+        "nombre": usuario.nombre_usuario,
+        "rol": usuario.id_rol,
+    }
+
+
+@router.post("/register", response_model=schemas.UserOut)
+async def register_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        select(models.Usuario).where(models.Usuario.email == user.email)
+    )
+    existing_user = result.scalars().first()
+    if existing_user:
+        raise HTTPException(status_code=400, detail="El correo ya está registrado")
+    hashed_final = auth.pwd_context.hash(user.password)
+
+    nuevo_usuario = models.Usuario(
+        nombre_usuario=user.nombre_usuario,
+        email=user.email,
+        password_hash=hashed_final,
+        id_rol=user.id_rol,
+        activo=True,
+    )
+
+    db.add(nuevo_usuario)
+    await db.commit()
+    await db.refresh(nuevo_usuario)
+    return nuevo_usuario
+
+@router.get("/roles/", response_model=List[schemas.RolOut])
+async def listar_roles(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.Rol))
+    return result.scalars().all()
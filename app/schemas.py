@@ -8,6 +8,10 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+class TicketEventos(BaseModel):
+    ticket: str
+    expira_en: int  # segundos
+
 class UserCreate(BaseModel):
     nombre_usuario: str
     email: str
@@ -54,6 +58,7 @@ class PoaOut(PoaCreate):
     id_poa: UUID
     fecha_creacion: datetime
     id_estado_poa: UUID
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -168,10 +173,25 @@ class TareaOut(BaseModel):
     total: Optional[condecimal(ge=0)] = 0
     saldo_disponible: Optional[condecimal(ge=0)] = 0
     lineaPaiViiv: Optional[int] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
 
+# carga por lotes
+class TareaLoteCreate(TareaCreate):
+    id_actividad: UUID
+
+class TareasLoteCreate(BaseModel):
+    tareas: List[TareaLoteCreate]
+
+class ResultadoLote(BaseModel):
+    indice: int               # posición de la fila en el lote recibido
+    ok: bool
+    id: Optional[UUID] = None
+    accion: Optional[str] = None  # "creada", "insertada" o "actualizada"
+    error: Optional[str] = None
+
 
 class DetalleTareaOut(BaseModel):
     id_detalle_tarea: UUID
@@ -189,6 +209,7 @@ class ActividadOut(BaseModel):
     total_por_actividad: condecimal(max_digits=18, decimal_places=2)
     saldo_actividad: condecimal(max_digits=18, decimal_places=2)
     lineaPaiViiv: Optional[int] = None  # ← nuevo campo
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -196,6 +217,18 @@ class ActividadOut(BaseModel):
 class ActividadUpdate(BaseModel):
     descripcion_actividad: str
 
+class DiferenciaTotalActividad(BaseModel):
+    id_actividad: UUID
+    id_poa: UUID
+    total_registrado: Decimal
+    total_calculado: Decimal
+    saldo_registrado: Decimal
+    saldo_calculado: Decimal
+
+class ReconciliacionTotalesOut(BaseModel):
+    reparado: bool
+    diferencias: List[DiferenciaTotalActividad]
+
 class TareaOut(BaseModel):
     id_tarea: UUID
     nombre: Optional[str] = None
@@ -205,6 +238,7 @@ class TareaOut(BaseModel):
     total: Optional[condecimal(ge=0)] = 0
     saldo_disponible: Optional[condecimal(ge=0)] = 0
     lineaPaiViiv: Optional[int] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -252,6 +286,51 @@ class TareaEditReforma(BaseModel):
     justificacion: str
     lineaPaiViiv: Optional[int] = None
 
+# Conjunto de cambios de una reforma: se valida al registrarlo y se aplica completo al aprobarla
+class CambioTareaNueva(BaseModel):
+    id_actividad: UUID
+    id_detalle_tarea: UUID
+    nombre: Optional[str] = None
+    detalle_descripcion: Optional[str] = None
+    cantidad: condecimal(gt=0)
+    precio_unitario: condecimal(gt=0)
+    lineaPaiViiv: Optional[int] = None
+
+class CambioTareaEdicion(BaseModel):
+    id_tarea: UUID
+    cantidad: Optional[condecimal(gt=0)] = None
+    precio_unitario: Optional[condecimal(gt=0)] = None
+    lineaPaiViiv: Optional[int] = None
+
+class ReformaCambiosCreate(BaseModel):
+    agregar: List[CambioTareaNueva] = []
+    editar: List[CambioTareaEdicion] = []
+    eliminar: List[UUID] = []
+    justificacion: constr(min_length=10, max_length=500)
+
+class ReformaCambiosOut(BaseModel):
+    id_reforma: UUID
+    estado_reforma: str
+    tareas_agregadas: int
+    tareas_editadas: int
+    tareas_eliminadas: int
+    variacion_total: Decimal      # diferencia neta en el total de las actividades del POA
+    total_resultante: Decimal     # total de actividades del POA tras aplicar los cambios
+
+class SnapshotPoaOut(BaseModel):
+    id_snapshot: UUID
+    id_poa: UUID
+    id_reforma: Optional[UUID] = None
+    momento: str
+    fecha_creacion: datetime
+    id_usuario: UUID
+    total_actividades: Decimal
+    cantidad_tareas: int
+    huella: str
+
+    class Config:
+        from_attributes = True
+
 class HistoricoPoaOut(BaseModel):
     campo_modificado: str
     valor_anterior: Optional[str]
@@ -276,6 +355,79 @@ class ReformaOut(BaseModel):
     class Config:
         orm_mode = True
 
+class ResumenPoaOut(BaseModel):
+    id_poa: UUID
+    id_proyecto: UUID
+    anio_ejecucion: str
+    presupuesto_asignado: Decimal
+    total_actividades: Decimal
+    saldo_actividades: Decimal
+    total_programado: Decimal
+    programado_mensual: dict
+    total_certificado: Decimal
+    total_comprometido: Decimal
+    total_devengado: Decimal
+    total_ejecutado: Decimal
+    fecha_actualizacion: datetime
+
+    class Config:
+        from_attributes = True
+
+class ResumenProyectoOut(BaseModel):
+    id_proyecto: UUID
+    presupuesto_asignado: Decimal
+    total_actividades: Decimal
+    total_programado: Decimal
+    total_certificado: Decimal
+    total_ejecutado: Decimal
+    poas: List[ResumenPoaOut]
+
+#control y ejecucion presupuestaria
+class CertificacionCreate(BaseModel):
+    monto: condecimal(gt=0, max_digits=18, decimal_places=2)
+    justificacion: Optional[constr(max_length=500)] = None
+    referencia_documento: Optional[constr(max_length=100)] = None
+    id_reforma: Optional[UUID] = None
+
+class MovimientoPresupuestario(BaseModel):
+    monto: condecimal(gt=0, max_digits=18, decimal_places=2)
+
+class EjecucionCreate(BaseModel):
+    monto: condecimal(gt=0, max_digits=18, decimal_places=2)
+    descripcion_ejecucion: Optional[constr(max_length=500)] = None
+    referencia_documento: Optional[constr(max_length=100)] = None
+    id_control_presupuestario: Optional[UUID] = None
+
+class ControlPresupuestarioOut(BaseModel):
+    id_control: UUID
+    id_poa: UUID
+    id_tarea: UUID
+    fecha_registro: datetime
+    monto_certificado: Decimal
+    monto_comprometido: Decimal
+    monto_devengado: Decimal
+    saldo_disponible: Decimal
+    id_reforma: Optional[UUID] = None
+    justificacion: Optional[str] = None
+    referencia_documento: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class EjecucionPresupuestariaOut(BaseModel):
+    id_ejecucion: UUID
+    id_tarea: UUID
+    id_poa: UUID
+    monto_ejecutado: Decimal
+    fecha_ejecucion: datetime
+    descripcion_ejecucion: Optional[str] = None
+    referencia_documento: Optional[str] = None
+    bloqueado: bool
+    id_control_presupuestario: Optional[UUID] = None
+
+    class Config:
+        from_attributes = True
+
 class ItemPresupuestarioOut(BaseModel):
     id_item_presupuestario: UUID
     codigo: str
@@ -292,12 +444,16 @@ class ProgramacionMensualBase(BaseModel):
 class ProgramacionMensualCreate(ProgramacionMensualBase):
     id_tarea: UUID
 
+class ProgramacionMensualLoteCreate(BaseModel):
+    programaciones: List[ProgramacionMensualCreate]
+
 class ProgramacionMensualUpdate(BaseModel):
     valor: Decimal
 
 class ProgramacionMensualOut(ProgramacionMensualBase):
     id_programacion: UUID
     id_tarea: UUID
+    version: Optional[int] = None
 
     class Config:
         orm_mode = True
\ No newline at end of file
@@ -0,0 +1,47 @@
+# Uso: python -m app.scripts.archivar_particiones [--simular] [--conservar] [--anios N] [--directorio RUTA]
+import argparse
+import asyncio
+from pathlib import Path
+from app.database import engine
+from app.particiones import (
+    asegurar_particiones,
+    particiones_vencidas,
+    archivar_particion,
+    RETENCION_AUDITORIA_ANIOS,
+    DIRECTORIO_ARCHIVO_AUDITORIA,
+)
+
+
+# Crea las particiones de los próximos años y archiva las que superan la retención.
+# Pensado para ejecutarse de forma programada (cron) fuera del proceso de la API.
+async def archivar_particiones(anios_retencion: int, directorio: Path, simular: bool = False, conservar: bool = False):
+    async with engine.begin() as conn:
+        creadas = await asegurar_particiones(conn)
+        vencidas = await particiones_vencidas(conn, anios_retencion)
+
+    for particion in creadas:
+        print(f"✅ Partición creada: {particion}")
+
+    if simular:
+        for tabla, particion, anio in vencidas:
+            print(f"Se archivaría {particion} ({tabla}, año {anio})")
+        print(f"✅ {len(vencidas)} particiones por archivar.")
+        return vencidas
+
+    # una transacción por partición: un fallo no deshace lo ya archivado
+    for tabla, particion, anio in vencidas:
+        async with engine.begin() as conn:
+            ruta = await archivar_particion(conn, tabla, particion, directorio, conservar)
+        print(f"✅ {particion} archivada en {ruta}")
+    print(f"✅ {len(vencidas)} particiones archivadas.")
+    return vencidas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archiva particiones antiguas de auditoría y logs")
+    parser.add_argument("--anios", type=int, default=RETENCION_AUDITORIA_ANIOS, help="Años completos que se conservan")
+    parser.add_argument("--directorio", default=DIRECTORIO_ARCHIVO_AUDITORIA, help="Destino de los archivos .csv.gz")
+    parser.add_argument("--simular", action="store_true", help="Solo lista las particiones a archivar")
+    parser.add_argument("--conservar", action="store_true", help="Separa las particiones sin eliminarlas")
+    args = parser.parse_args()
+    asyncio.run(archivar_particiones(args.anios, Path(args.directorio), args.simular, args.conservar))
@@ -0,0 +1,373 @@
+# Catálogos iniciales del sistema. Los usa seed_all_data (init_data.py) y los generadores
+# de benchmarks/. Este módulo no importa la base de datos.
+
+ROLES = [
+    {"nombre_rol": "Administrador", "descripcion": "Acceso completo al sistema"},
+    {"nombre_rol": "Director de Investigacion", "descripcion": "Director de investigacion con permisos para gestionar proyectos y POAs"},
+    {"nombre_rol": "Director de Proyecto", "descripcion": "Director de proyecto con permisos para gestionar POAs"},
+    {"nombre_rol": "Director de reformas", "descripcion": "Usuario encargado de aprobación de presupuestos y reformas"},
+]
+
+PERMISOS = [
+    {"codigo": "PROY_CREATE", "desc": "Crear proyectos", "modulo": "Proyectos", "accion": "Crear"},
+    {"codigo": "PROY_READ", "desc": "Ver proyectos", "modulo": "Proyectos", "accion": "Leer"},
+    {"codigo": "PROY_UPDATE", "desc": "Modificar proyectos", "modulo": "Proyectos", "accion": "Actualizar"},
+    {"codigo": "PROY_DELETE", "desc": "Eliminar proyectos", "modulo": "Proyectos", "accion": "Eliminar"},
+    {"codigo": "POA_CREATE", "desc": "Crear POAs", "modulo": "POA", "accion": "Crear"},
+    {"codigo": "POA_READ", "desc": "Ver POAs", "modulo": "POA", "accion": "Leer"},
+    {"codigo": "POA_UPDATE", "desc": "Modificar POAs", "modulo": "POA", "accion": "Actualizar"},
+    {"codigo": "POA_DELETE", "desc": "Eliminar POAs", "modulo": "POA", "accion": "Eliminar"},
+    {"codigo": "REFORM_APPROVE", "desc": "Aprobar reformas", "modulo": "Reformas", "accion": "Aprobar"},
+    {"codigo": "BUDGET_EXEC", "desc": "Registrar ejecución presupuestaria", "modulo": "Presupuesto", "accion": "Ejecutar"},
+]
+
+TIPOS_POA = [
+    {"codigo": "PIIF", "nombre": "Interno con financiamiento", "desc": "Proyectos internos que requieren cierto monto de dinero", "duracion": 12, "periodos": 1, "presupuesto": 6000},
+    {"codigo": "PIS", "nombre": "Semilla con financiamiento", "desc": "Proyectos semilla que requieren cierto monto de dinero", "duracion": 18, "periodos": 2, "presupuesto": 15000},
+    {"codigo": "PIGR", "nombre": "Grupales", "desc": "Proyectos grupales que requieren cierto monto de dinero", "duracion": 24, "periodos": 2, "presupuesto": 60000},
+    {"codigo": "PIM", "nombre": "Multidisciplinarios", "desc": "Proyectos que incluyen varias disciplinas que requieren cierto monto de dinero", "duracion": 36, "periodos": 3, "presupuesto": 120000},
+    {"codigo": "PVIF", "nombre": "Vinculación con financiaminento", "desc": "Proyectos de vinculación con la sociedad que requieren cierto monto de dinero", "duracion": 18, "periodos": 2, "presupuesto": 6000},
+    {"codigo": "PTT", "nombre": "Transferencia tecnológica", "desc": "Proyectos de transferencia tecnológica y uso de equipamiento", "duracion": 18, "periodos": 2, "presupuesto": 15000},
+    {"codigo": "PVIS", "nombre": "Vinculación sin financiaminento", "desc": "Proyectos de vinculación con la sociedad sin necesidad de dinero", "duracion": 12, "periodos": 1, "presupuesto": 0},
+]
+
+ESTADOS_PROYECTO = [
+    {"nombre": "Aprobado", "desc": "El proyecto ha sido revisado y validado por las instancias correspondientes, y está autorizado para iniciar su ejecución.", "edita": True},
+    {"nombre": "En Ejecución", "desc": "El proyecto está actualmente en desarrollo, cumpliendo con las actividades planificadas dentro de los plazos establecidos.", "edita": True},
+    {"nombre": "En Ejecución-Prorroga técnica", "desc": "El proyecto sigue en ejecución, pero se le ha otorgado una extensión de tiempo debido a causas justificadas de tipo técnico.", "edita": True},
+    {"nombre": "Suspendido", "desc": "La ejecución del proyecto ha sido detenida temporalmente por motivos administrativos, financieros o técnicos, y está a la espera de una resolución.", "edita": False},
+    {"nombre": "Cerrado", "desc": "El proyecto ha finalizado completamente, cumpliendo con los objetivos y requisitos establecidos sin observaciones relevantes.", "edita": False},
+    {"nombre": "Cerrado con Observaciones", "desc": "El proyecto fue finalizado, pero durante su ejecución se identificaron observaciones menores que no comprometieron gravemente sus resultados.", "edita": False},
+    {"nombre": "Cerrado con Incumplimiento", "desc": "El proyecto fue finalizado, pero no cumplió con los objetivos, metas o requerimientos establecidos, y presenta fallas sustanciales.", "edita": False},
+    {"nombre": "No Ejecutado", "desc": "El proyecto fue aprobado, pero no se inició su ejecución por falta de recursos, cambios de prioridades u otras razones justificadas.", "edita": False},
+]
+
+ESTADOS_POA = [
+    {"nombre": "Ingresado", "desc": "El director del proyecto ingresa el POA, en este estado todavía se puede editarlo"},
+    {"nombre": "Validado", "desc": "El director de investigación emite comentarios correctivos del POA y es enviado a Ejecucion o denuevo a Ingresado"},
+    {"nombre": "Ejecucion", "desc": "El POA a sido aprobado para ejecución y todos puede leerlo, el sistema controla los saldos, el siguinete paso es Reforma o Finalizado"},
+    {"nombre": "En Reforma", "desc": "El director del proyecto solicita una reforma de tareas o actividades que todavia tienen saldo y es enviado a Validado"},
+    {"nombre": "Finalizado", "desc": "POA finalizado y cerrado"}
+]
+
+ITEMS_PRESUPUESTARIOS = [
+    {"codigo": "730606", "nombre": "(1.1, 1.2, 1.3, 1.4); (1.1, 1.2, 1.3, 1.4); (1.1, 1.2, 1.3, 1.4)", "descripcion": "Aplica en 4 tareas del mismo POA"},
+    {"codigo": "710502", "nombre": "2.1; 0; 2.1", "descripcion": "Codigo único"},
+    {"codigo": "710601", "nombre": "2.2; 0; 2.2", "descripcion": "Codigo único"},
+    {"codigo": "840107", "nombre": "3.1; 7.1; 3.1", "descripcion": "Depende de una condición"},
+    {"codigo": "731407", "nombre": "3.1; 7.1; 3.1", "descripcion": "Depende de una condición"},
+    {"codigo": "840104", "nombre": "4.1; 2.1; 4.1", "descripcion": "Depende de una condición"},
+    {"codigo": "731404", "nombre": "4.1; 2.1; 4.1", "descripcion": "Depende de una condición"},
+    {"codigo": "730829", "nombre": "5.1; 3.1; 5.1", "descripcion": "Codigo único"},
+    {"codigo": "730819", "nombre": "5.2; 0; 5.2", "descripcion": "Codigo único"},
+    {"codigo": "730204", "nombre": "6.1; 4.1; 6.1", "descripcion": "Codigo único"},
+    {"codigo": "730612", "nombre": "7.1; 0; 7.1", "descripcion": "Codigo único"},
+    {"codigo": "730303", "nombre": "8.1; 5.1; 8.1", "descripcion": "Codigo único"},
+    {"codigo": "730301", "nombre": "(8.2, 8.3); (5.2, 5.3); (8.2, 8.3)", "descripcion": "Aplica en 2 tareas del mismo POA"},
+    {"codigo": "730609", "nombre": "9.1; 0; 0", "descripcion": "Codigo único"},
+    {"codigo": "840109", "nombre": "10.1; 0; 0", "descripcion": "Depende de una condición"},
+    {"codigo": "731409", "nombre": "10.1; 0; 0", "descripcion": "Depende de una condición"},
+    {"codigo": "730304", "nombre": "11.1; 0; 0", "descripcion": "Codigo único"},
+    {"codigo": "730302", "nombre": "(11.2, 11.3, 12.1); 0; 0", "descripcion": "Aplica en 3 tareas del mismo POA"},
+    {"codigo": "730307", "nombre": "12.2; 0; 0", "descripcion": "Codigo único"},
+    {"codigo": "770102", "nombre": "0; 8.1; 0", "descripcion": "Codigo único"},
+    {"codigo": "730601", "nombre": "0; 6.1; 0", "descripcion": "Codigo único"},
+    {"codigo": "730207", "nombre": "0; 0; 6.2", "descripcion": "Codigo único"},
+]
+
+DETALLES_CON_ASOCIACIONES = [
+    # Código 730606 - Contratación de servicios profesionales (4 detalles diferentes)
+    {
+        "codigo": "730606",
+        "nombre": "Contratación de servicios profesionales",
+        "descripcion": "Asistente de investigación",
+        "características": "1.1; 1.1; 1.1",
+        "asociaciones": {
+            "PIM": ["1.1"], "PTT": ["1.1"], "PVIF": ["1.1"], "PVIS": ["1.1"], "PIGR": ["1.1"], "PIS": ["1.1"], "PIIF": ["1.1"]
+        }
+    },
+    {
+        "codigo": "730606",
+        "nombre": "Contratación de servicios profesionales",
+        "descripcion": "Servicios profesionales 1",
+        "características": "1.2; 1.2; 1.2",
+        "asociaciones": {
+            "PIM": ["1.2"], "PTT": ["1.2"], "PVIF": ["1.2"], "PVIS": ["1.2"], "PIGR": ["1.2"], "PIS": ["1.2"], "PIIF": ["1.2"]
+        }
+    },
+    {
+        "codigo": "730606",
+        "nombre": "Contratación de servicios profesionales",
+        "descripcion": "Servicios profesionales 2",
+        "características": "1.3; 1.3; 1.3",
+        "asociaciones": {
+            "PIM": ["1.3"], "PTT": ["1.3"], "PVIF": ["1.3"], "PVIS": ["1.3"], "PIGR": ["1.3"], "PIS": ["1.3"], "PIIF": ["1.3"]
+        }
+    },
+    {
+        "codigo": "730606",
+        "nombre": "Contratación de servicios profesionales",
+        "descripcion": "Servicios profesionales 3",
+        "características": "1.4; 1.4; 1.4",
+        "asociaciones": {
+            "PIM": ["1.4"], "PTT": ["1.4"], "PVIF": ["1.4"], "PVIS": ["1.4"], "PIGR": ["1.4"], "PIS": ["1.4"], "PIIF": ["1.4"]
+        }
+    },
+    # Código 710502 - Ayudantes RMU
+    {
+        "codigo": "710502",
+        "nombre": "Contratación de ayudantes de investigación RMU",
+        "descripcion": "",
+        "características": "2.1; 0; 2.1",
+        "asociaciones": {
+            "PIM": ["2.1"], "PVIF": ["2.1"], "PVIS": ["2.1"], "PIGR": ["2.1"], "PIS": ["2.1"], "PIIF": ["2.1"]
+        }
+    },
+    # Código 710601 - Ayudantes IESS
+    {
+        "codigo": "710601",
+        "nombre": "Contratación de ayudantes de investigación IESS",
+        "descripcion": "",
+        "características": "2.2; 0; 2.2",
+        "asociaciones": {
+            "PIM": ["2.2"], "PVIF": ["2.2"], "PVIS": ["2.2"], "PIGR": ["2.2"], "PIS": ["2.2"], "PIIF": ["2.2"]
+        }
+    },
+    # Códigos 840107 y 731407 - Equipos informáticos (alternativas)
+    {
+        "codigo": "840107",
+        "nombre": "Adquisición de equipos informáticos",
+        "descripcion": "",
+        "características": "3.1; 7.1; 3.1",
+        "asociaciones": {
+            "PIM": ["3.1"], "PTT": ["7.1"], "PVIF": ["3.1"], "PVIS": ["3.1"], "PIGR": ["3.1"], "PIS": ["3.1"], "PIIF": ["3.1"]
+        }
+    },
+    {
+        "codigo": "731407",
+        "nombre": "Adquisición de equipos informáticos",
+        "descripcion": "",
+        "características": "3.1; 7.1; 3.1",
+        "asociaciones": {
+            "PIM": ["3.1"], "PTT": ["7.1"], "PVIF": ["3.1"], "PVIS": ["3.1"], "PIGR": ["3.1"], "PIS": ["3.1"], "PIIF": ["3.1"]
+        }
+    },
+    # Códigos 840104 y 731404 - Equipos especializados (alternativas)
+    {
+        "codigo": "840104",
+        "nombre": "Adquisición de equipos especializados y maquinaria",
+        "descripcion": "",
+        "características": "4.1; 2.1; 4.1",
+        "asociaciones": {
+            "PIM": ["4.1"], "PTT": ["2.1"], "PVIF": ["4.1"], "PVIS": ["4.1"], "PIGR": ["4.1"], "PIS": ["4.1"], "PIIF": ["4.1"]
+        }
+    },
+    {
+        "codigo": "731404",
+        "nombre": "Adquisición de equipos especializados y maquinaria",
+        "descripcion": "",
+        "características": "4.1; 2.1; 4.1",
+        "asociaciones": {
+            "PIM": ["4.1"], "PTT": ["2.1"], "PVIF": ["4.1"], "PVIS": ["4.1"], "PIGR": ["4.1"], "PIS": ["4.1"], "PIIF": ["4.1"]
+        }
+    },
+    # Código 730829 - Insumos
+    {
+        "codigo": "730829",
+        "nombre": "Adquisición de insumos",
+        "descripcion": "",
+        "características": "5.1; 3.1; 5.1",
+        "asociaciones": {
+            "PIM": ["5.1"], "PTT": ["3.1"], "PVIF": ["5.1"], "PVIS": ["5.1"], "PIGR": ["5.1"], "PIS": ["5.1"], "PIIF": ["5.1"]
+        }
+    },
+    # Código 730819 - Reactivos
+    {
+        "codigo": "730819",
+        "nombre": "Adquisición de reactivos",
+        "descripcion": "",
+        "características": "5.2; 0; 5.2",
+        "asociaciones": {
+            "PIM": ["5.2"], "PVIF": ["5.2"], "PVIS": ["5.2"], "PIGR": ["5.2"], "PIS": ["5.2"], "PIIF": ["5.2"]
+        }
+    },
+    # Código 730204 - Publicaciones (solo PIM)
+    {
+        "codigo": "730204",
+        "nombre": "Solicitud de autorización para el pago de publicaciones",
+        "descripcion": "",
+        "características": "6.1; 0; 0",
+        "asociaciones": {
+            "PIM": ["6.1"]
+        }
+    },
+    # Código 730204 - Impresión 3D (solo PTT)
+    {
+        "codigo": "730204",
+        "nombre": "Servicio de edición, impresión y reproducción (Impresión 3D)",
+        "descripcion": "",
+        "características": "0; 4.1; 0",
+        "asociaciones": {
+            "PTT": ["4.1"]
+        }
+    },
+    # Código 730204 - Copias (resto de POAs)
+    {
+        "codigo": "730204",
+        "nombre": "Servicio de edición, impresión y reproducción (copias)",
+        "descripcion": "",
+        "características": "0; 0; 6.1",
+        "asociaciones": {
+            "PVIF": ["6.1"], "PVIS": ["6.1"], "PIGR": ["6.1"], "PIS": ["6.1"], "PIIF": ["6.1"]
+        }
+    },
+    # Código 730612 - Eventos académicos
+    {
+        "codigo": "730612",
+        "nombre": "Solicitud de pago de inscripción para participación en eventos académicos",
+        "descripcion": "",
+        "características": "7.1; 0; 7.1",
+        "asociaciones": {
+            "PIM": ["7.1"], "PVIF": ["7.1"], "PVIS": ["7.1"], "PIGR": ["7.1"], "PIS": ["7.1"], "PIIF": ["7.1"]
+        }
+    },
+    # Código 730303 - Viáticos interior
+    {
+        "codigo": "730303",
+        "nombre": "Viáticos al interior",
+        "descripcion": "",
+        "características": "8.1; 5.1; 8.1",
+        "asociaciones": {
+            "PIM": ["8.1"], "PTT": ["5.1"], "PVIF": ["8.1"], "PVIS": ["8.1"], "PIGR": ["8.1"], "PIS": ["8.1"], "PIIF": ["8.1"]
+        }
+    },
+    # Código 730301 - Pasajes aéreos interior
+    {
+        "codigo": "730301",
+        "nombre": "Pasajes aéreos al interior",
+        "descripcion": "",
+        "características": "8.2; 5.2; 8.2",
+        "asociaciones": {
+            "PIM": ["8.2"], "PTT": ["5.2"], "PVIF": ["8.2"], "PVIS": ["8.2"], "PIGR": ["8.2"], "PIS": ["8.2"], "PIIF": ["8.2"]
+        }
+    },
+    # Código 730301 - Movilización interior
+    {
+        "codigo": "730301",
+        "nombre": "Movilización al interior",
+        "descripcion": "",
+        "características": "8.3; 5.3; 8.3",
+        "asociaciones": {
+            "PIM": ["8.3"], "PTT": ["5.3"], "PVIF": ["8.3"], "PVIS": ["8.3"], "PIGR": ["8.3"], "PIS": ["8.3"], "PIIF": ["8.3"]
+        }
+    },
+    # Código 730609 - Análisis laboratorios (solo PIM)
+    {
+        "codigo": "730609",
+        "nombre": "Análisis de laboratorios",
+        "descripcion": "",
+        "características": "9.1; 0; 0",
+        "asociaciones": {
+            "PIM": ["9.1"]
+        }
+    },
+    # Códigos 840109 y 731409 - Literatura especializada (alternativas, solo PIM)
+    {
+        "codigo": "840109",
+        "nombre": "Adquisición de literatura especializada",
+        "descripcion": "(valor mas de 100 y durabilidad)",
+        "características": "10.1; 0; 0",
+        "asociaciones": {
+            "PIM": ["10.1"]
+        }
+    },
+    {
+        "codigo": "731409",
+        "nombre": "Adquisición de literatura especializada",
+        "descripcion": "(valor mas de 100 y durabilidad)",
+        "características": "10.1; 0; 0",
+        "asociaciones": {
+            "PIM": ["10.1"]
+        }
+    },
+    # Código 730304 - Viáticos exterior (solo PIM)
+    {
+        "codigo": "730304",
+        "nombre": "Viáticos al exterior",
+        "descripcion": "",
+        "características": "11.1; 0; 0",
+        "asociaciones": {
+            "PIM": ["11.1"]
+        }
+    },
+    # Código 730302 - Pasajes aéreos exterior (solo PIM)
+    {
+        "codigo": "730302",
+        "nombre": "Pasajes aéreos al exterior",
+        "descripcion": "",
+        "características": "11.2; 0; 0",
+        "asociaciones": {
+            "PIM": ["11.2"]
+        }
+    },
+    # Código 730302 - Movilización exterior (solo PIM)
+    {
+        "codigo": "730302",
+        "nombre": "Movilización al exterior",
+        "descripcion": "",
+        "características": "11.3; 0; 0",
+        "asociaciones": {
+            "PIM": ["11.3"]
+        }
+    },
+    # Código 730302 - Pasajes delegados (solo PIM)
+    {
+        "codigo": "730302",
+        "nombre": "Pasajes aéreos para atención a delegados (investigadores colaboradores externos)",
+        "descripcion": "",
+        "características": "12.1; 0; 0",
+        "asociaciones": {
+            "PIM": ["12.1"]
+        }
+    },
+    # Código 730307 - Hospedaje delegados (solo PIM)
+    {
+        "codigo": "730307",
+        "nombre": "Servicio de hospedaje y alimentación para atención a delegados (investigadores colaboradores externos)",
+        "descripcion": "",
+        "características": "12.2; 0; 0",
+        "asociaciones": {
+            "PIM": ["12.2"]
+        }
+    },
+    # Código 730601 - Servicios técnicos (solo PTT)
+    {
+        "codigo": "730601",
+        "nombre": "Contratación de servicios técnicos especializados para la elaboración de diseño, construcción, implementación, seguimiento y mejora contínua de los prototipos",
+        "descripcion": "Contratación de servicios técnicos especializados (Consultoría), para la adquisición de muestras de campo",
+        "características": "0; 6.1; 0",
+        "asociaciones": {
+            "PTT": ["6.1"]
+        }
+    },
+    # Código 770102 - Propiedad intelectual (solo PTT)
+    {
+        "codigo": "770102",
+        "nombre": "Propiedad intelectual",
+        "descripcion": "",
+        "características": "0; 8.1; 0",
+        "asociaciones": {
+            "PTT": ["8.1"]
+        }
+    },
+    # Código 730207 - Difusión (resto de POAs)
+    {
+        "codigo": "730207",
+        "nombre": "Servicio de difusion informacion y publicidad (banner, plotter, pancarta, afiches)",
+        "descripcion": "",
+        "características": "0; 0; 6.2",
+        "asociaciones": {
+            "PVIF": ["6.2"], "PVIS": ["6.2"], "PIGR": ["6.2"], "PIS": ["6.2"], "PIIF": ["6.2"]
+        }
+    },
+]
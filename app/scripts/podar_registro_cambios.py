@@ -0,0 +1,40 @@
+# Uso: python -m app.scripts.podar_registro_cambios [--dias N] [--simular]
+import argparse
+import asyncio
+from sqlalchemy import func, select
+from app import models
+from app.database import engine
+from app.registro_cambios import podar_lote, limite_retencion, RETENCION_CAMBIOS_DIAS
+
+
+# Elimina de REGISTRO_CAMBIO los cambios de más de `dias` días (feed GET /cambios).
+# Pensado para ejecutarse de forma programada (cron) fuera del proceso de la API.
+async def podar_registro_cambios(dias: int, simular: bool = False) -> int:
+    async with engine.connect() as conn:
+        antes_de = await limite_retencion(conn, dias)
+    if simular:
+        async with engine.connect() as conn:
+            cantidad = (await conn.execute(
+                select(func.count()).where(models.RegistroCambio.fecha < antes_de)
+            )).scalar_one()
+        print(f"Se eliminarían {cantidad} cambios anteriores a {antes_de:%Y-%m-%d %H:%M}")
+        return cantidad
+
+    # una transacción por lote: un fallo no deshace lo ya eliminado
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            eliminados = await podar_lote(conn, antes_de)
+        total += eliminados
+        if not eliminados:
+            break
+    print(f"✅ {total} cambios anteriores a {antes_de:%Y-%m-%d %H:%M} eliminados.")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Elimina los cambios antiguos del feed incremental")
+    parser.add_argument("--dias", type=int, default=RETENCION_CAMBIOS_DIAS, help="Días de cambios que se conservan")
+    parser.add_argument("--simular", action="store_true", help="Solo cuenta los cambios a eliminar")
+    args = parser.parse_args()
+    asyncio.run(podar_registro_cambios(args.dias, args.simular))
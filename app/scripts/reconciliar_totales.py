@@ -0,0 +1,25 @@
+# Uso: python -m app.scripts.reconciliar_totales [--solo-verificar]
+import asyncio
+import sys
+from app.database import SessionLocal
+from app.totales import reconciliar_totales_actividad
+
+
+# Verifica y repara en bloque los totales de las actividades a partir de sus tareas
+async def reconciliar_totales(reparar: bool = True):
+    async with SessionLocal() as db:
+        diferencias = await reconciliar_totales_actividad(db, reparar=reparar)
+        await db.commit()
+
+    for dif in diferencias:
+        print(
+            f"Actividad {dif['id_actividad']}: total {dif['total_registrado']} -> {dif['total_calculado']}, "
+            f"saldo {dif['saldo_registrado']} -> {dif['saldo_calculado']}"
+        )
+    accion = "reparadas" if reparar else "encontradas"
+    print(f"✅ {len(diferencias)} actividades con diferencias {accion}.")
+    return diferencias
+
+
+if __name__ == "__main__":
+    asyncio.run(reconciliar_totales(reparar="--solo-verificar" not in sys.argv))
@@ -0,0 +1,16 @@
+# Uso: python -m app.scripts.refrescar_resumen
+import asyncio
+from app.database import SessionLocal
+from app.resumen import refrescar_resumen_completo
+
+
+# Recalcula RESUMEN_PRESUPUESTO_POA para todos los POA (carga inicial o cron)
+async def refrescar_resumen():
+    async with SessionLocal() as db:
+        await refrescar_resumen_completo(db)
+        await db.commit()
+    print("✅ Resumen presupuestario de POAs actualizado.")
+
+
+if __name__ == "__main__":
+    asyncio.run(refrescar_resumen())
@@ -0,0 +1,42 @@
+import sys
+import warnings
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from app import eventos
+
+try:
+    from uvicorn_worker import UvicornWorker
+except ImportError:  # sin el paquete uvicorn-worker se usa el worker incluido en uvicorn
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        from uvicorn.workers import UvicornWorker
+
+# Worker de gunicorn para producción (ver gunicorn.conf.py): uvicorn con uvloop y httptools.
+# Al recibir SIGTERM el worker deja de aceptar conexiones y espera a que terminen las
+# peticiones en curso (subidas de Excel, exportaciones) hasta graceful_timeout. Los flujos
+# SSE de /eventos no terminan solos: se cierran al empezar el apagado y el navegador se
+# reconecta a otro worker.
+
+MARGEN_APAGADO = 5  # segundos para el shutdown de la app antes de que el maestro mate al worker
+
+
+class _Servidor(Server):
+    async def shutdown(self, sockets=None):
+        eventos.bus.cerrar_flujos()
+        await super().shutdown(sockets=sockets)
+
+
+class WorkerPoa(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(self.cfg.graceful_timeout - MARGEN_APAGADO, 1)
+
+    async def _serve(self):
+        self.config.app = self.wsgi
+        servidor = _Servidor(config=self.config)
+        self._install_sigquit_handler()
+        await servidor.serve(sockets=self.sockets)
+        if not servidor.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
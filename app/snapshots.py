@@ -0,0 +1,222 @@
+import copy
+import hashlib
+import json
+import uuid
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, schemas
+
+# Snapshots de POA (tabla SNAPSHOT_POA).
+# Cada snapshot guarda el árbol actividades -> tareas -> programación mensual como
+# JSON comprimido con zlib. Se capturan al crear y al aprobar una reforma, de modo
+# que comparar el antes y el después es descomprimir dos blobs y compararlos en
+# memoria, sin reconstruir el estado desde HISTORICO_POA.
+
+MOMENTO_CREACION_REFORMA = "creacion_reforma"
+MOMENTO_APROBACION_REFORMA = "aprobacion_reforma"
+MOMENTO_MANUAL = "manual"
+
+_CENTAVOS = Decimal("0.01")
+
+
+def _monto(valor) -> Optional[str]:
+    if valor is None:
+        return None
+    return str(Decimal(valor).quantize(_CENTAVOS))
+
+
+async def capturar_arbol(db: AsyncSession, id_poa: uuid.UUID) -> dict:
+    """Lee el estado actual del POA con una consulta por nivel del árbol."""
+    Actividad, Tarea, ProgramacionMensual = models.Actividad, models.Tarea, models.ProgramacionMensual
+
+    result = await db.execute(select(models.Poa.presupuesto_asignado).where(models.Poa.id_poa == id_poa))
+    presupuesto = result.scalar_one_or_none()
+
+    result = await db.execute(
+        select(Actividad.id_actividad, Actividad.descripcion_actividad, Actividad.total_por_actividad, Actividad.saldo_actividad)
+        .where(Actividad.id_poa == id_poa)
+    )
+    actividades = {
+        str(fila.id_actividad): {
+            "descripcion": fila.descripcion_actividad,
+            "total": _monto(fila.total_por_actividad),
+            "saldo": _monto(fila.saldo_actividad),
+        }
+        for fila in result.all()
+    }
+
+    result = await db.execute(
+        select(
+            Tarea.id_tarea, Tarea.id_actividad, Tarea.id_detalle_tarea, Tarea.nombre, Tarea.detalle_descripcion,
+            Tarea.cantidad, Tarea.precio_unitario, Tarea.total, Tarea.saldo_disponible, Tarea.lineaPaiViiv,
+        )
+        .join(Actividad, Actividad.id_actividad == Tarea.id_actividad)
+        .where(Actividad.id_poa == id_poa)
+    )
+    tareas = {
+        str(fila.id_tarea): {
+            "id_actividad": str(fila.id_actividad),
+            "id_detalle_tarea": str(fila.id_detalle_tarea) if fila.id_detalle_tarea else None,
+            "nombre": fila.nombre,
+            "detalle_descripcion": fila.detalle_descripcion,
+            "cantidad": _monto(fila.cantidad),
+            "precio_unitario": _monto(fila.precio_unitario),
+            "total": _monto(fila.total),
+            "saldo": _monto(fila.saldo_disponible),
+            "lineaPaiViiv": fila.lineaPaiViiv,
+            "programacion": {},
+        }
+        for fila in result.all()
+    }
+
+    result = await db.execute(
+        select(ProgramacionMensual.id_tarea, ProgramacionMensual.mes, ProgramacionMensual.valor)
+        .join(Tarea, Tarea.id_tarea == ProgramacionMensual.id_tarea)
+        .join(Actividad, Actividad.id_actividad == Tarea.id_actividad)
+        .where(Actividad.id_poa == id_poa)
+    )
+    for fila in result.all():
+        tareas[str(fila.id_tarea)]["programacion"][fila.mes] = _monto(fila.valor)
+
+    return {
+        "id_poa": str(id_poa),
+        "presupuesto_asignado": _monto(presupuesto),
+        "actividades": actividades,
+        "tareas": tareas,
+    }
+
+
+def comprimir(arbol: dict):
+    """Retorna (contenido comprimido, huella sha256 del JSON canónico)."""
+    datos = json.dumps(arbol, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return zlib.compress(datos, 6), hashlib.sha256(datos).hexdigest()
+
+
+def leer(snapshot: models.SnapshotPoa) -> dict:
+    return json.loads(zlib.decompress(snapshot.contenido))
+
+
+def total_actividades(arbol: dict) -> Decimal:
+    return sum((Decimal(a["total"] or 0) for a in arbol["actividades"].values()), Decimal("0"))
+
+
+async def crear_snapshot(
+    db: AsyncSession,
+    id_poa: uuid.UUID,
+    momento: str,
+    id_usuario: uuid.UUID,
+    id_reforma: Optional[uuid.UUID] = None,
+) -> models.SnapshotPoa:
+    """Captura el POA y agrega el snapshot a la sesión. No hace commit."""
+    arbol = await capturar_arbol(db, id_poa)
+    contenido, huella = comprimir(arbol)
+    snapshot = models.SnapshotPoa(
+        id_snapshot=uuid.uuid4(),
+        id_poa=id_poa,
+        id_reforma=id_reforma,
+        momento=momento,
+        fecha_creacion=datetime.utcnow(),
+        id_usuario=id_usuario,
+        total_actividades=total_actividades(arbol),
+        cantidad_tareas=len(arbol["tareas"]),
+        huella=huella,
+        contenido=contenido,
+    )
+    db.add(snapshot)
+    return snapshot
+
+
+def simular_cambios(arbol: dict, cambios: schemas.ReformaCambiosCreate) -> dict:
+    """Aplica en memoria los cambios pendientes de una reforma sobre una copia del árbol."""
+    arbol = copy.deepcopy(arbol)
+    actividades, tareas = arbol["actividades"], arbol["tareas"]
+
+    def ajustar(id_actividad: str, delta_total: Decimal, delta_saldo: Decimal):
+        actividad = actividades.get(id_actividad)
+        if actividad:
+            actividad["total"] = _monto(Decimal(actividad["total"] or 0) + delta_total)
+            actividad["saldo"] = _monto(Decimal(actividad["saldo"] or 0) + delta_saldo)
+
+    for id_tarea in map(str, cambios.eliminar):
+        tarea = tareas.pop(id_tarea, None)
+        if tarea:
+            ajustar(tarea["id_actividad"], -Decimal(tarea["total"] or 0), -Decimal(tarea["saldo"] or 0))
+
+    for cambio in cambios.editar:
+        tarea = tareas.get(str(cambio.id_tarea))
+        if not tarea:
+            continue
+        if cambio.cantidad is not None:
+            tarea["cantidad"] = _monto(cambio.cantidad)
+        if cambio.precio_unitario is not None:
+            tarea["precio_unitario"] = _monto(cambio.precio_unitario)
+        if cambio.lineaPaiViiv is not None:
+            tarea["lineaPaiViiv"] = cambio.lineaPaiViiv
+        nuevo_total = Decimal(tarea["cantidad"] or 0) * Decimal(tarea["precio_unitario"] or 0)
+        delta = nuevo_total - Decimal(tarea["total"] or 0)
+        tarea["total"] = _monto(nuevo_total)
+        tarea["saldo"] = _monto(Decimal(tarea["saldo"] or 0) + delta)
+        ajustar(tarea["id_actividad"], delta, delta)
+
+    for indice, cambio in enumerate(cambios.agregar):
+        total = Decimal(cambio.cantidad) * Decimal(cambio.precio_unitario)
+        tareas[f"nueva-{indice}"] = {
+            "id_actividad": str(cambio.id_actividad),
+            "id_detalle_tarea": str(cambio.id_detalle_tarea),
+            "nombre": cambio.nombre,
+            "detalle_descripcion": cambio.detalle_descripcion,
+            "cantidad": _monto(cambio.cantidad),
+            "precio_unitario": _monto(cambio.precio_unitario),
+            "total": _monto(total),
+            "saldo": _monto(total),
+            "lineaPaiViiv": cambio.lineaPaiViiv,
+            "programacion": {},
+        }
+        ajustar(str(cambio.id_actividad), total, total)
+
+    return arbol
+
+
+def _comparar_campos(antes: dict, despues: dict) -> dict:
+    cambios = {}
+    for campo in sorted(antes.keys() | despues.keys()):
+        valor_antes, valor_despues = antes.get(campo), despues.get(campo)
+        if valor_antes == valor_despues:
+            continue
+        if isinstance(valor_antes, dict) and isinstance(valor_despues, dict):
+            # programación mensual: solo los meses que cambian
+            cambios[campo] = _comparar_campos(valor_antes, valor_despues)
+        else:
+            cambios[campo] = {"antes": valor_antes, "despues": valor_despues}
+    return cambios
+
+
+def _comparar_elementos(antes: dict, despues: dict) -> dict:
+    return {
+        "agregadas": [{"id": clave, **despues[clave]} for clave in sorted(despues.keys() - antes.keys())],
+        "eliminadas": [{"id": clave, **antes[clave]} for clave in sorted(antes.keys() - despues.keys())],
+        "modificadas": [
+            {"id": clave, "cambios": cambios}
+            for clave in sorted(antes.keys() & despues.keys())
+            if (cambios := _comparar_campos(antes[clave], despues[clave]))
+        ],
+    }
+
+
+def comparar(antes: dict, despues: dict) -> dict:
+    """Diferencias entre dos árboles de POA, por actividad y por tarea."""
+    total_antes, total_despues = total_actividades(antes), total_actividades(despues)
+    return {
+        "presupuesto_asignado": {"antes": antes["presupuesto_asignado"], "despues": despues["presupuesto_asignado"]},
+        "total_actividades": {
+            "antes": _monto(total_antes),
+            "despues": _monto(total_despues),
+            "variacion": _monto(total_despues - total_antes),
+        },
+        "actividades": _comparar_elementos(antes["actividades"], despues["actividades"]),
+        "tareas": _comparar_elementos(antes["tareas"], despues["tareas"]),
+    }
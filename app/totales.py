@@ -0,0 +1,144 @@
+import uuid
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from app import models
+from sqlalchemy import update, select, func, or_, values, column, DECIMAL
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Los totales de ACTIVIDAD se mantienen con sentencias UPDATE ... SET x = x + :delta.
+# Así cada cambio de tarea cuesta una sola sentencia y dos ediciones concurrentes
+# no se pisan (PostgreSQL serializa la suma sobre la fila, no en Python).
+
+
+async def ajustar_totales_actividad(
+    db: AsyncSession,
+    id_actividad: uuid.UUID,
+    delta_total: Decimal,
+    delta_saldo: Optional[Decimal] = None,
+) -> Optional[uuid.UUID]:
+    """
+    Suma los deltas a total_por_actividad y saldo_actividad de una actividad.
+    Si no se indica delta_saldo se usa el mismo delta del total.
+    Retorna el id_poa de la actividad (None si la actividad no existe).
+    """
+    if delta_saldo is None:
+        delta_saldo = delta_total
+
+    result = await db.execute(
+        update(models.Actividad)
+        .where(models.Actividad.id_actividad == id_actividad)
+        .values(
+            total_por_actividad=models.Actividad.total_por_actividad + delta_total,
+            saldo_actividad=models.Actividad.saldo_actividad + delta_saldo,
+            version=models.Actividad.version + 1,
+        )
+        .returning(models.Actividad.id_poa)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def ajustar_totales_actividades(
+    db: AsyncSession,
+    deltas: Dict[uuid.UUID, Tuple[Decimal, Decimal]],
+) -> set:
+    """
+    Aplica en una sola sentencia (UPDATE ... FROM VALUES) los deltas de varias
+    actividades. `deltas` es {id_actividad: (delta_total, delta_saldo)}.
+    Retorna el conjunto de id_poa afectados.
+    """
+    if not deltas:
+        return set()
+
+    tabla_deltas = values(
+        column("id_actividad", UUID(as_uuid=True)),
+        column("delta_total", DECIMAL(18, 2)),
+        column("delta_saldo", DECIMAL(18, 2)),
+        name="deltas",
+    ).data([(id_act, d_total, d_saldo) for id_act, (d_total, d_saldo) in deltas.items()])
+
+    result = await db.execute(
+        update(models.Actividad)
+        .where(models.Actividad.id_actividad == tabla_deltas.c.id_actividad)
+        .values(
+            total_por_actividad=models.Actividad.total_por_actividad + tabla_deltas.c.delta_total,
+            saldo_actividad=models.Actividad.saldo_actividad + tabla_deltas.c.delta_saldo,
+            version=models.Actividad.version + 1,
+        )
+        .returning(models.Actividad.id_poa)
+        .execution_options(synchronize_session=False)
+    )
+    return set(result.scalars().all())
+
+
+def _sumas_por_actividad():
+    return (
+        select(
+            models.Tarea.id_actividad,
+            func.coalesce(func.sum(models.Tarea.total), 0).label("total"),
+            func.coalesce(func.sum(models.Tarea.saldo_disponible), 0).label("saldo"),
+        )
+        .group_by(models.Tarea.id_actividad)
+        .subquery("sumas")
+    )
+
+
+async def reconciliar_totales_actividad(
+    db: AsyncSession,
+    id_poa: Optional[uuid.UUID] = None,
+    reparar: bool = True,
+) -> list:
+    """
+    Compara total_por_actividad y saldo_actividad con la suma de sus tareas y,
+    si `reparar` es True, corrige todas las diferencias con un único UPDATE.
+    Una actividad sin tareas debe tener ambos valores en 0 (p. ej. tras borrar su
+    última tarea). No hace commit.
+    Retorna la lista de diferencias encontradas.
+    """
+    sumas = _sumas_por_actividad()
+    calculado = (
+        select(
+            models.Actividad.id_actividad,
+            func.coalesce(sumas.c.total, 0).label("total"),
+            func.coalesce(sumas.c.saldo, 0).label("saldo"),
+        )
+        .outerjoin(sumas, sumas.c.id_actividad == models.Actividad.id_actividad)
+    )
+    if id_poa:
+        calculado = calculado.where(models.Actividad.id_poa == id_poa)
+    calculado = calculado.subquery("calculado")
+    hay_diferencia = or_(
+        models.Actividad.total_por_actividad != calculado.c.total,
+        models.Actividad.saldo_actividad != calculado.c.saldo,
+    )
+
+    consulta = (
+        select(
+            models.Actividad.id_actividad,
+            models.Actividad.id_poa,
+            models.Actividad.total_por_actividad.label("total_registrado"),
+            calculado.c.total.label("total_calculado"),
+            models.Actividad.saldo_actividad.label("saldo_registrado"),
+            calculado.c.saldo.label("saldo_calculado"),
+        )
+        .join(calculado, calculado.c.id_actividad == models.Actividad.id_actividad)
+        .where(hay_diferencia)
+    )
+
+    result = await db.execute(consulta)
+    diferencias = [dict(fila) for fila in result.mappings().all()]
+
+    if reparar and diferencias:
+        await db.execute(
+            update(models.Actividad)
+            .where(models.Actividad.id_actividad == calculado.c.id_actividad, hay_diferencia)
+            .values(
+                total_por_actividad=calculado.c.total,
+                saldo_actividad=calculado.c.saldo,
+                version=models.Actividad.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    return diferencias
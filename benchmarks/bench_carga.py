@@ -0,0 +1,254 @@
+# Uso: python -m benchmarks.bench_carga --url http://localhost:8000 --usuarios 200 --duracion 120
+#      python -m benchmarks.bench_carga --usuarios 20 --duracion 30      (app en el mismo proceso)
+# Prueba de carga de la semana de entrega de POAs: usuarios virtuales (corrutinas httpx)
+# que consultan POAs, editan tareas, suben libros Excel y descargan reportes en la
+# proporción de ESCENARIOS. Requiere los datos de benchmarks.generar_datos.
+# Reporta p50/p95/p99 por operación y la saturación del pool de conexiones leída de
+# /metrics (con varios workers cada lectura corresponde al worker que atendió /metrics).
+import argparse
+import asyncio
+import random
+import re
+import time
+from collections import defaultdict
+import httpx
+from benchmarks.comun import cliente, iniciar_sesion, listar_poas, percentil, guardar_resultados
+from benchmarks.generar_datos import USUARIO_BENCH_EMAIL, USUARIO_BENCH_CLAVE
+from benchmarks.generar_excel import generar_libro_poa, HOJA_POR_DEFECTO
+
+# (escenario, peso): mezcla de tráfico de un día de entrega
+ESCENARIOS = [
+    ("ver_poas", 20),
+    ("ver_actividades", 20),
+    ("ver_tareas", 15),
+    ("editar_tarea", 15),
+    ("ver_programacion", 8),
+    ("subir_excel", 5),
+    ("reporte_poa", 5),
+    ("descargar_reporte_excel", 3),
+    ("historial_logs", 5),
+    ("login", 4),
+]
+
+TIPO_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+_RE_METRICA = re.compile(r"^(poa_db_pool_\w+) (-?[\d.]+)$", re.MULTILINE)
+
+
+class Carga:
+    def __init__(self, c: httpx.AsyncClient, args):
+        self.c = c
+        self.args = args
+        self.muestras = defaultdict(list)  # operación -> [(estado, ms)]
+        self.pool = []                     # lecturas de /metrics
+        self.poas_consulta = []
+        self.poas_excel = []
+        self.bloqueos_excel = {}
+        self.libro = b""
+        self.reporte = None
+
+    async def preparar(self):
+        poas = await listar_poas(self.c)
+        if len(poas) < 2:
+            raise SystemExit("❌ Faltan POAs. Ejecute primero: python -m benchmarks.generar_datos")
+        # los POAs que reciben libros Excel no se usan para consultar ni editar
+        cantidad_excel = max(1, min(self.args.poas_excel, len(poas) // 2))
+        self.poas_excel = [p["id_poa"] for p in poas[-cantidad_excel:]]
+        self.poas_consulta = [p["id_poa"] for p in poas[:-cantidad_excel]]
+        self.bloqueos_excel = {id_poa: asyncio.Lock() for id_poa in self.poas_excel}
+        self.libro = generar_libro_poa(self.args.tareas_excel)
+
+    async def peticion(self, operacion: str, metodo: str, ruta: str, **argumentos):
+        inicio = time.perf_counter()
+        try:
+            r = await self.c.request(metodo, ruta, **argumentos)
+            estado = r.status_code
+        except httpx.HTTPError:
+            r, estado = None, 0
+        self.muestras[operacion].append((estado, (time.perf_counter() - inicio) * 1000))
+        return r
+
+    # ------------------------------------------------------------------ escenarios
+
+    async def ver_poas(self, aleatorio):
+        await self.peticion("GET /poas/", "GET", "/poas/")
+
+    async def _actividades(self, aleatorio):
+        id_poa = aleatorio.choice(self.poas_consulta)
+        r = await self.peticion("GET /poas/{id}/actividades", "GET", f"/poas/{id_poa}/actividades")
+        return r.json() if r is not None and r.status_code == 200 else []
+
+    async def ver_actividades(self, aleatorio):
+        await self._actividades(aleatorio)
+
+    async def _tareas(self, aleatorio):
+        actividades = await self._actividades(aleatorio)
+        if not actividades:
+            return []
+        id_actividad = aleatorio.choice(actividades)["id_actividad"]
+        r = await self.peticion("GET /actividades/{id}/tareas", "GET", f"/actividades/{id_actividad}/tareas")
+        return r.json() if r is not None and r.status_code == 200 else []
+
+    async def ver_tareas(self, aleatorio):
+        await self._tareas(aleatorio)
+
+    async def editar_tarea(self, aleatorio):
+        tareas = await self._tareas(aleatorio)
+        if not tareas:
+            return
+        tarea = aleatorio.choice(tareas)
+        await self.peticion(
+            "PUT /tareas/{id}", "PUT", f"/tareas/{tarea['id_tarea']}",
+            json={
+                "cantidad": str(aleatorio.randint(1, 10)),
+                "precio_unitario": str(tarea["precio_unitario"]),
+                "lineaPaiViiv": tarea.get("lineaPaiViiv"),
+            },
+            headers={"If-Match": f'"{tarea["version"]}"'} if tarea.get("version") else {},
+        )
+
+    async def ver_programacion(self, aleatorio):
+        tareas = await self._tareas(aleatorio)
+        if tareas:
+            id_tarea = aleatorio.choice(tareas)["id_tarea"]
+            await self.peticion(
+                "GET /tareas/{id}/programacion-mensual", "GET", f"/tareas/{id_tarea}/programacion-mensual"
+            )
+
+    async def subir_excel(self, aleatorio):
+        id_poa = aleatorio.choice(self.poas_excel)
+        # un director no sube dos libros a la vez sobre el mismo POA
+        async with self.bloqueos_excel[id_poa]:
+            await self.peticion(
+                "POST /transformar_excel/", "POST", "/transformar_excel/",
+                data={"hoja": HOJA_POR_DEFECTO, "id_poa": id_poa, "confirmacion": "true"},
+                files={"file": ("poa_carga.xlsx", self.libro, TIPO_XLSX)},
+            )
+
+    async def reporte_poa(self, aleatorio):
+        r = await self.peticion(
+            "POST /reporte-poa/", "POST", "/reporte-poa/",
+            data={"anio": aleatorio.choice(self.args.anios), "tipo_proyecto": "Investigacion"},
+        )
+        if r is not None and r.status_code == 200 and self.reporte is None:
+            self.reporte = r.json()
+
+    async def descargar_reporte_excel(self, aleatorio):
+        if self.reporte is None:
+            await self.reporte_poa(aleatorio)
+        await self.peticion("POST /reporte-poa/excel/", "POST", "/reporte-poa/excel/", json=self.reporte or [])
+
+    async def historial_logs(self, aleatorio):
+        await self.peticion("GET /logs-carga-excel/", "GET", "/logs-carga-excel/", params={"limite": 100})
+
+    async def login(self, aleatorio):
+        await self.peticion(
+            "POST /login", "POST", "/login",
+            data={"username": USUARIO_BENCH_EMAIL, "password": USUARIO_BENCH_CLAVE},
+        )
+
+    # ------------------------------------------------------------------ ejecución
+
+    async def usuario_virtual(self, numero: int, fin: float):
+        aleatorio = random.Random(self.args.semilla + numero)
+        nombres, pesos = zip(*ESCENARIOS)
+        while time.perf_counter() < fin:
+            escenario = aleatorio.choices(nombres, weights=pesos)[0]
+            await getattr(self, escenario)(aleatorio)
+            await asyncio.sleep(aleatorio.uniform(0, self.args.pausa))
+
+    async def vigilar_pool(self, fin: float):
+        while time.perf_counter() < fin:
+            try:
+                r = await self.c.get("/metrics")
+                self.pool.append({nombre: float(valor) for nombre, valor in _RE_METRICA.findall(r.text)})
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(1)
+
+    async def ejecutar(self):
+        inicio = time.perf_counter()
+        fin = inicio + self.args.rampa + self.args.duracion
+        tareas = [asyncio.create_task(self.vigilar_pool(fin))]
+        for numero in range(self.args.usuarios):
+            tareas.append(asyncio.create_task(self.usuario_virtual(numero, fin)))
+            await asyncio.sleep(self.args.rampa / self.args.usuarios)
+        await asyncio.gather(*tareas)
+        return time.perf_counter() - inicio
+
+    def resumen(self, segundos: float) -> dict:
+        operaciones = {}
+        for operacion, muestras in sorted(self.muestras.items()):
+            latencias = [ms for _, ms in muestras]
+            operaciones[operacion] = {
+                "peticiones": len(muestras),
+                "por_segundo": round(len(muestras) / segundos, 2),
+                "errores": sum(1 for estado, _ in muestras if estado == 0 or estado >= 500),
+                "conflictos": sum(1 for estado, _ in muestras if estado == 409),
+                "rechazadas": sum(1 for estado, _ in muestras if 400 <= estado < 500 and estado != 409),
+                "p50_ms": round(percentil(latencias, 50), 2),
+                "p95_ms": round(percentil(latencias, 95), 2),
+                "p99_ms": round(percentil(latencias, 99), 2),
+            }
+
+        pool = {}
+        lecturas = [l for l in self.pool if "poa_db_pool_en_uso" in l]
+        if lecturas:
+            capacidad = lecturas[-1].get("poa_db_pool_capacidad", -1)
+            en_uso = [l["poa_db_pool_en_uso"] for l in lecturas]
+            pool = {
+                "capacidad": capacidad,
+                "en_uso_promedio": round(sum(en_uso) / len(en_uso), 2),
+                "en_uso_maximo": max(l.get("poa_db_pool_en_uso_maximo", 0) for l in lecturas),
+                # fracción de lecturas con todas las conexiones prestadas
+                "saturacion": round(sum(1 for v in en_uso if capacidad > 0 and v >= capacidad) / len(en_uso), 3),
+            }
+        return {"segundos": round(segundos, 1), "operaciones": operaciones, "pool": pool}
+
+
+def imprimir(resumen: dict):
+    print(f"{'operación':<40} {'n':>7} {'rps':>7} {'err':>5} {'409':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for operacion, r in resumen["operaciones"].items():
+        print(
+            f"{operacion:<40} {r['peticiones']:>7} {r['por_segundo']:>7} {r['errores']:>5} {r['conflictos']:>5} "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}"
+        )
+    if resumen["pool"]:
+        p = resumen["pool"]
+        print(
+            f"Pool: capacidad {p['capacidad']:.0f}, en uso promedio {p['en_uso_promedio']}, "
+            f"máximo {p['en_uso_maximo']:.0f}, saturado {p['saturacion'] * 100:.1f}% del tiempo"
+        )
+
+
+async def principal(args):
+    limites = httpx.Limits(max_connections=args.usuarios + 5, max_keepalive_connections=args.usuarios + 5)
+    async with cliente(args.url, limits=limites) as c:
+        await iniciar_sesion(c)
+        carga = Carga(c, args)
+        await carga.preparar()
+        segundos = await carga.ejecutar()
+        return carga.resumen(segundos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la semana de entrega de POAs")
+    parser.add_argument("--url", help="Servidor a probar; por defecto la app se ejecuta en el mismo proceso")
+    parser.add_argument("--usuarios", type=int, default=50, help="Usuarios virtuales concurrentes")
+    parser.add_argument("--duracion", type=int, default=60, help="Segundos de carga sostenida")
+    parser.add_argument("--rampa", type=int, default=10, help="Segundos para arrancar a todos los usuarios")
+    parser.add_argument("--pausa", type=float, default=1.0, help="Pausa máxima entre acciones de un usuario")
+    parser.add_argument("--poas-excel", type=int, default=20, help="POAs reservados para subir libros")
+    parser.add_argument("--tareas-excel", type=int, default=60, help="Tareas del libro que se sube")
+    parser.add_argument("--anios", nargs="+", default=["2023", "2024", "2025"])
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
+    resumen = asyncio.run(principal(args))
+    imprimir(resumen)
+    ruta = guardar_resultados({"parametros": vars(args), **resumen}, args.salida, "carga")
+    print(f"✅ Resultados en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# Uso: python -m benchmarks.bench_endpoints [--repeticiones 20] [--url http://localhost:8000]
+#      python -m benchmarks.bench_endpoints --excel poa.xlsx --hoja POA
+#      python -m benchmarks.bench_endpoints --comparar resultados/endpoints_a1b2c3d.json resultados/endpoints_e4f5a6b.json
+# Mide la latencia de los endpoints principales sobre los datos de benchmarks.generar_datos
+# y escribe un JSON por commit (benchmarks/resultados/endpoints_<commit>.json).
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from benchmarks.comun import cliente, iniciar_sesion, listar_poas, percentil, leer_server_timing, guardar_resultados
+from benchmarks.generar_datos import USUARIO_BENCH_EMAIL, USUARIO_BENCH_CLAVE
+
+
+async def _escenarios(c, anio: str, excel=None, hoja=None):
+    """(nombre, método, ruta, argumentos de httpx) de cada endpoint a medir."""
+    poas = await listar_poas(c)
+    if not poas:
+        raise SystemExit("❌ No hay POAs. Ejecute primero: python -m benchmarks.generar_datos")
+    id_poa = poas[0]["id_poa"]
+    actividades = (await c.get(f"/poas/{id_poa}/actividades")).json()
+    id_actividad = min(a["id_actividad"] for a in actividades)
+
+    escenarios = [
+        ("login", "POST", "/login", {"data": {"username": USUARIO_BENCH_EMAIL, "password": USUARIO_BENCH_CLAVE}}),
+        ("listar_proyectos", "GET", "/proyectos/", {}),
+        ("listar_poas", "GET", "/poas/", {}),
+        ("actividades_de_poa", "GET", f"/poas/{id_poa}/actividades", {}),
+        ("tareas_de_actividad", "GET", f"/actividades/{id_actividad}/tareas", {}),
+        ("logs_carga_excel", "GET", "/logs-carga-excel/", {}),
+        ("reporte_poa", "POST", "/reporte-poa/", {"data": {"anio": anio, "tipo_proyecto": "Investigacion"}}),
+    ]
+    if excel:
+        # reemplaza las actividades del último POA (por codigo_poa) en cada repetición
+        contenido = Path(excel).read_bytes()
+        escenarios.append((
+            "transformar_excel", "POST", "/transformar_excel/",
+            {
+                "data": {"hoja": hoja, "id_poa": poas[-1]["id_poa"], "confirmacion": "true"},
+                "files": {"file": (Path(excel).name, contenido,
+                                   "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")},
+            },
+        ))
+    return escenarios
+
+
+async def medir(c, metodo, ruta, argumentos, repeticiones: int) -> dict:
+    await c.request(metodo, ruta, **argumentos)  # calentamiento
+    latencias, tiempos_db, consultas, errores = [], [], [], 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        r = await c.request(metodo, ruta, **argumentos)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        if r.status_code >= 400:
+            errores += 1
+        tiempo_db, cantidad = leer_server_timing(r.headers.get("server-timing"))
+        if tiempo_db is not None:
+            tiempos_db.append(tiempo_db)
+            consultas.append(cantidad)
+    return {
+        "repeticiones": repeticiones,
+        "errores": errores,
+        "min_ms": round(min(latencias), 2),
+        "p50_ms": round(percentil(latencias, 50), 2),
+        "p95_ms": round(percentil(latencias, 95), 2),
+        "max_ms": round(max(latencias), 2),
+        "media_ms": round(statistics.fmean(latencias), 2),
+        "db_p50_ms": round(percentil(tiempos_db, 50), 2) if tiempos_db else None,
+        "consultas": max(consultas) if consultas else None,
+    }
+
+
+async def ejecutar(args) -> dict:
+    async with cliente(args.url) as c:
+        await iniciar_sesion(c)
+        resultados = {}
+        for nombre, metodo, ruta, argumentos in await _escenarios(c, args.anio, args.excel, args.hoja):
+            if args.solo and nombre not in args.solo:
+                continue
+            resultados[nombre] = await medir(c, metodo, ruta, argumentos, args.repeticiones)
+            r = resultados[nombre]
+            print(f"✅ {nombre:<22} p50 {r['p50_ms']:>9.2f} ms  p95 {r['p95_ms']:>9.2f} ms  consultas {r['consultas']}")
+    return {"repeticiones": args.repeticiones, "url": args.url or "en_proceso", "endpoints": resultados}
+
+
+def comparar(base: str, actual: str):
+    antes = json.loads(Path(base).read_text(encoding="utf-8"))
+    despues = json.loads(Path(actual).read_text(encoding="utf-8"))
+    print(f"{'endpoint':<22} {'p50 ' + antes['commit']:>14} {'p50 ' + despues['commit']:>14} {'variación':>10} {'consultas':>12}")
+    for nombre in sorted(antes["endpoints"].keys() | despues["endpoints"].keys()):
+        a, d = antes["endpoints"].get(nombre), despues["endpoints"].get(nombre)
+        if not a or not d:
+            print(f"{nombre:<22} {'-' if not a else a['p50_ms']:>14} {'-' if not d else d['p50_ms']:>14}")
+            continue
+        variacion = (d["p50_ms"] - a["p50_ms"]) / a["p50_ms"] * 100 if a["p50_ms"] else 0
+        print(
+            f"{nombre:<22} {a['p50_ms']:>14.2f} {d['p50_ms']:>14.2f} {variacion:>+9.1f}% "
+            f"{str(a['consultas']) + ' -> ' + str(d['consultas']):>12}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de endpoints")
+    parser.add_argument("--url", help="Servidor a medir; por defecto la app se ejecuta en el mismo proceso")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--anio", default="2024", help="Año del reporte POA")
+    parser.add_argument("--solo", nargs="+", help="Medir solo estos escenarios")
+    parser.add_argument("--excel", help="Libro .xlsx para medir /transformar_excel/")
+    parser.add_argument("--hoja", default="POA", help="Hoja del libro para /transformar_excel/")
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "ACTUAL"), help="Compara dos archivos de resultados")
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+    resultados = asyncio.run(ejecutar(args))
+    ruta = guardar_resultados(resultados, args.salida, "endpoints")
+    print(f"✅ Resultados en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Uso: python -m benchmarks.bench_escalado --workers 1 2 4 --usuarios 64 --duracion 30
+# Escalado del perfil de producción (gunicorn.conf.py): levanta gunicorn con cada cantidad
+# de workers y ejecuta la mezcla de bench_carga sin pausas (usuarios en lazo cerrado) para
+# medir el throughput máximo. Reporta peticiones/s, p50/p95 y la aceleración respecto de la
+# primera cantidad de workers. Con más workers que CPUs el throughput deja de crecer, así
+# que el resultado depende de la máquina (se guarda la cantidad de CPUs con el resultado).
+# Requiere los datos de benchmarks.generar_datos y las variables de entorno de la app.
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import httpx
+from benchmarks.bench_carga import Carga
+from benchmarks.comun import cliente, iniciar_sesion, percentil, guardar_resultados
+
+
+def _cpus() -> int:
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def workers_por_defecto():
+    cantidades, n = [], 1
+    while n <= _cpus():
+        cantidades.append(n)
+        n *= 2
+    return cantidades
+
+
+def levantar_gunicorn(workers: int, puerto: int, preparar: bool) -> subprocess.Popen:
+    entorno = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "BIND": f"127.0.0.1:{puerto}",
+        "ACCESS_LOG": "/dev/null",
+        "PREPARAR_BASE_DATOS": "true" if preparar else "false",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def esperar_listo(url: str, proceso: subprocess.Popen, limite: float = 120):
+    fin = time.time() + limite
+    while time.time() < fin:
+        if proceso.poll() is not None:
+            raise SystemExit(f"❌ gunicorn terminó al arrancar (código {proceso.returncode})")
+        try:
+            if httpx.get(f"{url}/metrics", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise SystemExit("❌ gunicorn no respondió a tiempo")
+
+
+def detener(proceso: subprocess.Popen):
+    proceso.send_signal(signal.SIGTERM)
+    try:
+        proceso.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        proceso.kill()
+
+
+async def medir(url: str, args) -> dict:
+    limites = httpx.Limits(max_connections=args.usuarios + 5, max_keepalive_connections=args.usuarios + 5)
+    async with cliente(url, limits=limites) as c:
+        await iniciar_sesion(c)
+        carga = Carga(c, args)
+        await carga.preparar()
+        segundos = await carga.ejecutar()
+
+    muestras = [m for lista in carga.muestras.values() for m in lista]
+    latencias = [ms for _, ms in muestras]
+    return {
+        "peticiones": len(muestras),
+        "por_segundo": round(len(muestras) / segundos, 2),
+        "errores": sum(1 for estado, _ in muestras if estado == 0 or estado >= 500),
+        "p50_ms": round(percentil(latencias, 50), 2),
+        "p95_ms": round(percentil(latencias, 95), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput del perfil gunicorn según la cantidad de workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=workers_por_defecto())
+    parser.add_argument("--usuarios", type=int, default=64, help="Usuarios virtuales concurrentes (sin pausa)")
+    parser.add_argument("--duracion", type=int, default=30, help="Segundos de carga por cantidad de workers")
+    parser.add_argument("--rampa", type=int, default=2, help="Segundos para arrancar a todos los usuarios")
+    parser.add_argument("--puerto", type=int, default=8100)
+    parser.add_argument("--poas-excel", type=int, default=20, help="POAs reservados para subir libros")
+    parser.add_argument("--tareas-excel", type=int, default=60, help="Tareas del libro que se sube")
+    parser.add_argument("--anios", nargs="+", default=["2023", "2024", "2025"])
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    args = parser.parse_args()
+    args.pausa = 0.0
+
+    url = f"http://127.0.0.1:{args.puerto}"
+    resultados = {}
+    for indice, workers in enumerate(args.workers):
+        # la base se prepara solo en el primer arranque; los demás miden solo la app
+        proceso = levantar_gunicorn(workers, args.puerto, preparar=indice == 0)
+        try:
+            esperar_listo(url, proceso)
+            resultados[str(workers)] = asyncio.run(medir(url, args))
+        finally:
+            detener(proceso)
+
+    base = resultados[str(args.workers[0])]["por_segundo"] or 1
+    print(f"{'workers':>8} {'rps':>9} {'acel.':>7} {'err':>5} {'p50':>9} {'p95':>9}")
+    for workers, r in resultados.items():
+        r["aceleracion"] = round(r["por_segundo"] / base, 2)
+        print(
+            f"{workers:>8} {r['por_segundo']:>9} {r['aceleracion']:>6}x {r['errores']:>5} "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f}"
+        )
+
+    parametros = {k: v for k, v in vars(args).items() if k != "pausa"}
+    ruta = guardar_resultados({"parametros": parametros, "cpus": _cpus(), "workers": resultados}, args.salida, "escalado")
+    print(f"✅ Resultados en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Uso: python -m benchmarks.bench_importacion --repeticiones 5 --maximo-ms 1500
+# Tiempo y memoria de importar app.main en un proceso nuevo (arranque en frío de cada
+# worker). Reporta la mediana del tiempo de importación, la memoria residente y las
+# importaciones directas de app.main más costosas según python -X importtime.
+# Sale con código 1 si al importar la app se cargan bibliotecas que solo se usan en la
+# carga de Excel, los reportes o las exportaciones (MODULOS_DIFERIDOS), o si se supera
+# --maximo-ms / --maximo-rss-mb: sirve como control en CI contra regresiones.
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from benchmarks.comun import guardar_resultados
+
+# se importan en el primer uso (transformar_excel, app/reportes.py, app/exportacion.py)
+MODULOS_DIFERIDOS = ("pandas", "numpy", "openpyxl", "xlsxwriter", "reportlab", "pyarrow")
+
+_HIJO = f"""
+import json, resource, sys, time
+inicio = time.perf_counter()
+import app.main
+ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{
+    "ms": ms,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # Linux: KB
+    "diferidos_cargados": [m for m in {MODULOS_DIFERIDOS!r} if m in sys.modules],
+}}))
+"""
+
+
+def importar(importtime: bool = False):
+    comando = [sys.executable, "-W", "ignore"] + (["-X", "importtime"] if importtime else []) + ["-c", _HIJO]
+    r = subprocess.run(comando, capture_output=True, text=True)
+    if r.returncode != 0:
+        raise SystemExit(f"❌ No se pudo importar app.main:\n{r.stderr[-2000:]}")
+    return json.loads(r.stdout.strip().splitlines()[-1]), r.stderr
+
+
+def importaciones_costosas(salida_importtime: str, cantidad: int = 10):
+    """Importaciones directas de app.main ordenadas por tiempo acumulado (ms)."""
+    directas, pendientes = [], []
+    for linea in salida_importtime.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        if not acumulado.strip().isdigit():
+            continue
+        # un espacio separador y dos por nivel; los hijos se listan antes que su padre
+        nivel = (len(nombre) - len(nombre.lstrip()) - 1) // 2
+        if nivel == 1:
+            pendientes.append((nombre.strip(), int(acumulado) / 1000))
+        elif nivel == 0:
+            if nombre.strip() == "app.main":
+                directas = pendientes
+            pendientes = []
+    directas.sort(key=lambda d: d[1], reverse=True)
+    return {nombre: round(ms, 1) for nombre, ms in directas[:cantidad]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo y memoria de importar app.main")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--maximo-ms", type=float, help="Falla si la mediana supera este tiempo")
+    parser.add_argument("--maximo-rss-mb", type=float, help="Falla si la memoria residente supera este valor")
+    parser.add_argument("--salida", help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
+    # la primera importación compila los .pyc (como el primer arranque de un despliegue); no se cuenta
+    importar()
+    mediciones = [importar()[0] for _ in range(args.repeticiones)]
+    _, detalle = importar(importtime=True)
+
+    tiempos = [m["ms"] for m in mediciones]
+    resumen = {
+        "mediana_ms": round(statistics.median(tiempos), 1),
+        "minimo_ms": round(min(tiempos), 1),
+        "rss_mb": round(max(m["rss_mb"] for m in mediciones), 1),
+        "diferidos_cargados": sorted({d for m in mediciones for d in m["diferidos_cargados"]}),
+        "importaciones": importaciones_costosas(detalle),
+    }
+
+    print(f"Importar app.main: mediana {resumen['mediana_ms']} ms, mínimo {resumen['minimo_ms']} ms, RSS {resumen['rss_mb']} MB")
+    for nombre, ms in resumen["importaciones"].items():
+        print(f"  {nombre:<40} {ms:>8.1f} ms")
+    ruta = guardar_resultados({"parametros": vars(args), **resumen}, args.salida, "importacion")
+    print(f"✅ Resultados en {ruta}")
+
+    errores = []
+    if resumen["diferidos_cargados"]:
+        errores.append(f"se cargan al importar la app: {', '.join(resumen['diferidos_cargados'])}")
+    if args.maximo_ms and resumen["mediana_ms"] > args.maximo_ms:
+        errores.append(f"mediana {resumen['mediana_ms']} ms > {args.maximo_ms} ms")
+    if args.maximo_rss_mb and resumen["rss_mb"] > args.maximo_rss_mb:
+        errores.append(f"RSS {resumen['rss_mb']} MB > {args.maximo_rss_mb} MB")
+    if errores:
+        for error in errores:
+            print(f"❌ {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Uso: pip install pytest pytest-benchmark
+#      pytest benchmarks/bench_transformar_excel.py --benchmark-autosave
+#      BENCH_EXCEL_TAREAS=10,1000,10000,50000 pytest benchmarks/bench_transformar_excel.py --benchmark-json excel.json
+#      pytest-benchmark compare 0001 0002    (compara dos corridas guardadas con --benchmark-autosave)
+# Mide el tiempo de transformar_excel sobre libros sintéticos de distinto tamaño y guarda
+# en extra_info la memoria pico (tracemalloc) de una ejecución. No requiere base de datos.
+import os
+import tracemalloc
+import pytest
+from app.scripts.transformador_excel import transformar_excel
+from benchmarks.generar_excel import generar_libro_poa, HOJA_POR_DEFECTO
+
+pytest.importorskip("pytest_benchmark")
+
+TAMANOS = [int(n) for n in os.getenv("BENCH_EXCEL_TAREAS", "10,1000,10000").split(",")]
+
+# libros grandes: menos rondas para que la suite termine en minutos
+RONDAS_POR_TAMANO = {10: 20, 1000: 5}
+RONDAS_LIBROS_GRANDES = 2
+
+
+@pytest.fixture(scope="module")
+def libros():
+    # primera lectura fuera de las mediciones: carga los imports diferidos de pandas/openpyxl
+    transformar_excel(generar_libro_poa(10), HOJA_POR_DEFECTO)
+    cache = {}
+
+    def obtener(tareas: int) -> bytes:
+        if tareas not in cache:
+            cache[tareas] = generar_libro_poa(tareas)
+        return cache[tareas]
+
+    return obtener
+
+
+def _memoria_pico(funcion, *args):
+    tracemalloc.start()
+    try:
+        resultado = funcion(*args)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, pico
+
+
+@pytest.mark.parametrize("tareas", TAMANOS)
+def test_transformar_excel(benchmark, libros, tareas):
+    contenido = libros(tareas)
+
+    # la medición de memoria va fuera de las rondas cronometradas: tracemalloc las haría más lentas
+    resultado, pico = _memoria_pico(transformar_excel, contenido, HOJA_POR_DEFECTO)
+    assert sum(len(a["tareas"]) for a in resultado["actividades"]) == tareas
+    assert resultado["total_poa"]["total"] == pytest.approx(
+        sum(a["total_por_actividad"] for a in resultado["actividades"]), abs=0.01
+    )
+
+    benchmark.group = "transformar_excel"
+    benchmark.extra_info.update({
+        "tareas": tareas,
+        "bytes_libro": len(contenido),
+        "memoria_pico_mb": round(pico / 2**20, 2),
+    })
+    benchmark.pedantic(
+        transformar_excel,
+        args=(contenido, HOJA_POR_DEFECTO),
+        rounds=RONDAS_POR_TAMANO.get(tareas, RONDAS_LIBROS_GRANDES),
+        iterations=1,
+        warmup_rounds=1 if tareas <= 1000 else 0,
+    )
+
+
+@pytest.mark.parametrize("meses_con_valor", [1, 6, 12])
+def test_transformar_excel_columnas_fecha(benchmark, meses_con_valor):
+    """Mismo tamaño de libro con más o menos celdas de programación mensual."""
+    contenido = generar_libro_poa(1000, meses_con_valor=meses_con_valor)
+    _, pico = _memoria_pico(transformar_excel, contenido, HOJA_POR_DEFECTO)
+
+    benchmark.group = "transformar_excel_meses"
+    benchmark.extra_info.update({"meses_con_valor": meses_con_valor, "memoria_pico_mb": round(pico / 2**20, 2)})
+    benchmark.pedantic(transformar_excel, args=(contenido, HOJA_POR_DEFECTO), rounds=5, iterations=1, warmup_rounds=1)
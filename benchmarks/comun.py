@@ -0,0 +1,95 @@
+# Utilidades compartidas por los benchmarks: cliente HTTP (en proceso o contra un
+# servidor), inicio de sesión con el usuario de benchmarks, percentiles y lectura
+# del encabezado Server-Timing que agrega app/instrumentacion.py.
+import json
+import math
+import re
+import subprocess
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import httpx
+from benchmarks.generar_datos import USUARIO_BENCH_EMAIL, USUARIO_BENCH_CLAVE
+
+DIRECTORIO_RESULTADOS = Path(__file__).parent / "resultados"
+
+_RE_TIMING = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) consultas")?')
+
+
+@asynccontextmanager
+async def cliente(url: Optional[str] = None, **opciones):
+    """
+    Sin url la app se ejecuta en el mismo proceso (httpx.ASGITransport), con su
+    evento de startup; con url se mide un servidor ya levantado (uvicorn/gunicorn).
+    """
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=120, **opciones) as c:
+            yield c
+        return
+
+    from app.main import app, on_startup, on_shutdown
+    await on_startup()
+    try:
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://bench", timeout=120, **opciones) as c:
+            yield c
+    finally:
+        await on_shutdown()
+
+
+async def iniciar_sesion(c: httpx.AsyncClient) -> str:
+    r = await c.post("/login", data={"username": USUARIO_BENCH_EMAIL, "password": USUARIO_BENCH_CLAVE})
+    if r.status_code != 200:
+        raise SystemExit(
+            f"❌ No se pudo iniciar sesión con {USUARIO_BENCH_EMAIL} ({r.status_code}). "
+            "Ejecute primero: python -m benchmarks.generar_datos"
+        )
+    token = r.json()["access_token"]
+    c.headers["Authorization"] = f"Bearer {token}"
+    return token
+
+
+async def listar_poas(c: httpx.AsyncClient) -> list:
+    """
+    POAs de /poas/ ordenados por codigo_poa. El listado no tiene orden garantizado; así
+    cada ejecución mide los mismos POAs sobre los datos de una misma --semilla.
+    """
+    return sorted((await c.get("/poas/")).json(), key=lambda p: p["codigo_poa"])
+
+
+def percentil(valores, p: float) -> float:
+    """Percentil por rango más cercano (p entre 0 y 100)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[indice]
+
+
+def leer_server_timing(encabezado: Optional[str]):
+    """Retorna (ms en base de datos, cantidad de consultas) del encabezado Server-Timing."""
+    tiempo_db, consultas = None, None
+    for nombre, duracion, cantidad in _RE_TIMING.findall(encabezado or ""):
+        if nombre == "db":
+            tiempo_db, consultas = float(duracion), int(cantidad) if cantidad else None
+    return tiempo_db, consultas
+
+
+def commit_actual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def guardar_resultados(resultados: dict, salida: Optional[str], prefijo: str) -> Path:
+    """Escribe el JSON con claves ordenadas para que se pueda comparar con diff."""
+    commit = commit_actual()
+    ruta = Path(salida) if salida else DIRECTORIO_RESULTADOS / f"{prefijo}_{commit}.json"
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    contenido = {"commit": commit, "fecha": datetime.now().isoformat(timespec="seconds"), **resultados}
+    ruta.write_text(json.dumps(contenido, indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+    return ruta
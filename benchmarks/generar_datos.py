@@ -0,0 +1,354 @@
+# Uso: python -m benchmarks.generar_datos --proyectos 200 --anios 2023 2024 2025
+# Genera un conjunto de datos sintético (proyectos, POAs por año, actividades, tareas,
+# programación mensual de 12 meses, historial y logs de carga) sobre los catálogos de
+# app/scripts/catalogos.py, con inserciones masivas. Con la misma --semilla se obtienen
+# los mismos datos, ids incluidos, de modo que los resultados de benchmarks son comparables
+# entre commits (los benchmarks eligen los POAs por codigo_poa, no por el orden del listado).
+# Para regenerar sobre la misma base se agrega --limpiar, que antes borra todo lo generado
+# (códigos BENCH-...) junto con lo que los benchmarks hayan creado encima.
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from passlib.context import CryptContext
+from sqlalchemy import delete, insert, or_, select
+from app import models, particiones
+from app.database import engine, SessionLocal
+from app.resumen import refrescar_resumen_completo
+from app.scripts.catalogos import TIPOS_POA, ESTADOS_PROYECTO, ESTADOS_POA
+from app.scripts.init_data import seed_all_data
+
+TAMANO_LOTE_SQL = 1000
+# filas de programación acumuladas antes de escribir (acota la memoria en escalas grandes)
+FILAS_POR_ESCRITURA = 50_000
+
+# prefijo de los códigos de periodo, proyecto y POA generados
+PREFIJO = "BENCH-"
+
+USUARIO_BENCH_EMAIL = "bench@poa.local"
+USUARIO_BENCH_CLAVE = "bench"
+
+# escalas predefinidas: proyectos, actividades por POA, tareas por actividad
+ESCALAS = {
+    "pequena": (50, 4, 5),
+    "mediana": (300, 6, 8),
+    "grande": (1500, 8, 10),
+}
+
+_CENTAVOS = Decimal("0.01")
+
+
+async def _insertar(db, modelo, filas):
+    for inicio in range(0, len(filas), TAMANO_LOTE_SQL):
+        await db.execute(insert(modelo).values(filas[inicio:inicio + TAMANO_LOTE_SQL]))
+
+
+def _uuid(aleatorio: random.Random) -> uuid.UUID:
+    """UUID v4 tomado del generador con semilla: los mismos ids en cada regeneración."""
+    return uuid.UUID(int=aleatorio.getrandbits(128), version=4)
+
+
+async def _usuario_bench(db, id_usuario: uuid.UUID) -> models.Usuario:
+    result = await db.execute(select(models.Usuario).where(models.Usuario.email == USUARIO_BENCH_EMAIL))
+    usuario = result.scalars().first()
+    if usuario:
+        return usuario
+    result = await db.execute(select(models.Rol).where(models.Rol.nombre_rol == "Administrador"))
+    rol = result.scalars().first()
+    usuario = models.Usuario(
+        id_usuario=id_usuario,
+        nombre_usuario="Usuario Benchmark",
+        email=USUARIO_BENCH_EMAIL,
+        password_hash=CryptContext(schemes=["bcrypt"], deprecated="auto").hash(USUARIO_BENCH_CLAVE),
+        id_rol=rol.id_rol,
+        activo=True,
+    )
+    db.add(usuario)
+    await db.flush()
+    return usuario
+
+
+async def _catalogos(db):
+    """Ids de los catálogos sembrados por seed_all_data, indexados por código o nombre."""
+    tipos = {t.codigo_tipo: t for t in (await db.execute(select(models.TipoPOA))).scalars().all()}
+    estados_proyecto = {
+        e.nombre: e.id_estado_proyecto for e in (await db.execute(select(models.EstadoProyecto))).scalars().all()
+    }
+    estados_poa = {e.nombre: e.id_estado_poa for e in (await db.execute(select(models.EstadoPOA))).scalars().all()}
+
+    result = await db.execute(
+        select(models.TipoPoaDetalleTarea.id_tipo_poa, models.DetalleTarea)
+        .join(models.DetalleTarea, models.DetalleTarea.id_detalle_tarea == models.TipoPoaDetalleTarea.id_detalle_tarea)
+    )
+    detalles_por_tipo = {}
+    for id_tipo_poa, detalle in result.all():
+        detalles_por_tipo.setdefault(id_tipo_poa, []).append(detalle)
+    return tipos, estados_proyecto, estados_poa, detalles_por_tipo
+
+
+async def limpiar(db) -> dict:
+    """
+    Borra los datos de una generación anterior, hijos antes que padres, incluidas las
+    reformas, certificaciones y ejecuciones creadas sobre ellos. No hace commit.
+    """
+    m = models
+    proyectos = select(m.Proyecto.id_proyecto).where(m.Proyecto.codigo_proyecto.like(f"{PREFIJO}%"))
+    periodos = select(m.Periodo.id_periodo).where(m.Periodo.codigo_periodo.like(f"{PREFIJO}%"))
+    poas = select(m.Poa.id_poa).where(or_(m.Poa.id_proyecto.in_(proyectos), m.Poa.id_periodo.in_(periodos)))
+    actividades = select(m.Actividad.id_actividad).where(m.Actividad.id_poa.in_(poas))
+    tareas = select(m.Tarea.id_tarea).where(m.Tarea.id_actividad.in_(actividades))
+    reformas = select(m.ReformaPoa.id_reforma).where(m.ReformaPoa.id_poa.in_(poas))
+
+    borrados = [
+        (m.EjecucionPresupuestaria, or_(
+            m.EjecucionPresupuestaria.id_poa.in_(poas), m.EjecucionPresupuestaria.id_tarea.in_(tareas)
+        )),
+        (m.ControlPresupuestario, or_(
+            m.ControlPresupuestario.id_poa.in_(poas), m.ControlPresupuestario.id_tarea.in_(tareas),
+            m.ControlPresupuestario.id_reforma.in_(reformas),
+        )),
+        (m.ProgramacionMensual, m.ProgramacionMensual.id_tarea.in_(tareas)),
+        (m.Tarea, m.Tarea.id_tarea.in_(tareas)),
+        (m.Actividad, m.Actividad.id_actividad.in_(actividades)),
+        (m.HistoricoPoa, or_(m.HistoricoPoa.id_poa.in_(poas), m.HistoricoPoa.id_reforma.in_(reformas))),
+        (m.SnapshotPoa, or_(m.SnapshotPoa.id_poa.in_(poas), m.SnapshotPoa.id_reforma.in_(reformas))),
+        (m.ReformaPoa, m.ReformaPoa.id_reforma.in_(reformas)),
+        (m.ResumenPresupuestoPoa, or_(
+            m.ResumenPresupuestoPoa.id_poa.in_(poas), m.ResumenPresupuestoPoa.id_proyecto.in_(proyectos)
+        )),
+        (m.Poa, m.Poa.id_poa.in_(poas)),
+        (m.HistoricoProyecto, m.HistoricoProyecto.id_proyecto.in_(proyectos)),
+        (m.Proyecto, m.Proyecto.id_proyecto.in_(proyectos)),
+        (m.Periodo, m.Periodo.id_periodo.in_(periodos)),
+        (m.LogCargaExcel, m.LogCargaExcel.codigo_poa.like(f"{PREFIJO}%")),
+    ]
+    conteos = {}
+    for modelo, condicion in borrados:
+        result = await db.execute(
+            delete(modelo).where(condicion).execution_options(synchronize_session=False)
+        )
+        conteos[modelo.__tablename__] = result.rowcount
+    return conteos
+
+
+def _repartir(total: Decimal, partes: int):
+    """Divide un monto en `partes` cuotas que suman exactamente el total."""
+    cuota = (total / partes).quantize(_CENTAVOS)
+    cuotas = [cuota] * partes
+    cuotas[-1] = total - cuota * (partes - 1)
+    return cuotas
+
+
+async def generar(
+    proyectos: int,
+    anios: list,
+    actividades_por_poa: int,
+    tareas_por_actividad: int,
+    historial_por_poa: int = 20,
+    logs: int = 5000,
+    semilla: int = 42,
+    limpiar_anteriores: bool = False,
+) -> dict:
+    aleatorio = random.Random(semilla)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+        await particiones.asegurar_particiones(conn, anios)
+    await seed_all_data()
+
+    async with SessionLocal() as db:
+        if limpiar_anteriores:
+            for tabla, cantidad in (await limpiar(db)).items():
+                if cantidad:
+                    print(f"🧹 {tabla}: {cantidad} filas eliminadas")
+        else:
+            anterior = await db.execute(
+                select(models.Periodo.id_periodo).where(models.Periodo.codigo_periodo.like(f"{PREFIJO}%")).limit(1)
+            )
+            if anterior.first():
+                raise SystemExit("❌ La base ya tiene datos generados. Vuelva a ejecutar con --limpiar para reemplazarlos")
+
+        usuario = await _usuario_bench(db, _uuid(aleatorio))
+        tipos, estados_proyecto, estados_poa, detalles_por_tipo = await _catalogos(db)
+        # solo tipos con financiamiento y detalles de tarea asociados
+        codigos = [t["codigo"] for t in TIPOS_POA if t["presupuesto"] and detalles_por_tipo.get(tipos[t["codigo"]].id_tipo_poa)]
+        nombres_estado_proyecto = [e["nombre"] for e in ESTADOS_PROYECTO]
+        nombres_estado_poa = [e["nombre"] for e in ESTADOS_POA]
+
+        periodos = {}
+        filas_periodo = []
+        for anio in anios:
+            periodos[anio] = _uuid(aleatorio)
+            filas_periodo.append({
+                "id_periodo": periodos[anio],
+                "codigo_periodo": f"{PREFIJO}{anio}",
+                "nombre_periodo": f"Enero-Diciembre {anio}",
+                "fecha_inicio": date(anio, 1, 1),
+                "fecha_fin": date(anio, 12, 31),
+                "anio": str(anio),
+                "mes": "Enero-Diciembre",
+            })
+
+        await _insertar(db, models.Periodo, filas_periodo)
+
+        # orden de escritura respetando las claves foráneas
+        pendientes = {
+            models.Proyecto: [], models.Poa: [], models.Actividad: [], models.Tarea: [],
+            models.ProgramacionMensual: [], models.HistoricoPoa: [],
+        }
+        conteos = {modelo.__tablename__: 0 for modelo in pendientes}
+        (filas_proyecto, filas_poa, filas_actividad, filas_tarea,
+         filas_programacion, filas_historial) = pendientes.values()
+        poas_generados = []
+
+        async def escribir_pendientes():
+            for modelo, filas in pendientes.items():
+                await _insertar(db, modelo, filas)
+                conteos[modelo.__tablename__] += len(filas)
+                filas.clear()
+
+        for n in range(proyectos):
+            codigo = aleatorio.choice(codigos)
+            tipo = tipos[codigo]
+            id_proyecto = _uuid(aleatorio)
+            codigo_proyecto = f"{PREFIJO}{codigo}-{n:05d}"
+            presupuesto = Decimal(tipo.presupuesto_maximo).quantize(_CENTAVOS)
+            filas_proyecto.append({
+                "id_proyecto": id_proyecto,
+                "codigo_proyecto": codigo_proyecto,
+                "titulo": f"Proyecto sintético {n} ({tipo.nombre})",
+                "id_tipo_proyecto": tipo.id_tipo_poa,  # TIPO_PROYECTO replica los ids de TIPO_POA
+                "id_estado_proyecto": estados_proyecto[aleatorio.choice(nombres_estado_proyecto)],
+                "id_director_proyecto": f"Director {n % 97}",
+                "presupuesto_aprobado": presupuesto,
+                "fecha_creacion": datetime(anios[0], 1, 1),
+                "fecha_inicio": date(anios[0], 1, 1),
+                "fecha_fin": date(anios[-1], 12, 31),
+            })
+
+            for anio in anios:
+                id_poa = _uuid(aleatorio)
+                filas_poa.append({
+                    "id_poa": id_poa,
+                    "id_proyecto": id_proyecto,
+                    "id_periodo": periodos[anio],
+                    "codigo_poa": f"{codigo_proyecto}-{anio}",
+                    "fecha_creacion": datetime(anio, 1, 1),
+                    "id_estado_poa": estados_poa[aleatorio.choice(nombres_estado_poa)],
+                    "id_tipo_poa": tipo.id_tipo_poa,
+                    "anio_ejecucion": str(anio),
+                    "presupuesto_asignado": (presupuesto / len(anios)).quantize(_CENTAVOS),
+                })
+                poas_generados.append((id_poa, f"{codigo_proyecto}-{anio}", anio))
+
+                for a in range(actividades_por_poa):
+                    id_actividad = _uuid(aleatorio)
+                    total_actividad = Decimal("0")
+                    for t in range(tareas_por_actividad):
+                        detalle = aleatorio.choice(detalles_por_tipo[tipo.id_tipo_poa])
+                        cantidad = Decimal(aleatorio.randint(1, 10))
+                        precio = Decimal(aleatorio.randint(1000, 50000)) / 100
+                        total = (cantidad * precio).quantize(_CENTAVOS)
+                        total_actividad += total
+                        id_tarea = _uuid(aleatorio)
+                        filas_tarea.append({
+                            "id_tarea": id_tarea,
+                            "id_actividad": id_actividad,
+                            "id_detalle_tarea": detalle.id_detalle_tarea,
+                            "nombre": f"{a + 1}.{t + 1} {detalle.nombre}",
+                            "detalle_descripcion": detalle.descripcion or None,
+                            "cantidad": cantidad,
+                            "precio_unitario": precio,
+                            "total": total,
+                            "saldo_disponible": total,
+                            "lineaPaiViiv": aleatorio.randint(1, 12),
+                        })
+                        for mes, valor in enumerate(_repartir(total, 12), start=1):
+                            filas_programacion.append({
+                                "id_programacion": _uuid(aleatorio),
+                                "id_tarea": id_tarea,
+                                "mes": f"{mes:02d}-{anio}",
+                                "valor": valor,
+                            })
+                    filas_actividad.append({
+                        "id_actividad": id_actividad,
+                        "id_poa": id_poa,
+                        "descripcion_actividad": f"Actividad {a + 1} del POA {codigo_proyecto}-{anio}",
+                        "total_por_actividad": total_actividad,
+                        "saldo_actividad": total_actividad,
+                    })
+
+                inicio_anio = datetime(anio, 1, 1)
+                for h in range(historial_por_poa):
+                    filas_historial.append({
+                        "id_historico": _uuid(aleatorio),
+                        "id_poa": id_poa,
+                        "id_usuario": usuario.id_usuario,
+                        "fecha_modificacion": inicio_anio + timedelta(minutes=aleatorio.randint(0, 525_000)),
+                        "campo_modificado": "Tarea",
+                        "valor_anterior": f"Cantidad: {h}, Precio: 10.00",
+                        "valor_nuevo": f"Cantidad: {h + 1}, Precio: 10.00",
+                        "justificacion": "Ajuste generado para benchmarks",
+                    })
+
+            if len(filas_programacion) >= FILAS_POR_ESCRITURA:
+                await escribir_pendientes()
+        await escribir_pendientes()
+
+        filas_log = []
+        for n in range(logs):
+            id_poa, codigo_poa, anio = aleatorio.choice(poas_generados)
+            filas_log.append({
+                "id_log": _uuid(aleatorio),
+                "id_poa": str(id_poa),
+                "codigo_poa": codigo_poa,
+                "id_usuario": str(usuario.id_usuario),
+                "usuario_nombre": usuario.nombre_usuario,
+                "usuario_email": usuario.email,
+                "proyecto_nombre": codigo_poa,
+                "fecha_carga": datetime(anio, 1, 1) + timedelta(minutes=aleatorio.randint(0, 525_000)),
+                "nombre_archivo": f"poa_{n}.xlsx",
+                "hoja": "POA",
+                "mensaje": "Carga generada para benchmarks",
+            })
+
+        await _insertar(db, models.LogCargaExcel, filas_log)
+        conteos[models.LogCargaExcel.__tablename__] = len(filas_log)
+        await refrescar_resumen_completo(db)
+        await db.commit()
+
+    return conteos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos para benchmarks")
+    parser.add_argument("--escala", choices=ESCALAS.keys(), default="pequena")
+    parser.add_argument("--proyectos", type=int, help="Sobrescribe la cantidad de proyectos de la escala")
+    parser.add_argument("--anios", type=int, nargs="+", default=[2023, 2024, 2025])
+    parser.add_argument("--actividades", type=int, help="Actividades por POA")
+    parser.add_argument("--tareas", type=int, help="Tareas por actividad")
+    parser.add_argument("--historial", type=int, default=20, help="Cambios de historial por POA")
+    parser.add_argument("--logs", type=int, default=5000, help="Registros de LOG_CARGA_EXCEL")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--limpiar", action="store_true", help="Borra antes los datos de una generación anterior")
+    args = parser.parse_args()
+
+    proyectos, actividades, tareas = ESCALAS[args.escala]
+    conteos = asyncio.run(generar(
+        proyectos=args.proyectos or proyectos,
+        anios=sorted(args.anios),
+        actividades_por_poa=args.actividades or actividades,
+        tareas_por_actividad=args.tareas or tareas,
+        historial_por_poa=args.historial,
+        logs=args.logs,
+        semilla=args.semilla,
+        limpiar_anteriores=args.limpiar,
+    ))
+    for tabla, cantidad in conteos.items():
+        print(f"✅ {tabla}: {cantidad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# Uso: python -m benchmarks.generar_excel --tareas 1000 --salida poa_1000.xlsx
+# Genera libros POA sintéticos con el formato que espera app/scripts/transformador_excel.py:
+#   - fila anterior al encabezado con "TOTAL POR ACTIVIDAD" (detectar_total_por_actividad)
+#   - fila de encabezados que empieza con "(1) ..." (detectar_inicio), con DESCRIPCIÓN O
+#     DETALLE, ITEM PRESUPUESTARIO, CANTIDAD, PRECIO UNITARIO, TOTAL, las 12 fechas y SUMAN
+#     (validar_fila_encabezados) y el total de la actividad 1
+#   - actividades (2), (3), ... con sus tareas y la fila final TOTAL PRESUPUESTO
+# Los ítems y nombres de tarea salen de app/scripts/catalogos.py (sin base de datos).
+import argparse
+import io
+import math
+import random
+from datetime import datetime
+from decimal import Decimal
+import xlsxwriter
+from app.scripts.catalogos import DETALLES_CON_ASOCIACIONES
+
+HOJA_POR_DEFECTO = "POA"
+
+# columnas del libro (índices desde 0); la columna A queda vacía como en las plantillas
+COL_NOMBRE = 1
+COL_DESCRIPCION = 2
+COL_ITEM = 3
+COL_CANTIDAD = 4
+COL_PRECIO = 5
+COL_TOTAL = 6
+COL_PRIMERA_FECHA = 7
+COL_SUMAN = COL_PRIMERA_FECHA + 12
+COL_TOTAL_ACTIVIDAD = COL_SUMAN + 1
+
+FILAS_TITULO = 3  # filas libres antes de "TOTAL POR ACTIVIDAD"
+
+_CENTAVOS = Decimal("0.01")
+
+
+def _repartir(total: Decimal, partes: int):
+    cuota = (total / partes).quantize(_CENTAVOS)
+    return [cuota] * (partes - 1) + [total - cuota * (partes - 1)]
+
+
+def generar_libro_poa(
+    tareas: int,
+    tareas_por_actividad: int = 10,
+    anio: int = 2025,
+    meses_con_valor: int = 12,
+    hoja: str = HOJA_POR_DEFECTO,
+    semilla: int = 42,
+) -> bytes:
+    """
+    Retorna el .xlsx (bytes) de un POA con `tareas` filas de tarea repartidas en
+    actividades de `tareas_por_actividad`. Cada tarea programa su total en los primeros
+    `meses_con_valor` meses, así SUMAN y TOTAL cuadran.
+    """
+    aleatorio = random.Random(semilla)
+    detalles = [d for d in DETALLES_CON_ASOCIACIONES if d["codigo"].isdigit()]
+    fechas = [datetime(anio, mes, 1) for mes in range(1, 13)]
+    cantidad_actividades = max(1, math.ceil(tareas / tareas_por_actividad))
+
+    salida = io.BytesIO()
+    # constant_memory: escribe fila por fila, necesario para libros de decenas de miles de filas
+    libro = xlsxwriter.Workbook(salida, {"in_memory": True, "constant_memory": True})
+    hoja_poa = libro.add_worksheet(hoja)
+    formato_fecha = libro.add_format({"num_format": "yyyy-mm-dd"})
+
+    fila = FILAS_TITULO
+    hoja_poa.write(0, COL_NOMBRE, "PLAN OPERATIVO ANUAL (POA) - LIBRO SINTÉTICO")
+    hoja_poa.write(fila, COL_TOTAL_ACTIVIDAD, "TOTAL POR ACTIVIDAD")
+    fila += 1
+
+    pendientes = tareas
+    total_poa = Decimal("0")
+    totales_mes = [Decimal("0")] * 12
+    for numero in range(1, cantidad_actividades + 1):
+        cantidad_tareas = min(tareas_por_actividad, pendientes)
+        pendientes -= cantidad_tareas
+
+        filas_tareas = []
+        total_actividad = Decimal("0")
+        for t in range(cantidad_tareas):
+            detalle = aleatorio.choice(detalles)
+            cantidad = aleatorio.randint(1, 12)
+            precio = Decimal(aleatorio.randint(1000, 90000)) / 100
+            total = (cantidad * precio).quantize(_CENTAVOS)
+            total_actividad += total
+            valores = _repartir(total, meses_con_valor) + [None] * (12 - meses_con_valor)
+            filas_tareas.append((
+                f"{numero}.{t + 1} {detalle['nombre']}",
+                detalle["descripcion"] or detalle["nombre"],
+                int(detalle["codigo"]),
+                cantidad, precio, total, valores,
+            ))
+        total_poa += total_actividad
+
+        # fila de la actividad; la de (1) es además la fila de encabezados
+        hoja_poa.write(fila, COL_NOMBRE, f"({numero}) Actividad sintética {numero}")
+        if numero == 1:
+            hoja_poa.write(fila, COL_DESCRIPCION, "DESCRIPCIÓN O DETALLE")
+            hoja_poa.write(fila, COL_ITEM, "ITEM PRESUPUESTARIO")
+            hoja_poa.write(fila, COL_CANTIDAD, "CANTIDAD (Meses de contrato)")
+            hoja_poa.write(fila, COL_PRECIO, "PRECIO UNITARIO")
+            hoja_poa.write(fila, COL_TOTAL, "TOTAL")
+            for i, fecha in enumerate(fechas):
+                hoja_poa.write_datetime(fila, COL_PRIMERA_FECHA + i, fecha, formato_fecha)
+            hoja_poa.write(fila, COL_SUMAN, "SUMAN")
+        hoja_poa.write_number(fila, COL_TOTAL_ACTIVIDAD, float(total_actividad))
+        fila += 1
+
+        for nombre, descripcion, item, cantidad, precio, total, valores in filas_tareas:
+            hoja_poa.write(fila, COL_NOMBRE, nombre)
+            hoja_poa.write(fila, COL_DESCRIPCION, descripcion)
+            hoja_poa.write_number(fila, COL_ITEM, item)
+            hoja_poa.write_number(fila, COL_CANTIDAD, cantidad)
+            hoja_poa.write_number(fila, COL_PRECIO, float(precio))
+            hoja_poa.write_number(fila, COL_TOTAL, float(total))
+            for i, valor in enumerate(valores):
+                if valor is not None:
+                    hoja_poa.write_number(fila, COL_PRIMERA_FECHA + i, float(valor))
+                    totales_mes[i] += valor
+            hoja_poa.write_number(fila, COL_SUMAN, float(total))
+            fila += 1
+
+    hoja_poa.write(fila, COL_NOMBRE, "TOTAL PRESUPUESTO")
+    for i, valor in enumerate(totales_mes):
+        if valor:
+            hoja_poa.write_number(fila, COL_PRIMERA_FECHA + i, float(valor))
+    hoja_poa.write_number(fila, COL_SUMAN, float(total_poa))
+    hoja_poa.write_number(fila, COL_TOTAL_ACTIVIDAD, float(total_poa))
+
+    libro.close()
+    return salida.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un libro POA sintético")
+    parser.add_argument("--tareas", type=int, default=100, help="Filas de tarea (10 a 50000)")
+    parser.add_argument("--tareas-por-actividad", type=int, default=10)
+    parser.add_argument("--anio", type=int, default=2025)
+    parser.add_argument("--meses", type=int, default=12, choices=range(1, 13), help="Meses con valor por tarea")
+    parser.add_argument("--hoja", default=HOJA_POR_DEFECTO)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", required=True)
+    args = parser.parse_args()
+
+    contenido = generar_libro_poa(
+        args.tareas, args.tareas_por_actividad, args.anio, args.meses, args.hoja, args.semilla
+    )
+    with open(args.salida, "wb") as archivo:
+        archivo.write(contenido)
+    print(f"✅ Libro con {args.tareas} tareas escrito en {args.salida} ({len(contenido) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Perfil de producción: gunicorn -c gunicorn.conf.py app.main:app
+# Un proceso maestro con WEB_CONCURRENCY workers uvicorn (app/servidor.py). La app se
+# importa una vez en el maestro (preload_app) y los workers la heredan al hacer fork; la
+# preparación de la base (tablas, particiones, triggers, datos iniciales) también se
+# ejecuta una sola vez en el maestro y los workers arrancan con PREPARAR_BASE_DATOS=false.
+#
+# Cada worker abre su propio pool: WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW),
+# más una conexión LISTEN por worker con EVENTOS_BUS=postgres, debe caber en el
+# max_connections de PostgreSQL.
+import asyncio
+import os
+
+
+def _cpus() -> int:
+    # CPUs asignadas al proceso; con límites de cgroup (cuota de Docker) usar WEB_CONCURRENCY
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+# workers async: uno por CPU basta, cada uno atiende muchas conexiones concurrentes
+workers = int(os.getenv("WEB_CONCURRENCY", 0)) or _cpus()
+worker_class = "app.servidor.WorkerPoa"
+preload_app = True
+
+# SIGTERM: los workers terminan las peticiones en curso (subidas de Excel) hasta
+# graceful_timeout; después el maestro los mata. docker stop debe esperar más que esto.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", 120))
+# latido worker -> maestro; un worker bloqueado más tiempo se reinicia
+timeout = int(os.getenv("TIMEOUT", 60))
+keepalive = int(os.getenv("KEEPALIVE", 5))
+# reinicio periódico de workers para acotar el crecimiento de memoria (0 = nunca)
+max_requests = int(os.getenv("MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", 0))
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+accesslog = os.getenv("ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    if os.getenv("PREPARAR_BASE_DATOS", "true").lower() != "true":
+        return
+    from app.database import engine
+    from app.main import preparar_base_datos
+
+    async def preparar():
+        try:
+            await preparar_base_datos()
+        finally:
+            # los workers no deben heredar conexiones abiertas en el loop del maestro
+            await engine.dispose()
+
+    asyncio.run(preparar())
+    os.environ["PREPARAR_BASE_DATOS"] = "false"
+    print("✅ Base de datos preparada en el proceso maestro")
@@ -0,0 +1,151 @@
+# Pruebas de endpoints contra PostgreSQL, con la app en el mismo proceso (httpx.ASGITransport).
+# DATABASE_URL debe apuntar a una base de pruebas: el arranque de la app crea tablas,
+# triggers y catálogos, y cada prueba agrega su propio proyecto y POA. Sin DATABASE_URL
+# las pruebas no se recolectan.
+#
+#     DATABASE_URL=postgresql+asyncpg://postgres@localhost/poa_test DATABASE_SSL=false pytest tests
+import os
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+import pytest
+
+if not os.getenv("DATABASE_URL"):
+    collect_ignore_glob = ["test_*.py"]
+
+os.environ.setdefault("SECRET_KEY", "pruebas")
+
+from app.pytest_consultas import limite_consultas  # noqa: E402,F401  (fixture)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def app():
+    from app.database import engine
+    from app.main import app, on_startup, on_shutdown
+
+    await on_startup()
+    yield app
+    await on_shutdown()
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def usuario(app):
+    from app import auth, models
+    from app.database import SessionLocal
+    from sqlalchemy import select
+
+    async with SessionLocal() as db:
+        rol = (await db.execute(select(models.Rol).where(models.Rol.nombre_rol == "Administrador"))).scalar_one()
+        usuario = models.Usuario(
+            id_usuario=uuid.uuid4(),
+            nombre_usuario="Usuario Pruebas",
+            email=f"pruebas-{uuid.uuid4().hex[:8]}@poa.local",
+            password_hash=auth.pwd_context.hash("pruebas"),
+            id_rol=rol.id_rol,
+            activo=True,
+        )
+        db.add(usuario)
+        await db.commit()
+    return usuario
+
+
+@pytest.fixture
+async def cliente(app, usuario):
+    import httpx
+    from app import auth
+
+    token = auth.crear_token_acceso({"sub": str(usuario.id_usuario)})
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://pruebas",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as c:
+        yield c
+
+
+@pytest.fixture
+async def db(app):
+    from app.database import SessionLocal
+
+    async with SessionLocal() as sesion:
+        yield sesion
+
+
+async def crear_poa(db, montos=((Decimal("2"), Decimal("50.00")), (Decimal("3"), Decimal("10.00")))):
+    """
+    Proyecto, POA y una actividad con una tarea por cada (cantidad, precio_unitario).
+    Los totales de la actividad coinciden con la suma de sus tareas. Hace commit.
+    """
+    from app import models
+    from sqlalchemy import select
+
+    codigo = f"PRUEBA-{uuid.uuid4().hex[:8]}"
+    tipo = (await db.execute(
+        select(models.TipoPOA)
+        .join(models.TipoPoaDetalleTarea, models.TipoPoaDetalleTarea.id_tipo_poa == models.TipoPOA.id_tipo_poa)
+        .limit(1)
+    )).scalar_one()
+    id_detalle = (await db.execute(
+        select(models.TipoPoaDetalleTarea.id_detalle_tarea)
+        .where(models.TipoPoaDetalleTarea.id_tipo_poa == tipo.id_tipo_poa)
+        .limit(1)
+    )).scalar_one()
+    estado_proyecto = (await db.execute(select(models.EstadoProyecto.id_estado_proyecto).limit(1))).scalar_one()
+    estado_poa = (await db.execute(select(models.EstadoPOA.id_estado_poa).limit(1))).scalar_one()
+
+    periodo = models.Periodo(
+        id_periodo=uuid.uuid4(), codigo_periodo=codigo, nombre_periodo=codigo,
+        fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 12, 31), anio="2025",
+    )
+    proyecto = models.Proyecto(
+        id_proyecto=uuid.uuid4(), codigo_proyecto=codigo, titulo=f"Proyecto {codigo}",
+        id_tipo_proyecto=tipo.id_tipo_poa, id_estado_proyecto=estado_proyecto,
+        presupuesto_aprobado=Decimal("10000.00"), fecha_creacion=datetime(2025, 1, 1),
+    )
+    poa = models.Poa(
+        id_poa=uuid.uuid4(), id_proyecto=proyecto.id_proyecto, id_periodo=periodo.id_periodo,
+        codigo_poa=f"{codigo}-2025", fecha_creacion=datetime(2025, 1, 1), id_estado_poa=estado_poa,
+        id_tipo_poa=tipo.id_tipo_poa, anio_ejecucion="2025", presupuesto_asignado=Decimal("10000.00"),
+    )
+    tareas = [
+        models.Tarea(
+            id_tarea=uuid.uuid4(), id_detalle_tarea=id_detalle, nombre=f"Tarea {n + 1}",
+            cantidad=cantidad, precio_unitario=precio, total=cantidad * precio,
+            saldo_disponible=cantidad * precio, lineaPaiViiv=1,
+        )
+        for n, (cantidad, precio) in enumerate(montos)
+    ]
+    total = sum((t.total for t in tareas), Decimal("0"))
+    actividad = models.Actividad(
+        id_actividad=uuid.uuid4(), id_poa=poa.id_poa, descripcion_actividad="Actividad de prueba",
+        total_por_actividad=total, saldo_actividad=total,
+    )
+    for tarea in tareas:
+        tarea.id_actividad = actividad.id_actividad
+
+    db.add_all([periodo, proyecto])
+    await db.flush()
+    db.add(poa)
+    await db.flush()
+    db.add(actividad)
+    await db.flush()
+    db.add_all(tareas)
+    await db.commit()
+    return SimpleNamespace(
+        id_poa=poa.id_poa,
+        id_actividad=actividad.id_actividad,
+        ids_tarea=[t.id_tarea for t in tareas],
+        id_detalle_tarea=id_detalle,
+    )
+
+
+@pytest.fixture
+async def poa(db):
+    return await crear_poa(db)
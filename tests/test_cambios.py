@@ -0,0 +1,66 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import func, select
+from app import registro_cambios
+from app.database import engine
+from conftest import crear_poa
+
+pytestmark = pytest.mark.anyio
+
+
+async def _cursor_al_dia(cliente):
+    desde = registro_cambios.CURSOR_INICIAL
+    while True:
+        r = await cliente.get("/cambios", params={"desde": desde, "limite": 10000})
+        assert r.status_code == 200
+        desde = r.json()["cursor"]
+        if not r.json()["hay_mas"]:
+            return desde
+
+
+async def _podar(antes_de):
+    async with engine.begin() as conn:
+        while await registro_cambios.podar_lote(conn, antes_de):
+            pass
+
+
+async def _ahora():
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.localtimestamp()))).scalar_one()
+
+
+async def test_cursor_al_dia_sigue_valido_con_la_tabla_vacia(cliente, db):
+    await crear_poa(db)
+    cursor = await _cursor_al_dia(cliente)
+
+    await _podar(datetime(2100, 1, 1))
+
+    r = await cliente.get("/cambios", params={"desde": cursor})
+    assert r.status_code == 200
+    assert r.json()["cambios"] == []
+
+
+async def test_cursor_al_dia_sigue_valido_tras_podar_lo_anterior(cliente, db):
+    await crear_poa(db)
+    cursor = await _cursor_al_dia(cliente)
+    corte = await _ahora()
+    poa = await crear_poa(db)
+
+    # se eliminan los cambios que el consumidor ya leyó; los nuevos se conservan
+    await _podar(corte)
+
+    r = await cliente.get("/cambios", params={"desde": cursor, "entidad": "poa"})
+    assert r.status_code == 200
+    assert [c["id"] for c in r.json()["cambios"]] == [str(poa.id_poa)]
+
+
+async def test_cursor_con_cambios_podados_responde_410(cliente, db):
+    cursor = await _cursor_al_dia(cliente)
+    await crear_poa(db)
+
+    await _podar(datetime(2100, 1, 1))
+
+    r = await cliente.get("/cambios", params={"desde": cursor})
+    assert r.status_code == 410
+    r = await cliente.get("/cambios", params={"desde": registro_cambios.CURSOR_INICIAL})
+    assert r.status_code == 200
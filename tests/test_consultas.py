@@ -0,0 +1,65 @@
+import pytest
+from conftest import crear_poa
+
+pytestmark = pytest.mark.anyio
+
+# Cantidad de sentencias SQL de los endpoints masivos y de listado: no debe crecer con
+# el número de filas (ninguna sentencia se repite por fila).
+FILAS = 8
+
+
+@pytest.fixture
+async def poa_grande(db):
+    return await crear_poa(db, montos=[(1, 10)] * FILAS)
+
+
+async def test_lotes_no_consultan_por_fila(cliente, poa_grande, limite_consultas):
+    poa = poa_grande
+    tareas = [
+        {"id_actividad": str(poa.id_actividad), "id_detalle_tarea": str(poa.id_detalle_tarea),
+         "nombre": f"Tarea lote {n}", "cantidad": "1", "precio_unitario": "2.00"}
+        for n in range(FILAS)
+    ]
+    with limite_consultas(maximo=6, repeticiones=1):
+        r = await cliente.post("/tareas/lote", json={"tareas": tareas})
+    assert all(fila["ok"] for fila in r.json())
+
+    programaciones = [
+        {"id_tarea": str(id_tarea), "mes": mes, "valor": "1"}
+        for id_tarea in poa.ids_tarea for mes in ("01-2025", "02-2025")
+    ]
+    with limite_consultas(maximo=4, repeticiones=1):
+        r = await cliente.post("/programacion-mensual/lote", json={"programaciones": programaciones})
+    assert all(fila["ok"] for fila in r.json())
+
+
+async def test_aprobar_reforma_no_consulta_por_tarea(cliente, poa_grande, limite_consultas):
+    poa = poa_grande
+    r = await cliente.post(f"/poas/{poa.id_poa}/reformas", json={
+        "id_poa": str(poa.id_poa), "monto_solicitado": "12000.00", "justificacion": "Reforma de prueba",
+    })
+    id_reforma = r.json()["id_reforma"]
+    mitad = FILAS // 2
+    r = await cliente.put(f"/reformas/{id_reforma}/cambios", json={
+        "editar": [{"id_tarea": str(id_tarea), "cantidad": "2"} for id_tarea in poa.ids_tarea[:mitad]],
+        "eliminar": [str(id_tarea) for id_tarea in poa.ids_tarea[mitad:]],
+        "agregar": [
+            {"id_actividad": str(poa.id_actividad), "id_detalle_tarea": str(poa.id_detalle_tarea),
+             "cantidad": "1", "precio_unitario": "3.00"}
+        ] * FILAS,
+        "justificacion": "Cambios de prueba",
+    })
+    assert r.status_code == 200
+
+    with limite_consultas(maximo=20, repeticiones=1):
+        r = await cliente.post(f"/reformas/{id_reforma}/aprobar")
+    assert r.status_code == 200
+
+
+async def test_listados_no_consultan_por_elemento(cliente, poa_grande, limite_consultas):
+    poa = poa_grande
+    for ruta in (f"/poas/{poa.id_poa}/actividades", f"/actividades/{poa.id_actividad}/tareas", "/poas/"):
+        with limite_consultas(maximo=2, repeticiones=1):
+            r = await cliente.get(ruta)
+        assert r.status_code == 200
+    assert len(r.json()) >= 1
@@ -0,0 +1,35 @@
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from app import auth
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_eventos_acepta_ticket_y_no_token_de_acceso_en_la_url(cliente, usuario):
+    r = await cliente.post("/eventos/ticket")
+    assert r.status_code == 200
+    ticket = r.json()["ticket"]
+    assert r.json()["expira_en"] == 60
+
+    assert (await auth.get_current_user_eventos(None, ticket)).id_usuario == usuario.id_usuario
+
+    token = auth.crear_token_acceso({"sub": str(usuario.id_usuario)})
+    with pytest.raises(HTTPException) as error:
+        await auth.get_current_user_eventos(None, token)
+    assert error.value.status_code == 401
+    # el token de acceso sigue sirviendo en el encabezado
+    assert (await auth.get_current_user_eventos(token, None)).id_usuario == usuario.id_usuario
+
+
+async def test_ticket_de_eventos_no_sirve_para_el_resto_de_la_api(cliente, usuario):
+    ticket = (await cliente.post("/eventos/ticket")).json()["ticket"]
+
+    r = await cliente.get("/perfil", headers={"Authorization": f"Bearer {ticket}"})
+    assert r.status_code == 401
+
+    vencido = auth.crear_token_acceso(
+        {"sub": str(usuario.id_usuario), "scope": auth.ALCANCE_EVENTOS}, timedelta(seconds=-1)
+    )
+    with pytest.raises(HTTPException):
+        await auth.get_current_user_eventos(None, vencido)
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from app import auth, models
+from app.database import SessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def _conexiones_en_transaccion():
+    async with SessionLocal() as db:
+        return (await db.execute(text(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND state = 'idle in transaction'"
+        ))).scalar_one()
+
+
+async def _en_transaccion_durante_descarga(app, usuario, ruta):
+    """
+    Llama al endpoint por ASGI sin intermediarios (httpx.ASGITransport lee toda la
+    respuesta antes de devolverla) y cuenta las conexiones abiertas en una transacción
+    al enviarse el primer fragmento del cuerpo.
+    """
+    camino, _, consulta = ruta.partition("?")
+    token = auth.crear_token_acceso({"sub": str(usuario.id_usuario)})
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": camino, "raw_path": camino.encode(), "query_string": consulta.encode(),
+        "root_path": "", "client": ("127.0.0.1", 1), "server": ("pruebas", 80),
+        "headers": [(b"host", b"pruebas"), (b"authorization", f"Bearer {token}".encode())],
+    }
+    estado = {}
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(mensaje):
+        if mensaje["type"] == "http.response.start":
+            estado["status"] = mensaje["status"]
+        elif mensaje["type"] == "http.response.body" and "conexiones" not in estado:
+            estado["conexiones"] = await _conexiones_en_transaccion()
+
+    await app(scope, receive, send)
+    assert estado["status"] == 200
+    return estado["conexiones"]
+
+
+async def test_exportar_analitica_no_retiene_la_sesion_de_la_peticion(app, usuario, poa):
+    pytest.importorskip("pyarrow")
+
+    # solo la sesión propia de la exportación, que está leyendo el cursor
+    assert await _en_transaccion_durante_descarga(app, usuario, "/exportar/tareas?formato=arrow") == 1
+
+
+async def test_exportar_logs_carga_no_retiene_la_sesion_de_la_peticion(app, usuario, db):
+    db.add_all([
+        models.LogCargaExcel(fecha_carga=datetime(2025, 3, 1, 10, n), nombre_archivo="poa.xlsx", hoja="POA", mensaje=f"fila {n}")
+        for n in range(3)
+    ])
+    await db.commit()
+
+    assert await _en_transaccion_durante_descarga(app, usuario, "/logs-carga-excel/exportar?formato=csv") == 1
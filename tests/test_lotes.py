@@ -0,0 +1,80 @@
+import uuid
+from decimal import Decimal
+import pytest
+from sqlalchemy import select
+from app import models
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_tareas_lote_informa_cada_fila(cliente, db, poa):
+    lote = {"tareas": [
+        {"id_actividad": str(poa.id_actividad), "id_detalle_tarea": str(poa.id_detalle_tarea),
+         "nombre": "válida", "cantidad": "2", "precio_unitario": "5.00"},
+        {"id_actividad": str(uuid.uuid4()), "id_detalle_tarea": str(poa.id_detalle_tarea), "nombre": "sin actividad"},
+        {"id_actividad": str(poa.id_actividad), "id_detalle_tarea": str(uuid.uuid4()), "nombre": "sin detalle"},
+        {"id_actividad": str(poa.id_actividad), "id_detalle_tarea": str(poa.id_detalle_tarea),
+         "nombre": "válida 2", "cantidad": "1", "precio_unitario": "7.50"},
+    ]}
+
+    r = await cliente.post("/tareas/lote", json=lote)
+
+    assert r.status_code == 200
+    resultados = r.json()
+    assert [f["indice"] for f in resultados] == [0, 1, 2, 3]
+    assert [f["ok"] for f in resultados] == [True, False, False, True]
+    assert resultados[1]["error"] == "Actividad no encontrada"
+    assert resultados[2]["error"] == "Detalle de tarea no encontrado"
+    assert {resultados[0]["accion"], resultados[3]["accion"]} == {"creada"}
+
+    creadas = (await db.execute(
+        select(models.Tarea.nombre).where(models.Tarea.id_tarea.in_([resultados[0]["id"], resultados[3]["id"]]))
+    )).scalars().all()
+    assert sorted(creadas) == ["válida", "válida 2"]
+    actividad = await db.get(models.Actividad, poa.id_actividad)
+    assert actividad.total_por_actividad == Decimal("100.00") + Decimal("30.00") + Decimal("10.00") + Decimal("7.50")
+
+
+async def test_programacion_lote_rechaza_claves_duplicadas(cliente, db, poa):
+    id_tarea = str(poa.ids_tarea[0])
+    lote = {"programaciones": [
+        {"id_tarea": id_tarea, "mes": "01-2025", "valor": "10"},
+        {"id_tarea": id_tarea, "mes": "01-2025", "valor": "20"},
+        {"id_tarea": str(uuid.uuid4()), "mes": "01-2025", "valor": "5"},
+        {"id_tarea": id_tarea, "mes": "02-2025", "valor": "30"},
+    ]}
+
+    r = await cliente.post("/programacion-mensual/lote", json=lote)
+
+    assert r.status_code == 200
+    resultados = r.json()
+    assert [f["ok"] for f in resultados] == [True, False, False, True]
+    assert "fila 0" in resultados[1]["error"]
+    assert resultados[2]["error"] == "Tarea no encontrada"
+    valores = dict((await db.execute(
+        select(models.ProgramacionMensual.mes, models.ProgramacionMensual.valor)
+        .where(models.ProgramacionMensual.id_tarea == poa.ids_tarea[0])
+    )).all())
+    assert valores == {"01-2025": Decimal("10.00"), "02-2025": Decimal("30.00")}
+
+
+async def test_programacion_lote_distingue_insercion_de_actualizacion(cliente, db, poa):
+    id_tarea = str(poa.ids_tarea[1])
+    r = await cliente.post("/programacion-mensual/lote", json={"programaciones": [
+        {"id_tarea": id_tarea, "mes": "03-2025", "valor": "10"},
+    ]})
+    primera = r.json()[0]
+    assert primera["accion"] == "insertada"
+
+    r = await cliente.post("/programacion-mensual/lote", json={"programaciones": [
+        {"id_tarea": id_tarea, "mes": "03-2025", "valor": "15"},
+        {"id_tarea": id_tarea, "mes": "04-2025", "valor": "5"},
+    ]})
+
+    segunda, nueva = r.json()
+    assert segunda["accion"] == "actualizada"
+    assert segunda["id"] == primera["id"]
+    assert nueva["accion"] == "insertada"
+    programacion = await db.get(models.ProgramacionMensual, uuid.UUID(primera["id"]))
+    assert programacion.valor == Decimal("15.00")
+    assert programacion.version == 2
@@ -0,0 +1,77 @@
+import uuid
+from decimal import Decimal
+import pytest
+from app import models
+
+pytestmark = pytest.mark.anyio
+
+
+async def _certificar(cliente, id_tarea, monto="60.00"):
+    r = await cliente.post(f"/tareas/{id_tarea}/certificaciones", json={"monto": monto})
+    assert r.status_code == 201
+    return r.json()["id_control"]
+
+
+async def test_certificar_rechaza_tarea_inexistente_y_sin_saldo(cliente, poa):
+    r = await cliente.post(f"/tareas/{uuid.uuid4()}/certificaciones", json={"monto": "1.00"})
+    assert (r.status_code, r.json()["detail"]) == (404, "Tarea no encontrada")
+
+    r = await cliente.post(f"/tareas/{poa.ids_tarea[0]}/certificaciones", json={"monto": "100.01"})
+    assert (r.status_code, r.json()["detail"]) == (409, "Saldo insuficiente en la tarea")
+
+
+async def test_comprometer_y_devengar_no_superan_el_paso_anterior(cliente, poa):
+    id_control = await _certificar(cliente, poa.ids_tarea[0])
+
+    r = await cliente.post(f"/certificaciones/{uuid.uuid4()}/compromisos", json={"monto": "1.00"})
+    assert (r.status_code, r.json()["detail"]) == (404, "Certificación no encontrada")
+    r = await cliente.post(f"/certificaciones/{id_control}/compromisos", json={"monto": "60.01"})
+    assert r.status_code == 409
+    r = await cliente.post(f"/certificaciones/{id_control}/compromisos", json={"monto": "40.00"})
+    assert r.status_code == 200
+
+    r = await cliente.post(f"/certificaciones/{uuid.uuid4()}/devengados", json={"monto": "1.00"})
+    assert (r.status_code, r.json()["detail"]) == (404, "Certificación no encontrada")
+    r = await cliente.post(f"/certificaciones/{id_control}/devengados", json={"monto": "40.01"})
+    assert r.status_code == 409
+    r = await cliente.post(f"/certificaciones/{id_control}/devengados", json={"monto": "25.00"})
+    assert r.status_code == 200
+    assert Decimal(str(r.json()["monto_devengado"])) == Decimal("25.00")
+
+
+async def test_ejecutar_contra_certificacion_no_supera_lo_devengado(cliente, db, poa):
+    id_tarea = poa.ids_tarea[0]
+    id_control = await _certificar(cliente, id_tarea)
+
+    def ejecutar(monto, control=id_control, tarea=id_tarea):
+        return cliente.post(
+            f"/tareas/{tarea}/ejecuciones", json={"monto": monto, "id_control_presupuestario": str(control)}
+        )
+
+    r = await ejecutar("1.00", control=uuid.uuid4())
+    assert (r.status_code, r.json()["detail"]) == (404, "Certificación no encontrada")
+    # sin devengado no se puede ejecutar
+    r = await ejecutar("1.00")
+    assert r.status_code == 409
+    # la certificación es de otra tarea
+    r = await ejecutar("1.00", tarea=poa.ids_tarea[1])
+    assert r.status_code == 409
+
+    await cliente.post(f"/certificaciones/{id_control}/compromisos", json={"monto": "30.00"})
+    await cliente.post(f"/certificaciones/{id_control}/devengados", json={"monto": "20.00"})
+    assert (await ejecutar("15.00")).status_code == 201
+    assert (await ejecutar("5.01")).status_code == 409
+    assert (await ejecutar("5.00")).status_code == 201
+
+    control = await db.get(models.ControlPresupuestario, uuid.UUID(id_control))
+    assert control.saldo_disponible == Decimal("40.00")
+
+
+async def test_ejecutar_directo_rechaza_tarea_inexistente_y_sin_saldo(cliente, poa):
+    r = await cliente.post(f"/tareas/{uuid.uuid4()}/ejecuciones", json={"monto": "1.00"})
+    assert (r.status_code, r.json()["detail"]) == (404, "Tarea no encontrada")
+
+    r = await cliente.post(f"/tareas/{poa.ids_tarea[1]}/ejecuciones", json={"monto": "30.01"})
+    assert (r.status_code, r.json()["detail"]) == (409, "Saldo insuficiente en la tarea")
+    r = await cliente.post(f"/tareas/{poa.ids_tarea[1]}/ejecuciones", json={"monto": "30.00"})
+    assert r.status_code == 201
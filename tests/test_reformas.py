@@ -0,0 +1,52 @@
+from decimal import Decimal
+import pytest
+from app import models
+
+pytestmark = pytest.mark.anyio
+
+
+async def _reforma_con_tarea_sin_montos(cliente, db, poa):
+    # tarea importada sin cantidad ni precio (ambas columnas admiten NULL)
+    tarea = await db.get(models.Tarea, poa.ids_tarea[0])
+    actividad = await db.get(models.Actividad, poa.id_actividad)
+    tarea.cantidad = tarea.precio_unitario = None
+    tarea.total = tarea.saldo_disponible = Decimal("0")
+    actividad.total_por_actividad = actividad.saldo_actividad = Decimal("30.00")
+    await db.commit()
+
+    r = await cliente.post(f"/poas/{poa.id_poa}/reformas", json={
+        "id_poa": str(poa.id_poa), "monto_solicitado": "12000.00", "justificacion": "Reforma de prueba",
+    })
+    assert r.status_code == 200
+    id_reforma = r.json()["id_reforma"]
+    r = await cliente.put(f"/reformas/{id_reforma}/cambios", json={
+        "editar": [{"id_tarea": str(tarea.id_tarea), "lineaPaiViiv": 2}],
+        "justificacion": "Cambio de línea PAI",
+    })
+    assert r.status_code == 200
+    return id_reforma
+
+
+async def test_aprobar_reforma_edita_tarea_sin_cantidad_ni_precio(cliente, db, poa):
+    id_reforma = await _reforma_con_tarea_sin_montos(cliente, db, poa)
+
+    r = await cliente.post(f"/reformas/{id_reforma}/aprobar")
+
+    assert r.status_code == 200
+    tarea = await db.get(models.Tarea, poa.ids_tarea[0])
+    await db.refresh(tarea)
+    assert (tarea.lineaPaiViiv, tarea.total, tarea.saldo_disponible) == (2, Decimal("0.00"), Decimal("0.00"))
+    assert tarea.version == 3  # 1 al crearla, 2 al quitarle los montos, 3 al aprobar la reforma
+
+
+async def test_impacto_simula_edicion_de_tarea_sin_cantidad_ni_precio(cliente, db, poa):
+    id_reforma = await _reforma_con_tarea_sin_montos(cliente, db, poa)
+
+    r = await cliente.get(f"/reformas/{id_reforma}/impacto")
+
+    assert r.status_code == 200
+    impacto = r.json()
+    assert impacto["simulado"] is True
+    [tarea] = impacto["tareas"]["modificadas"]
+    assert tarea["cambios"] == {"lineaPaiViiv": {"antes": 1, "despues": 2}}
+    assert impacto["total_actividades"]["variacion"] == "0.00"
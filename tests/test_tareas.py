@@ -0,0 +1,31 @@
+from decimal import Decimal
+import pytest
+from app import models
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_editar_tarea_no_recorta_lo_certificado(cliente, db, poa):
+    # tarea de 2 x 50.00 = 100.00 con 80.00 certificados
+    id_tarea = poa.ids_tarea[0]
+    r = await cliente.post(f"/tareas/{id_tarea}/certificaciones", json={"monto": "80.00"})
+    assert r.status_code == 201
+
+    r = await cliente.put(f"/tareas/{id_tarea}", json={"cantidad": "1", "precio_unitario": "50.00"})
+
+    assert r.status_code == 409
+    tarea = await db.get(models.Tarea, id_tarea)
+    actividad = await db.get(models.Actividad, poa.id_actividad)
+    assert (tarea.cantidad, tarea.total, tarea.saldo_disponible) == (Decimal("2.00"), Decimal("100.00"), Decimal("20.00"))
+    assert actividad.saldo_actividad == Decimal("50.00")
+
+    # un recorte que cabe en el saldo sí se aplica
+    r = await cliente.put(f"/tareas/{id_tarea}", json={"cantidad": "1.7", "precio_unitario": "50.00"})
+
+    assert r.status_code == 200
+    await db.refresh(tarea)
+    await db.refresh(actividad)
+    assert (tarea.total, tarea.saldo_disponible) == (Decimal("85.00"), Decimal("5.00"))
+    assert (actividad.total_por_actividad, actividad.saldo_actividad) == (Decimal("115.00"), Decimal("35.00"))
+    r = await cliente.get(f"/actividades/{poa.id_actividad}/tareas")
+    assert r.status_code == 200